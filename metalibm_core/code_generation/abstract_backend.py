@@ -36,6 +36,7 @@ import inspect
 
 from ..utility.log_report import Log
 from .generator_utility import *
+from .generator_utility import is_pure_predicate
 from .code_element import *
 from .complex_generator import *
 from ..core.ml_formats import *
@@ -44,20 +45,89 @@ from ..core.ml_operations import *
 from .generator_helper import *
 
 LOG_BACKEND_INIT = Log.LogLevel(Log.Info, "backend_init")
+LOG_BACKEND_DISPATCH = Log.LogLevel(Log.Info, "dispatch")
+
+
+## Memoization of backend dispatch: for each code generation table,
+#  map (language, op class, interface, codegen key) -> selected entry.
+#  Tables are kept referenced so that their id is never re-used
+DISPATCH_CACHE = {}
+DISPATCH_STATS = {"hit": 0, "miss": 0, "impure": 0}
+## marker for memoized "no matching entry"
+NO_DISPATCH_ENTRY = object()
+
+def dispatch_table_entry(table, language, op_class, interface, codegen_key, optree):
+    """ return the entry of table[language][op_class][codegen_key] whose
+        condition and interface condition match optree (None if no entry
+        matches). When every predicate evaluated during the selection has
+        been declared pure, the result only depends on the dispatch keys
+        and is memoized """
+    try:
+        _, table_cache = DISPATCH_CACHE[id(table)]
+    except KeyError:
+        table_cache = {}
+        DISPATCH_CACHE[id(table)] = (table, table_cache)
+    key = (language, op_class, interface, codegen_key)
+    try:
+        entry = table_cache.get(key)
+    except TypeError:
+        # unhashable key (e.g. format without hash), no memoization
+        key, entry = None, None
+    if not entry is None:
+        DISPATCH_STATS["hit"] += 1
+        return None if entry is NO_DISPATCH_ENTRY else entry
+
+    pure = True
+    condition_map = table[language][op_class][codegen_key]
+    for condition in condition_map:
+        pure = pure and is_pure_predicate(condition)
+        if condition(optree):
+            for interface_condition in condition_map[condition]:
+                pure = pure and is_pure_predicate(interface_condition)
+                if interface_condition(*interface, optree = optree):
+                    entry = condition_map[condition][interface_condition]
+                    break
+            if not entry is None:
+                break
+    if pure and not key is None:
+        DISPATCH_STATS["miss"] += 1
+        table_cache[key] = NO_DISPATCH_ENTRY if entry is None else entry
+    else:
+        DISPATCH_STATS["impure"] += 1
+    return entry
+
+def get_dispatch_stats():
+    """ return a dict of backend dispatch memoization statistics """
+    total = sum(DISPATCH_STATS.values())
+    stats = dict(DISPATCH_STATS)
+    stats["hit_rate"] = (float(DISPATCH_STATS["hit"]) / total) if total else 0.0
+    return stats
+
+def report_dispatch_stats(level=LOG_BACKEND_DISPATCH):
+    """ report backend dispatch memoization statistics """
+    stats = get_dispatch_stats()
+    Log.report(
+        level, "backend dispatch: {} hit(s), {} miss(es), {} impure lookup(s) ({:.1f}% hit)",
+        stats["hit"], stats["miss"], stats["impure"], 100.0 * stats["hit_rate"])
 
 ## abstract backend class
 class AbstractBackend(object):
     """ base abstract processor """
     target_name = "abstract"
+    ## class-level memoization of the processor hierarchy and of the
+    #  flattened support maps, shared by every instance of a class:
+    #  processor class -> ordered list of parent classes
+    proc_hierarchy_cache = {}
+    #  (processor class, language) -> supported operation map
+    supported_op_map_cache = {}
 
     def __init__(self, *args):
         # create ordered list of parent architecture instances
-        parent_class_list = get_parent_proc_class_list(self.__class__)
-        self.parent_architecture = [parent(*args) for parent in create_proc_hierarchy(parent_class_list, [])]
+        self.parent_architecture = [parent(*args) for parent in get_proc_hierarchy(self.__class__)]
 
         # create simplified of operation supported by the processor hierarchy
         self.simplified_rec_op_map = {}
-        self.simplified_rec_op_map[C_Code] = self.generate_supported_op_map(language = C_Code)
+        self.simplified_rec_op_map[C_Code] = self.get_supported_op_map(language = C_Code)
 
     def __str__(self):
         """ Nice description string """
@@ -73,6 +143,16 @@ class AbstractBackend(object):
         implementation = self.get_recursive_implementation(optree, language)
         return implementation.generate_expr(code_generator, code_object, optree, arg_tuple, **kwords)#folded = folded, result_var = result_var)
 
+    def get_supported_op_map(self, language = C_Code):
+        """ return the map of every operation supported by the processor
+            hierarchy, built once per processor class and language
+            (the returned map is shared and must not be modified) """
+        key = (self.__class__, language)
+        if not key in AbstractBackend.supported_op_map_cache:
+            Log.report(LOG_BACKEND_INIT, "generating {} support map for {}", language, self.__class__)
+            AbstractBackend.supported_op_map_cache[key] = self.generate_supported_op_map(language = language)
+        return AbstractBackend.supported_op_map_cache[key]
+
     def generate_supported_op_map(self, language = C_Code, table_getter = lambda self: self.code_generation_table):
         """ generate a map of every operations supported by the processor hierarchy,
             to be used in OptimizationEngine step """
@@ -110,20 +190,16 @@ class AbstractBackend(object):
         #key_getter = AbstractBackend.get_operation_keys if key_getter is None else key_getter
         table = table_getter(self)
         op_class, interface, codegen_key = key_getter(self, optree)
-        for condition in table[language][op_class][codegen_key]:
-            if condition(optree):
-                for interface_condition in table[language][op_class][codegen_key][condition]:
-                    if interface_condition(*interface, optree = optree):
-                        implementation = table[language][op_class][codegen_key][condition][interface_condition]
-                        sourceinfo = implementation.get_source_info()
-                        Log.report(
-                            Log.Verbose,
-                            "optree {} to implementation @ {}",
-                            optree,
-                            str(sourceinfo)
-                        )
-                        return implementation
-        return None
+        implementation = dispatch_table_entry(table, language, op_class, interface, codegen_key, optree)
+        if not implementation is None:
+            sourceinfo = implementation.get_source_info()
+            Log.report(
+                Log.Verbose,
+                "optree {} to implementation @ {}",
+                optree,
+                str(sourceinfo)
+            )
+        return implementation
 
     def get_recursive_implementation(self, optree, language = None, table_getter = lambda self: self.code_generation_table, key_getter = lambda self, optree: self.get_operation_keys(optree)):
         """ recursively search for an implementation of optree in the processor class hierarchy """
@@ -164,10 +240,8 @@ class AbstractBackend(object):
                     # unsupported codegen key
                     return False
                 else:
-                    for condition in op_map[language][op_class][codegen_key]:
-                        if condition(optree):
-                            for interface_condition in op_map[language][op_class][codegen_key][condition]:
-                                if interface_condition(*interface, optree = optree): return True
+                    if not dispatch_table_entry(op_map, language, op_class, interface, codegen_key, optree) is None:
+                        return True
                     # unsupported condition or interface type
                     if debug: 
                       Log.report(Log.Info, "unsupported condition key for {}", optree)
@@ -220,12 +294,10 @@ class AbstractBackend(object):
         """ return the implementation provided by <proc_class> of the operation performed by <optree> """
         op_class, interface, codegen_key = key_getter(proc_class, optree)
         table = table_getter(proc_class)
-        for condition in table[language][op_class][codegen_key]:
-            if condition(optree):
-                for interface_condition in table[language][op_class][codegen_key][condition]:
-                    if interface_condition(*interface, optree = optree):
-                        return table[language][op_class][codegen_key][condition][interface_condition]
-        raise Exception()
+        implementation = dispatch_table_entry(table, language, op_class, interface, codegen_key, optree)
+        if implementation is None:
+            raise Exception()
+        return implementation
 
 ## Determine whether an object is a true processor
 #  class with real backend capabilities or not
@@ -238,6 +310,14 @@ def get_parent_proc_class_list(proc_class):
     return [parent for parent in proc_class.__bases__ if test_is_processor(parent)]
     
 
+def get_proc_hierarchy(proc_class):
+    """ return the ordered list of parent processor classes of proc_class
+        (memoized at class level) """
+    if not proc_class in AbstractBackend.proc_hierarchy_cache:
+        AbstractBackend.proc_hierarchy_cache[proc_class] = create_proc_hierarchy(
+            get_parent_proc_class_list(proc_class), [])
+    return AbstractBackend.proc_hierarchy_cache[proc_class]
+
 def create_proc_hierarchy(process_list, proc_class_list = []):
     """ create an ordered list of processor hierarchy """
     if process_list == []:
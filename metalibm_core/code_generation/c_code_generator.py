@@ -39,8 +39,9 @@ from ..core.ml_operations import (
     Variable, Constant, ConditionBlock, Return, TableLoad, Statement,\
     Loop, SpecificOperation, ExceptionOperation, ClearException, \
     NoResultOperation, SwitchBlock, FunctionObject, ReferenceAssign, \
-    BooleanOperation
+    BooleanOperation, ML_LeafNode, ControlFlowOperation
 )
+from ..core.graph_walker import post_order_walk, get_node_operands
 from ..core.ml_table import ML_Table, ML_NewTable
 from ..core.ml_formats import *
 from ..core.attributes import ML_Debug
@@ -51,6 +52,8 @@ from .code_function import CodeFunction
 
 class CCodeGenerator(object):
     language = C_Code
+    # expression depth beyond which operands are generated iteratively
+    expr_depth_threshold = 100
 
     """ C language code generator """
     def __init__(self, processor, declare_cst = True, disable_debug = False, libm_compliant = False, default_rounding_mode = ML_GlobalRoundMode, default_silent = None, language = C_Code):
@@ -61,6 +64,8 @@ class CCodeGenerator(object):
         self.libm_compliant = libm_compliant
         self.fp_context = FP_Context(rounding_mode = default_rounding_mode, silent = default_silent)
         self.language = language
+        # depth of the current processor.generate_expr call chain
+        self.expr_depth = 0
         Log.report(Log.Info, "CCodeGenerator initialized with language: %s" % self.language)
 
 
@@ -301,8 +306,16 @@ class CCodeGenerator(object):
             result = self.processor.generate_expr(self, code_object, optree, [], generate_pre_process = generate_pre_process, folded = folded, result_var = result_var, language = language)
 
         else:
+            if self.expr_depth > self.expr_depth_threshold:
+                # deep expression: generating operands in post-order
+                # (deepest node first) to avoid too much recursion
+                self.generate_operands(code_object, optree, folded = folded, language = language)
             generate_pre_process = self.generate_clear_exception if optree.get_clearprevious() else None
-            result = self.processor.generate_expr(self, code_object, optree, optree.inputs, generate_pre_process = generate_pre_process, folded = folded, result_var = result_var, language = language)
+            self.expr_depth += 1
+            try:
+                result = self.processor.generate_expr(self, code_object, optree, optree.inputs, generate_pre_process = generate_pre_process, folded = folded, result_var = result_var, language = language)
+            finally:
+                self.expr_depth -= 1
 
         # registering result into memoization table
         self.add_memoization(optree, result)
@@ -319,6 +332,19 @@ class CCodeGenerator(object):
 
         return result
 
+    def generate_operands(self, code_object, optree, folded = True, language = None):
+        """ generate the (transitive) operands of <optree> in post-order,
+            only plain operations are pre-generated, statements
+            and control flow nodes are left to the recursive generation """
+        def skip_operand(op):
+            return self.has_memoization(op) or isinstance(op, (
+                ML_LeafNode, ControlFlowOperation, Statement, Return,
+                ReferenceAssign, ExceptionOperation, NoResultOperation
+            ))
+        for op in post_order_walk(optree, get_inputs = get_node_operands, skip = skip_operand):
+            if not op is optree:
+                self.generate_expr(code_object, op, folded = folded, language = language)
+
     def generate_clear_exception(self, code_generator, code_object, optree, var_arg_list, language = None, **kwords): 
         #generate_pre_process(code_generator, code_object, optree, var_arg_list, **kwords)
         self.generate_expr(code_object, ClearException(), language = language)
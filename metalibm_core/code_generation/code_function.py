@@ -32,6 +32,7 @@
 ###############################################################################
 
 from ..core.ml_operations import Variable, FunctionObject
+from ..core.graph_fingerprint import get_graph_fingerprint
 from .code_object import NestedCode
 from .generator_utility import FunctionOperator, FO_Arg
 from .code_constant import *
@@ -110,6 +111,13 @@ class CodeFunction(object):
   def get_scheme(self):
     return self.scheme
 
+  ## @return structural fingerprint (str) of the function interface
+  #          and implementation, independent of node identities
+  def get_fingerprint(self):
+    return get_graph_fingerprint(
+      self.arg_list + [self.scheme], [self.name, self.output_format]
+    )
+
   def get_definition(self, code_generator, language, folded = True, static_cst = False):
     code_object = NestedCode(code_generator, static_cst = static_cst)
     code_object << self.get_declaration(final = False, language = language)
@@ -41,7 +41,10 @@ from .generator_utility import C_Code, Gappa_Code, RoundOperator
 from ..core.attributes import ML_Debug
 from .code_object import Gappa_Unknown, GappaCodeObject
 
-from ..utility.gappa_utils import execute_gappa_script_extract
+from ..utility.gappa_utils import (
+    execute_gappa_script_extract, execute_gappa_script_list,
+    parse_gappa_interval
+)
 from ..utility.log_report import Log
 
 
@@ -317,6 +320,16 @@ class GappaCodeGenerator(object):
     def get_eval_error_v2(self, opt_engine, pre_optree, variable_copy_map = {}, goal_precision = ML_Exact, gappa_filename = "gappa_tmp.g", relative_error = False):
         """ helper to compute the evaluation error of <pre_optree> bounded by tagged-node in variable_map, 
             assuming variable_map[v] is the liverange of node v """
+        gappa_code = self.get_eval_error_code_v2(opt_engine, pre_optree, variable_copy_map, goal_precision, relative_error = relative_error)
+        try:
+          eval_error = execute_gappa_script_extract(gappa_code, gappa_filename = gappa_filename)["goal"]
+          return eval_error
+        except ValueError:
+          Log.report(Log.Error, "Unable to compute evaluation error with gappa")
+
+    def get_eval_error_code_v2(self, opt_engine, pre_optree, variable_copy_map = {}, goal_precision = ML_Exact, relative_error = False):
+        """ generate the gappa script evaluating the error of <pre_optree>
+            (see get_eval_error_v2), the script is returned as a string """
         # registering initial bounds
         bound_list = []
         bound_unique_list = []
@@ -373,20 +386,21 @@ class GappaCodeGenerator(object):
         self.add_goal(gappa_code, goal)
 
         self.clear_memoization_map()
-        try:
-          eval_error = execute_gappa_script_extract(gappa_code.get(self), gappa_filename = gappa_filename)["goal"]
-          return eval_error
-        except ValueError:
-          Log.report(Log.Error, "Unable to compute evaluation error with gappa")
-          
-
-    def get_eval_error_v3(self, opt_engine, pre_optree, variable_copy_map = {}, goal_precision = ML_Exact, gappa_filename = "gappa_tmp.g", dichotomy = [], relative_error = False):
+        return gappa_code.get(self)
+
+    def get_eval_error_v3(self, opt_engine, pre_optree, variable_copy_map = {}, goal_precision = ML_Exact, gappa_filename = "gappa_tmp.g", dichotomy = [], relative_error = False, jobs = None):
+        """ compute the evaluation error of <pre_optree> on each sub-interval
+            case of <dichotomy>, returns the list of error intervals.
+            One gappa script is generated per case and the scripts are
+            executed concurrently by at most <jobs> gappa processes
+            (default: one per core, see get_gappa_job_number) """
         # storing initial interval values
         init_interval = {}
         for op in variable_copy_map:
             init_interval[op] = variable_copy_map[op].get_interval()
 
-        eval_error_list = []
+        gappa_code_list = []
+        gappa_filename_list = []
         case_id = 0
 
         # performing dichotomised search
@@ -401,11 +415,21 @@ class GappaCodeGenerator(object):
                     # else making sure initial interval is set
                     clean_copy_map[op].set_interval(init_interval[op])
                     
-            # computing evaluation error in local conditions
-            eval_error = self.get_eval_error_v2(opt_engine, pre_optree, clean_copy_map, goal_precision, ("c%d_" % case_id) + gappa_filename, relative_error = relative_error)
-            eval_error_list.append(eval_error)
+            # generating evaluation error script in local conditions
+            # (scripts must be generated sequentially as intervals are
+            #  set on the shared copy map nodes)
+            gappa_code_list.append(self.get_eval_error_code_v2(opt_engine, pre_optree, clean_copy_map, goal_precision, relative_error = relative_error))
+            gappa_filename_list.append(("c%d_" % case_id) + gappa_filename)
             case_id += 1
 
+        # executing the independent scripts and merging results
+        eval_error_list = []
+        result_list = execute_gappa_script_list(gappa_code_list, gappa_filename_list, jobs = jobs)
+        for result in result_list:
+            if result is None:
+                Log.report(Log.Error, "Unable to compute evaluation error with gappa")
+            eval_error_list.append(parse_gappa_interval(result["goal"]))
+
         return eval_error_list
 
 
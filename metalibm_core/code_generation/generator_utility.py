@@ -31,6 +31,7 @@
 # author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
 ###############################################################################
 
+import dis
 from functools import reduce
 
 from ..utility.log_report import Log
@@ -855,14 +856,50 @@ class RoundOperator(FunctionOperator):
         else:
            return FunctionOperator.assemble_code(self, code_generator, code_object, optree, var_arg_list, generate_pre_process = generate_pre_process, force_variable_storing = force_variable_storing, **kwords) 
         
+## Declare a code generation predicate as pure: its result only depends
+#  on the operation class, interface formats and codegen key of the node,
+#  so that backend dispatch results can be memoized
+#  (see AbstractBackend.get_implementation)
+def pure_predicate(predicate):
+  predicate.pure_predicate = True
+  return predicate
+
+## map of predicate -> purity, memoizing is_pure_predicate
+PURE_PREDICATE_MAP = {}
+## bytecode instructions allowed in a constant predicate
+CONSTANT_FUNCTION_OPNAMES = set(["RESUME", "NOP", "CACHE", "LOAD_CONST", "RETURN_VALUE", "RETURN_CONST"])
+
+def is_constant_function(function):
+  """ test if function is a plain function returning a constant
+      (e.g. lambda optree: True) """
+  code = getattr(function, "__code__", None)
+  if code is None or code.co_freevars or code.co_names or not hasattr(dis, "get_instructions"):
+    return False
+  return all(instr.opname in CONSTANT_FUNCTION_OPNAMES for instr in dis.get_instructions(code))
+
+def is_pure_predicate(predicate):
+  """ test if predicate has been declared pure (or is constant) """
+  try:
+    return PURE_PREDICATE_MAP[predicate]
+  except KeyError:
+    pure = getattr(predicate, "pure_predicate", False) or is_constant_function(predicate)
+    PURE_PREDICATE_MAP[predicate] = pure
+    return pure
+  except TypeError:
+    # unhashable predicate
+    return False
+
+@pure_predicate
 def type_all_match(*args, **kwords):
   """ match any type parameters """
   return True
 
+@pure_predicate
 def type_std_integer_match(*arg, **kwords):
   """ check that argument are all integers """
   return all(map(is_std_integer_format, arg))
 
+@pure_predicate
 def type_table_index_match(*arg, **kwords):
   """ check that argument are all integers """
   return all(map(is_table_index_format, arg))
@@ -891,6 +928,7 @@ class FSM(object):
 
 
 class type_strict_match(object):
+    pure_predicate = True
     def __init__(self, *type_tuple):
         """ check that argument and constrain type match strictly """
         self.type_tuple = type_tuple
@@ -899,6 +937,7 @@ class type_strict_match(object):
         return self.type_tuple == arg_tuple
 
 class type_strict_match_list(object):
+    pure_predicate = True
     def __init__(self, *type_tuple_list):
         """ check that argument and constrain type match strictly """
         self.type_tuple_list = type_tuple_list
@@ -912,6 +951,7 @@ class type_strict_match_list(object):
 def type_strict_match_or_list(type_tuple_list):
     """ Return a function which match strictly any of the tuple within
         type_tuple_list """
+    @pure_predicate
     def match_function(*arg_tuple, **kw):
         for constraint_tuple in type_tuple_list:
             if constraint_tuple == arg_tuple:
@@ -920,6 +960,7 @@ def type_strict_match_or_list(type_tuple_list):
     return match_function
 
 class type_fixed_match(object):
+    pure_predicate = True
     """ type_strict_match + match any instance of ML_Fixed_Format to 
         ML_Fixed_Format descriptor """
     def __init__(self, *type_tuple):
@@ -929,6 +970,7 @@ class type_fixed_match(object):
         return reduce(lambda acc, v: acc and (v[0] == v[1] or (v[0] == ML_Fixed_Format)) and isinstance(v[1], ML_Fixed_Format), zip(self.type_tuple, arg_tuple))
 
 class type_custom_match(object):
+    pure_predicate = True
     """ Callable class that checks whether all arguments match with their
         respective custom matching function. """
     def __init__(self, *type_tuple):
@@ -944,6 +986,7 @@ class type_custom_match(object):
         #return reduce((lambda acc, v: acc and (v[0](v[1]))), zip(self.type_tuple, arg_tuple))
 
 class type_relax_match(object):
+    pure_predicate = True
     """ implement a relaxed type comparison including ML_Exact as possible true answer """
     def __init__(self, *type_tuple):
         self.type_tuple = type_tuple
@@ -956,6 +999,7 @@ class type_relax_match(object):
         # return reduce(lambda acc, v: acc and (v[0] == v[1] or v[1] == ML_Exact), zip(self.type_tuple, arg_tuple))
 
 class type_result_match(object):
+    pure_predicate = True
     def __init__(self, result_type):
         self.result_type = result_type
 
@@ -43,6 +43,7 @@ from ..core.ml_operations import (
 )
 from ..core.ml_hdl_operations import *
 from ..core.ml_table import ML_Table
+from ..core.graph_walker import post_order_walk, get_node_operands
 from ..core.ml_formats import *
 from ..core.attributes import ML_Debug, ML_AdvancedDebug
 from .code_constant import VHDL_Code
@@ -492,34 +493,17 @@ class VHDLCodeGenerator(object):
             return None
 
         else:
-            # building ordered list of required node by depth
-            working_list = [op for op in optree.get_inputs()]
-            processing_list = [op for op in working_list]
-            resolved = {}
-            while working_list != []:
-                op = working_list.pop(0)
-                # node has already been processed: SKIP
-                if op in resolved:
-                    continue
+            # generating operands in post-order (deepest node first) to
+            # avoid too much recursion; ML_Table instances are skipped
+            # (should be generated directly by TableLoad) and
+            # already generated nodes are not walked through
+            def skip_operand(op):
                 if isinstance(op, ML_Table):
-                    # ML_Table instances are skipped (should be generated directly by TableLoad)
+                    return True
+                return not isinstance(op, ML_LeafNode) and not self.get_memoization(op) is None
+            for op in post_order_walk(optree, get_inputs=get_node_operands, skip=skip_operand):
+                if op is optree:
                     continue
-                elif isinstance(op, ML_LeafNode):
-                    processing_list.append(op)
-                else:
-                    memo = self.get_memoization(op)
-                    if not memo is None:
-                        # node has already been generated: STOP HERE
-                        resolved[op] = memo
-                    else:
-                        # enqueue node to be processed
-                        processing_list.append(op)
-                        # enqueue node inputs
-                        working_list += [op for op in op.get_inputs()]
-                        resolved[op] = memo
-
-            # processing list in reverse order (starting with deeper node to avoid too much recursion)
-            for op in processing_list[::-1]:
                 _ = self.generate_expr(code_object, op, folded=folded, initial=initial, language=language)
 
             # processing main node
@@ -114,6 +114,7 @@ class ML_AdvancedDebug(ML_Debug):
 
 ## Object to keep track of ML's node accross the several optimizations passes
 class Handle(object):
+    __slots__ = ("node",)
     def __init__(self, node = None):
         self.node = node
 
@@ -136,19 +137,59 @@ class AttributeCtor:
   def attr_init(self, init_map):
     return self.build_function(attr_init(init_map, self.name, self.default_value, required = self.required))
 
+## build a property for attribute @p attr_name stored in the
+#  side table Attributes.rare_attributes
+#  @param default_value value returned while the attribute is not set
+def rare_attribute_property(attr_name, default_value=None):
+    def getter(self):
+        if self.rare_attributes is None:
+            return default_value
+        return self.rare_attributes.get(attr_name, default_value)
+    def setter(self, value):
+        if self.rare_attributes is None:
+            if value is default_value:
+                return
+            self.rare_attributes = {}
+        self.rare_attributes[attr_name] = value
+    return property(getter, setter)
+
 ## Base class to store Node's attributes
+#  frequently accessed attributes are stored in slots, rarely set ones
+#  (and dynamic attributes) are stored in a per-object side table
+#  only allocated when one of them is set.
+#  The dynamic attributes of RTL code generation (init_stage, init_op,
+#  see CodeEntity) are initialized on every node once registered, they
+#  also get slots
 class Attributes(object):
     """ Attribute management class for Metalibm's Operation """
+    __slots__ = (
+        "precision", "interval", "debug", "tag", "silent", "handle",
+        "rounding_mode", "rare_attributes", "init_stage", "init_op",
+    )
     default_precision     = [None]
     default_rounding_mode = [None]
     default_silent        = [None]
     str_del               = "| "
     dynamic_attribute_map = {}
+    ## attributes which are reset (not copied) by get_copy
+    uncopied_attributes = ("rounding_mode_dependant", "unbreakable")
+    ## map of rarely set attributes and of their default value
+    rare_attribute_map = {
+        "exact": None,
+        "max_abs_error": None,
+        "clearprevious": None,
+        "rounding_mode_dependant": None,
+        "prevent_optimization": None,
+        "unbreakable": False,
+    }
 
     ## allow to add a new dynamic attribute
     @staticmethod
     def add_dyn_attribute(attr_ctor):
-      Attributes.dynamic_attribute_map[attr_ctor.get_name()] = attr_ctor
+      attr_name = attr_ctor.get_name()
+      Attributes.dynamic_attribute_map[attr_name] = attr_ctor
+      if not attr_name in Attributes.__dict__:
+        setattr(Attributes, attr_name, rare_attribute_property(attr_name))
 
     def get_dyn_attribute(self, attr_name):
       return getattr(self, attr_name)
@@ -157,20 +198,36 @@ class Attributes(object):
         self.precision  = attr_init(init_map, "precision", Attributes.default_precision[0])
         self.interval   = attr_init(init_map, "interval")
         self.debug      = attr_init(init_map, "debug")
-        self.exact      = attr_init(init_map, "exact")
         self.tag        = attr_init(init_map, "tag")
-        self.max_abs_error = attr_init(init_map, "max_abs_error")
         self.silent     = attr_init(init_map, "silent", Attributes.default_silent[0])
         self.handle     = attr_init(init_map, "handle", Handle())
-        self.clearprevious = attr_init(init_map, "clearprevious")
         # rounding mode (if applicable) of the operation
         self.rounding_mode = attr_init(init_map, "rounding_mode", Attributes.default_rounding_mode[0])
-        self.rounding_mode_dependant = None
-        self.prevent_optimization = attr_init(init_map, "prevent_optimization")
-        self.unbreakable  = attr_init(init_map, "unbreakable", False)
+        self.rare_attributes = None
+        for attr_name in Attributes.rare_attribute_map:
+          if attr_name in init_map:
+            setattr(self, attr_name, init_map[attr_name])
         for dyn_attr in Attributes.dynamic_attribute_map:
           self.__setattr__(dyn_attr, Attributes.dynamic_attribute_map[dyn_attr].attr_init(init_map))
 
+    def __getattr__(self, attr_name):
+        """ fallback for attributes only stored in the side table
+            (set through set_attr) """
+        if attr_name != "rare_attributes":
+            rare_attributes = self.rare_attributes
+            if rare_attributes and attr_name in rare_attributes:
+                return rare_attributes[attr_name]
+        raise AttributeError(attr_name)
+
+    def get_attribute_map(self):
+        """ return a dict attribute name -> value of every attribute
+            (slots and side table) """
+        attribute_map = dict(
+            (attr_name, getattr(self, attr_name)) for attr_name in Attributes.__slots__
+            if attr_name != "rare_attributes" and hasattr(self, attr_name))
+        if self.rare_attributes:
+            attribute_map.update(self.rare_attributes)
+        return attribute_map
 
     def get_str(self, tab_level = 0):
         """ string conversion for operation graph 
@@ -186,15 +243,16 @@ class Attributes(object):
         copied_attibute =  Attributes(precision = self.precision, 
           interval = self.interval, 
           debug = self.debug, 
-          exact = self.exact, 
           tag = self.tag, 
-          max_abs_error = self.max_abs_error, 
           silent = self.silent, 
           handle = self.handle, 
-          clearprevious = self.clearprevious, 
           rounding_mode = self.rounding_mode, 
-          prevent_optimization = self.prevent_optimization
         )
+        # copying rare attributes
+        if self.rare_attributes:
+            for attr_name in self.rare_attributes:
+                if not attr_name in Attributes.uncopied_attributes:
+                    copied_attibute.set_attr(**{attr_name: self.rare_attributes[attr_name]})
         # copying dynamic attributes
         for dyn_attr in Attributes.dynamic_attribute_map:
           copied_attibute.__setattr__(dyn_attr, getattr(self, dyn_attr))
@@ -207,7 +265,13 @@ class Attributes(object):
         """ generic attribute setter """
         for attr_name in init_map:
             attr_value = init_map[attr_name]
-            setattr(self, attr_name, attr_value)
+            try:
+                setattr(self, attr_name, attr_value)
+            except AttributeError:
+                # attribute without slot nor property
+                if self.rare_attributes is None:
+                    self.rare_attributes = {}
+                self.rare_attributes[attr_name] = attr_value
 
     def get_prevent_optimization(self):
         return self.prevent_optimization
@@ -314,5 +378,13 @@ class Attributes(object):
         if len(Attributes.default_silent) < 1: raise Exception()
 
 
+# properties of rarely set attributes
+for rare_attr_name in Attributes.rare_attribute_map:
+    setattr(
+        Attributes, rare_attr_name,
+        rare_attribute_property(rare_attr_name, Attributes.rare_attribute_map[rare_attr_name])
+    )
+
+
 # end of doxygen group attributes
 ## @}
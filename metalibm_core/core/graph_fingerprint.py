@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Structural fingerprints of operation graphs
+
+    The fingerprint of a graph is the SHA-256 digest of a canonical
+    description of its nodes listed in post-order: node class, attributes,
+    node specific fields (specifier, constant value, table content ...)
+    and operand indexes. It does not depend on node identities, so two
+    structurally identical graphs, possibly built in different processes,
+    share the same fingerprint. """
+
+import hashlib
+
+from sollya import SollyaObject
+
+from .ml_operations import AbstractOperation
+from .graph_walker import post_order_walk, get_node_inputs
+from ..utility.sollya_cache import sollya_exact_str
+
+
+## node fields stored in slots and part of the fingerprint
+#  (see AbstractOperation.__slots__)
+FINGERPRINT_SLOT_FIELDS = ("specifier", "likely", "value", "var_type")
+## node fields which are not part of the fingerprint: operands are
+#  described by index, others are derived or bookkeeping information
+IGNORED_NODE_FIELDS = set([
+    "inputs", "extra_inputs", "parent_list", "evaluated_interval",
+])
+
+
+def has_default_repr(value):
+    """ test if value is printed with the default python repr (which
+        depends on the object address) """
+    value_class = value.__class__
+    return value_class.__repr__ is object.__repr__ and value_class.__str__ is object.__str__
+
+def get_value_str(value, index_map, depth=0):
+    """ return a canonical string description of <value>, nodes being
+        described by their index in <index_map> """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return repr(value)
+    elif isinstance(value, AbstractOperation):
+        return "@{}".format(index_map.get(value, "?"))
+    elif isinstance(value, SollyaObject):
+        return sollya_exact_str(value)
+    elif isinstance(value, (list, tuple)):
+        return "[{}]".format(",".join(get_value_str(v, index_map, depth) for v in value))
+    elif isinstance(value, dict):
+        return "{{{}}}".format(",".join(sorted(
+            "{}:{}".format(get_value_str(k, index_map, depth), get_value_str(value[k], index_map, depth))
+            for k in value)))
+    elif isinstance(value, type) or callable(value) and hasattr(value, "__name__"):
+        # classes (e.g. specifiers) and functions
+        return "<{}.{}>".format(getattr(value, "__module__", None), value.__name__)
+    elif has_default_repr(value):
+        # objects without printable form are described by their class
+        # and (one level of) their fields
+        class_str = "<{}>".format(value.__class__.__name__)
+        if depth > 0 or not hasattr(value, "__dict__"):
+            return class_str
+        return class_str + get_value_str(vars(value), index_map, depth + 1)
+    else:
+        return "{}:{}".format(value.__class__.__name__, value)
+
+def get_node_descriptor(node, index_map):
+    """ return the canonical string description of <node>, whose operands
+        have already been registered in <index_map> """
+    field_list = [
+        (name, getattr(node, name, None)) for name in FINGERPRINT_SLOT_FIELDS
+    ]
+    field_list += sorted(
+        (name, value) for name, value in getattr(node, "__dict__", {}).items()
+        if not name in IGNORED_NODE_FIELDS
+    )
+    return "{}({};{};{})".format(
+        node.__class__.__name__,
+        get_value_str(list(get_node_inputs(node)), index_map),
+        get_value_str(node.attributes.get_attribute_map(), index_map),
+        ",".join("{}={}".format(name, get_value_str(value, index_map)) for name, value in field_list)
+    )
+
+def get_graph_node_list(root_list):
+    """ return the list of the nodes reachable from the nodes of
+        <root_list>, in fingerprint order: the n-th nodes of two graphs
+        sharing the same fingerprint correspond to each other """
+    node_list = []
+    index_map = {}
+    for root in root_list:
+        for node in post_order_walk(root, skip=index_map.__contains__):
+            index_map[node] = len(node_list)
+            node_list.append(node)
+    return node_list
+
+def get_graph_fingerprint(root_list, extra_key_list=None):
+    """ return the fingerprint (hexadecimal string) of the graph(s)
+        reachable from the nodes of <root_list>
+
+        Args:
+            root_list (list): list of root nodes
+            extra_key_list (list): values (not nodes) to be included
+                in the fingerprint (e.g. function name)
+    """
+    digest = hashlib.sha256()
+    index_map = {}
+    for root in root_list:
+        for node in post_order_walk(root, skip=index_map.__contains__):
+            descriptor = get_node_descriptor(node, index_map)
+            index_map[node] = len(index_map)
+            digest.update(descriptor.encode("utf-8"))
+            digest.update(b"\n")
+        digest.update("root:@{}\n".format(index_map[root]).encode("utf-8"))
+    for value in (extra_key_list or []):
+        digest.update(get_value_str(value, index_map).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Iterative traversals of operation graphs
+
+    Operation graphs built for hardware designs can be several thousands
+    of nodes deep, which exceeds Python's recursion limit when walked
+    recursively. The walkers of this module use an explicit stack, visit
+    each node once and follow inputs in the same order as a recursive
+    depth-first walk would: a recursive depth-first pass ported to them
+    processes nodes in the same order. Traversals which were not
+    depth-first do change order when ported (e.g. VHDL operand
+    generation, formerly a reversed breadth-first list, now emits
+    operands in post-order). """
+
+import weakref
+
+from .ml_operations import AbstractOperation, ML_LeafNode
+
+
+def get_node_inputs(node):
+    """ default input function: inputs and extra (hidden) inputs
+        of <node>. Leaf nodes may have extra inputs too (e.g. the return
+        value of a RaiseReturn ExceptionOperation) """
+    extra_inputs = node.get_extra_inputs()
+    if isinstance(node, ML_LeafNode):
+        return tuple(extra_inputs)
+    if extra_inputs:
+        return tuple(node.get_inputs()) + tuple(extra_inputs)
+    return node.get_inputs()
+
+def get_node_operands(node):
+    """ input function restricted to the operands of <node>
+        (extra inputs are not listed), the operands of a leaf node
+        are its extra inputs """
+    if isinstance(node, ML_LeafNode):
+        return tuple(node.get_extra_inputs())
+    return node.get_inputs()
+
+def never_skip(node):
+    return False
+
+
+def post_order_walk(root, get_inputs=get_node_inputs, skip=never_skip):
+    """ generate every node reachable from <root> (<root> included) once,
+        each node being generated after all of its inputs
+
+        Args:
+            get_inputs (callable): node -> list of nodes to be walked
+                before node
+            skip (callable): node -> bool, skipped nodes are neither
+                generated nor walked through (e.g. already processed
+                nodes)
+    """
+    if skip(root):
+        return
+    visited = set([root])
+    stack = [(root, iter(get_inputs(root)))]
+    while stack:
+        node, input_iterator = stack[-1]
+        for op in input_iterator:
+            if not op in visited and not skip(op):
+                visited.add(op)
+                stack.append((op, iter(get_inputs(op))))
+                break
+        else:
+            stack.pop()
+            yield node
+
+def pre_order_walk(root, get_inputs=get_node_inputs, skip=never_skip):
+    """ generate every node reachable from <root> (<root> included) once,
+        each node being generated before its inputs.
+        The inputs of a node are only listed once the node has been
+        generated, so they can be modified by the caller """
+    visited = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node in visited or skip(node):
+            continue
+        visited.add(node)
+        yield node
+        stack.extend(reversed(tuple(get_inputs(node))))
+
+def context_walk(root, context, expand):
+    """ pre-order walk of <root> where each node is associated with a
+        context (e.g. its enclosing blocks).
+
+        <expand>(node, context) processes node and returns the list of
+        (input, input_context) to be walked next; nodes are not
+        memoized, <expand> must return an empty list for nodes which
+        should not be walked again """
+    stack = [(root, context)]
+    while stack:
+        node, context = stack.pop()
+        stack.extend(reversed(expand(node, context)))
+
+def get_node_count(root_list):
+    """ return the number of distinct nodes reachable from the nodes
+        of <root_list> """
+    visited = set()
+    for root in root_list:
+        visited.update(post_order_walk(root, skip=visited.__contains__))
+    return len(visited)
+
+
+## root node -> (graph version, list of nodes in post-order)
+POST_ORDER_CACHE = weakref.WeakKeyDictionary()
+
+def get_post_order(root):
+    """ return the list of nodes reachable from <root> in post-order.
+        The list is cached until the inputs of any node are modified
+        (see AbstractOperation.graph_version), it must not be modified
+        by the caller """
+    graph_version = AbstractOperation.graph_version
+    cache_entry = POST_ORDER_CACHE.get(root)
+    if cache_entry is None or cache_entry[0] != graph_version:
+        cache_entry = (graph_version, list(post_order_walk(root)))
+        POST_ORDER_CACHE[root] = cache_entry
+    return cache_entry[1]
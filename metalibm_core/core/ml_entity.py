@@ -82,8 +82,13 @@ from metalibm_core.code_generation.gappa_code_generator import (
 )
 
 from metalibm_core.utility.log_report import Log
+from metalibm_core.utility.pass_profiler import PASS_PROFILER
 from metalibm_core.utility.ml_template import (
-    ArgDefault, DefaultEntityArgTemplate
+    ArgDefault, DefaultEntityArgTemplate, AUTO_TEST_EXHAUSTIVE
+)
+from metalibm_core.utility.test_vector_store import (
+    get_method_source_hash, get_test_vector_key,
+    load_test_vectors, store_test_vectors
 )
 
 from metalibm_core.opt.p_pipelining import generate_pipeline_stage
@@ -245,6 +250,8 @@ class ML_EntityBasis(object):
     language      = ArgDefault.select_value([arg_template.language, language])
     auto_test     = arg_template.auto_test
     auto_test_std = arg_template.auto_test_std
+    if auto_test == AUTO_TEST_EXHAUSTIVE:
+      Log.report(Log.Error, "exhaustive auto-test is not supported for entities")
 
     self.precision = arg_template.precision
     self.pipelined = arg_template.pipelined
@@ -260,6 +267,8 @@ class ML_EntityBasis(object):
     self.auto_test_number  = auto_test
     self.auto_test_range   = arg_template.auto_test_range
     self.auto_test_std     = auto_test_std 
+    # random seed of auto-test input generation (None: not seeded)
+    self.auto_test_seed    = arg_template.auto_test_seed
 
     # enable/disable automatic exit once functional test is finished
     self.exit_after_test   = arg_template.exit_after_test
@@ -269,6 +278,9 @@ class ML_EntityBasis(object):
     # enable post-elaboration simulation
     self.execute_trigger = arg_template.execute_trigger
 
+    # output file of generation profile (None: profiling disabled)
+    self.profile_passes = arg_template.profile_passes
+
     self.language = language
 
     # Naming logic, using provided information if available, otherwise deriving from base_name
@@ -481,116 +493,133 @@ class ML_EntityBasis(object):
 			display_after_opt = False, 
 			enable_subexpr_sharing = True
 		):
-    ## apply @p pass_object optimization pass
-    #  to the scheme of each entity in code_entity_list
-    def entity_execute_pass(scheduler, pass_object, code_entity_list):
-      for code_entity in code_entity_list:
-        entity_scheme = code_entity.get_scheme()
-        processed_scheme = pass_object.execute(entity_scheme)
-        # todo check pass effect
-        # code_entity.set_scheme(processed_scheme)
-      return code_entity_list
-
-    # generate scheme
-    code_entity_list = self.generate_entity_list()
-
-    # defaulting pipeline stage to None
-    self.implementation.set_current_stage(None)
-
-    Log.report(Log.Info, "Applying passes just before pipelining")
-    code_entity_list = self.pass_scheduler.get_full_execute_from_slot(
-      code_entity_list,
-      PassScheduler.BeforePipelining,
-      entity_execute_pass
-    )
-
-    #print "before pipelining dump: "
-    #for code_entity in code_entity_list:
-    #    scheme = code_entity.get_scheme()
-    #    print scheme.get_str(
-    #        depth = None,
-    #        display_precision = True,
-    #        memoization_map = {},
-    #        custom_callback = lambda op: " [S={}] ".format(op.attributes.init_stage)
-    #    )
+    # profiling is left to an enclosing generation which already enabled it
+    profile_owner = self.profile_passes and not PASS_PROFILER.enabled
+    if profile_owner:
+      PASS_PROFILER.enable()
+    try:
+      ## apply @p pass_object optimization pass
+      #  to the scheme of each entity in code_entity_list
+      def entity_execute_pass(scheduler, pass_object, code_entity_list):
+        for code_entity in code_entity_list:
+          entity_scheme = code_entity.get_scheme()
+          processed_scheme = pass_object.execute(entity_scheme)
+          # todo check pass effect
+          # code_entity.set_scheme(processed_scheme)
+        return code_entity_list
+
+      # generate scheme
+      with PASS_PROFILER.section("phase", "scheme_generation"):
+        code_entity_list = self.generate_entity_list()
+
+      # defaulting pipeline stage to None
+      self.implementation.set_current_stage(None)
+
+      Log.report(Log.Info, "Applying passes just before pipelining")
+      code_entity_list = self.pass_scheduler.get_full_execute_from_slot(
+        code_entity_list,
+        PassScheduler.BeforePipelining,
+        entity_execute_pass
+      )
 
-    if self.pipelined:
-        self.stage_num = generate_pipeline_stage(self, reset=self.reset_pipeline, recirculate=self.recirculate_pipeline)
-    else:
-        self.stage_num = 1
-    Log.report(Log.Info, "there is/are {} pipeline stage(s)".format(self.stage_num)) 
-
-    Log.report(Log.Info, "Applying passes just after pipelining")
-    code_entity_list = self.pass_scheduler.get_full_execute_from_slot(
-      code_entity_list, 
-      PassScheduler.AfterPipelining,
-      entity_execute_pass
-    )
+      #print "before pipelining dump: "
+      #for code_entity in code_entity_list:
+      #    scheme = code_entity.get_scheme()
+      #    print scheme.get_str(
+      #        depth = None,
+      #        display_precision = True,
+      #        memoization_map = {},
+      #        custom_callback = lambda op: " [S={}] ".format(op.attributes.init_stage)
+      #    )
+
+      if self.pipelined:
+          with PASS_PROFILER.section("phase", "pipelining"):
+              self.stage_num = generate_pipeline_stage(self, reset=self.reset_pipeline, recirculate=self.recirculate_pipeline)
+      else:
+          self.stage_num = 1
+      Log.report(Log.Info, "there is/are {} pipeline stage(s)".format(self.stage_num)) 
+
+      Log.report(Log.Info, "Applying passes just after pipelining")
+      code_entity_list = self.pass_scheduler.get_full_execute_from_slot(
+        code_entity_list, 
+        PassScheduler.AfterPipelining,
+        entity_execute_pass
+      )
 
-    # stage duration (in ns)
-    time_step = 10
+      # stage duration (in ns)
+      time_step = 10
 
-    if self.auto_test_enable:
-      code_entity_list += self.generate_auto_test(
+      if self.auto_test_enable:
+        with PASS_PROFILER.section("phase", "test_generation"):
+          code_entity_list += self.generate_auto_test(
 				test_num = self.auto_test_number if self.auto_test_number else 0, 
 				test_range = self.auto_test_range,
-                time_step = time_step
+                  time_step = time_step
 			)
       
 
-    for code_entity in code_entity_list:
-      scheme = code_entity.get_scheme()
-      if display_after_gen or self.display_after_gen:
-        print("function %s, after gen " % code_entity.get_name())
-        print(scheme.get_str(depth = None, display_precision = True, memoization_map = {}))
+      for code_entity in code_entity_list:
+        scheme = code_entity.get_scheme()
+        if display_after_gen or self.display_after_gen:
+          print("function %s, after gen " % code_entity.get_name())
+          print(scheme.get_str(depth = None, display_precision = True, memoization_map = {}))
 
-      # optimize scheme
-      opt_scheme = self.optimise_scheme(scheme, enable_subexpr_sharing = enable_subexpr_sharing)
+        # optimize scheme
+        opt_scheme = self.optimise_scheme(scheme, enable_subexpr_sharing = enable_subexpr_sharing)
 
-      if display_after_opt or self.display_after_opt:
-        print("function %s, after opt " % code_entity.get_name())
-        print(scheme.get_str(depth = None, display_precision = True, memoization_map = {}))
+        if display_after_opt or self.display_after_opt:
+          print("function %s, after opt " % code_entity.get_name())
+          print(scheme.get_str(depth = None, display_precision = True, memoization_map = {}))
 
       
 
-    print("Applying passes just before codegen")
-    code_entity_list = self.pass_scheduler.get_full_execute_from_slot(
-      code_entity_list, 
-      PassScheduler.JustBeforeCodeGen,
-      entity_execute_pass
-    )
+      print("Applying passes just before codegen")
+      code_entity_list = self.pass_scheduler.get_full_execute_from_slot(
+        code_entity_list, 
+        PassScheduler.JustBeforeCodeGen,
+        entity_execute_pass
+      )
 
-    # generate VHDL code to implement scheme
-    self.generate_code(code_entity_list, language = self.language)
-
-    if self.execute_trigger:
-      # rtl elaboration
-      print("Elaborating {}".format(self.output_file))
-      elab_cmd = "vlib work && vcom -2008 {}".format(self.output_file)
-      elab_result = subprocess.call(elab_cmd, shell = True)
-      print("Elaboration result: ", elab_result)
-      # debug cmd
-      debug_cmd = "do {debug_file};".format(debug_file = self.debug_file) if self.debug_flag else "" 
-      debug_cmd += " exit;" if self.exit_after_test else ""
-      # simulation
-      test_delay = time_step * (self.stage_num + 2) * (self.auto_test_number + (len(self.standard_test_cases) if self.auto_test_std else 0) + 100) 
-      sim_cmd = "vsim -c work.testbench -do \"run {test_delay} ns; {debug_cmd}\"".format(entity = self.entity_name, debug_cmd = debug_cmd, test_delay = test_delay)
-      Log.report(Log.Info, "simulation command:\n{}".format(sim_cmd))
-      sim_result = subprocess.call(sim_cmd, shell = True)
-      if sim_result:
-        Log.report(Log.Error, "simulation failed [{}]".format(sim_result))
-      else:
-        Log.report(Log.Info, "simulation success")
-
-    elif self.build_enable:
-      print("Elaborating {}".format(self.output_file))
-      elab_cmd = "vlib work && vcom -2008 {}".format(self.output_file)
-      Log.report(Log.Info, "elaboration command:\n{}".format(elab_cmd))
-      elab_result = subprocess.call(elab_cmd, shell = True)
-      if elab_result:
-        Log.report(Log.Error, "failed to elaborate [{}]".format(elab_result))
-      else:
-        Log.report(Log.Info, "elaboration success")
+      # generate VHDL code to implement scheme
+      with PASS_PROFILER.section("phase", "code_generation"):
+        self.generate_code(code_entity_list, language = self.language)
+
+      if self.execute_trigger:
+        # rtl elaboration
+        print("Elaborating {}".format(self.output_file))
+        elab_cmd = "vlib work && vcom -2008 {}".format(self.output_file)
+        with PASS_PROFILER.tool("simulator"):
+          elab_result = subprocess.call(elab_cmd, shell = True)
+        print("Elaboration result: ", elab_result)
+        # debug cmd
+        debug_cmd = "do {debug_file};".format(debug_file = self.debug_file) if self.debug_flag else "" 
+        debug_cmd += " exit;" if self.exit_after_test else ""
+        # simulation
+        test_delay = time_step * (self.stage_num + 2) * (self.auto_test_number + (len(self.standard_test_cases) if self.auto_test_std else 0) + 100) 
+        sim_cmd = "vsim -c work.testbench -do \"run {test_delay} ns; {debug_cmd}\"".format(entity = self.entity_name, debug_cmd = debug_cmd, test_delay = test_delay)
+        Log.report(Log.Info, "simulation command:\n{}".format(sim_cmd))
+        with PASS_PROFILER.section("phase", "test_execution"), PASS_PROFILER.tool("simulator"):
+          sim_result = subprocess.call(sim_cmd, shell = True)
+        if sim_result:
+          Log.report(Log.Error, "simulation failed [{}]".format(sim_result))
+        else:
+          Log.report(Log.Info, "simulation success")
+
+      elif self.build_enable:
+        print("Elaborating {}".format(self.output_file))
+        elab_cmd = "vlib work && vcom -2008 {}".format(self.output_file)
+        Log.report(Log.Info, "elaboration command:\n{}".format(elab_cmd))
+        with PASS_PROFILER.tool("simulator"):
+          elab_result = subprocess.call(elab_cmd, shell = True)
+        if elab_result:
+          Log.report(Log.Error, "failed to elaborate [{}]".format(elab_result))
+        else:
+          Log.report(Log.Info, "elaboration success")
+
+    finally:
+      if profile_owner:
+        PASS_PROFILER.dump(self.profile_passes)
+        PASS_PROFILER.disable()
 
 
   # Currently mostly empty, to be populated someday
@@ -714,27 +743,14 @@ class ML_EntityBasis(object):
     self_instance = self_component(io_map = io_map, tag = "tested_entity")
     test_statement = Statement()
 
-    # initializing random test case generator
-    self.init_test_generator()
-
-    # Appending standard test cases if required
-    if self.auto_test_std:
-      tc_list += self.standard_test_cases
-
-    for i in range(test_num):
-      input_values = self.generate_test_case(input_signals, io_map, i, test_range)
-      tc_list.append((input_values,None))
-
-    def compute_results(tc):
-        """ update test case with output values if required """
-        input_values, output_values = tc
-        if output_values is None:
-            return input_values, self.numeric_emulate(input_values)
-        else:
-            return tc
-
-    # filling output values
-    tc_list = [compute_results(tc) for tc in tc_list]
+    # test vectors are fetched from the persistent store
+    # when a seeded set with the same characteristics has already
+    # been generated
+    test_vector_key = self.get_test_vector_key(test_num, test_range)
+    tc_list = load_test_vectors(test_vector_key)
+    if tc_list is None:
+      tc_list = self.generate_test_vectors(input_signals, io_map, test_num, test_range)
+      store_test_vectors(test_vector_key, tc_list)
 
     for input_values, output_values in tc_list:
       test_statement.add(
@@ -781,6 +797,63 @@ class ML_EntityBasis(object):
 
     return [testbench]
 
+  def get_test_vector_key(self, test_num, test_range):
+    """ return the key identifying the auto-test vector set in the
+        persistent test vector store (None if vectors are not
+        reproducible, i.e. no seed was given) """
+    key_elements = self.get_test_vector_key_elements()
+    if key_elements is None:
+      return None
+    source_hash = get_method_source_hash(
+      self, ["numeric_emulate", "init_test_generator", "generate_test_case"]
+    )
+    return get_test_vector_key(
+      self.entity_name, source_hash, self.auto_test_seed,
+      test_num, test_range, self.auto_test_std,
+      [precision.get_name() for precision in self.io_precisions],
+      key_elements
+    )
+
+  def get_test_vector_key_elements(self):
+    """ return the list of the instance specific values read by
+        numeric_emulate (e.g. operand descriptors), which are part of
+        the test vector store key, or None if the emulation can not be
+        identified (test vectors are then not stored).
+        Entities whose emulation depends on such values must overload
+        this method """
+    return []
+
+  def generate_test_vectors(self, input_signals, io_map, test_num, test_range):
+    """ generate the list of test cases (input_values, output_values)
+        made of standard test cases (if enabled) and of @p test_num random
+        test cases """
+    tc_list = []
+
+    if not self.auto_test_seed is None:
+      random.seed(self.auto_test_seed)
+
+    # initializing random test case generator
+    self.init_test_generator()
+
+    # Appending standard test cases if required
+    if self.auto_test_std:
+      tc_list += self.standard_test_cases
+
+    for i in range(test_num):
+      input_values = self.generate_test_case(input_signals, io_map, i, test_range)
+      tc_list.append((input_values,None))
+
+    def compute_results(tc):
+        """ update test case with output values if required """
+        input_values, output_values = tc
+        if output_values is None:
+            return input_values, self.numeric_emulate(input_values)
+        else:
+            return tc
+
+    # filling output values
+    return [compute_results(tc) for tc in tc_list]
+
   @staticmethod
   def get_name():
     return ML_EntityBasis.function_name
@@ -36,7 +36,9 @@
 import os
 import random
 import subprocess
+import multiprocessing
 
+import sollya
 from sollya import *
 
 from metalibm_core.core.ml_formats import *
@@ -53,16 +55,19 @@ from metalibm_core.code_generation.code_function import (
     CodeFunction, FunctionGroup
 )
 from metalibm_core.code_generation.generic_processor import GenericProcessor
+from metalibm_core.code_generation.abstract_backend import report_dispatch_stats
 from metalibm_core.code_generation.mpfr_backend import MPFRProcessor
 from metalibm_core.code_generation.c_code_generator import CCodeGenerator
 from metalibm_core.code_generation.code_constant import C_Code
 #from metalibm_core.code_generation.generator_utility import *
 from metalibm_core.core.passes import (
-    Pass, PassScheduler, PassDependency, AfterPassById
+    Pass, PassScheduler, PassDependency, AfterPassById,
+    report_function_pass_stats, incremental_pass_execution
 )
 
 from metalibm_core.opt.p_function_std import (
-    PassCheckProcessorSupport, PassSubExpressionSharing, PassFuseFMA
+    PassCheckProcessorSupport, PassSubExpressionSharing, PassFuseFMA,
+    PassValueNumbering
 )
 from metalibm_core.opt.p_function_typing import (
     PassInstantiateAbstractPrecision, PassInstantiatePrecision,
@@ -72,7 +77,24 @@ from metalibm_core.code_generation.gappa_code_generator import GappaCodeGenerato
 
 from metalibm_core.utility.log_report import Log
 from metalibm_core.utility.debug_utils import *
-from metalibm_core.utility.ml_template import DefaultArgTemplate
+from metalibm_core.utility.disk_cache import DiskCache
+from metalibm_core.utility.test_vector_store import (
+    encode_test_value, decode_test_value, get_method_source_hash,
+    get_test_vector_key, load_test_vectors, store_test_vectors,
+    write_test_vector_file, get_c_string_literal
+)
+from metalibm_core.utility.build_cache import (
+    get_build_key, load_build_result, store_build_result,
+    get_support_library
+)
+from metalibm_core.utility.pass_profiler import PASS_PROFILER
+from metalibm_core.utility.shared_object import (
+    SharedFunction, get_array_wrapper_code, check_output_arrays,
+    is_numpy_available
+)
+from metalibm_core.utility.ml_template import (
+    DefaultArgTemplate, AUTO_TEST_EXHAUSTIVE
+)
 
 
 ## \defgroup ml_function ml_function
@@ -87,41 +109,129 @@ class ValidError(Exception):
     pass
 
 
-def build_code_function(src_list, bin_file, processor, link_trigger=False):
+## (meta-function, test case list) shared with the worker processes
+#  of ML_FunctionBasis.compute_output_check_values (inherited by fork)
+_OUTPUT_CHECK_CONTEXT = None
+
+def _compute_output_check_chunk(chunk_bounds):
+    """ compute the output check values of the test cases
+        test_case_list[start:end] of _OUTPUT_CHECK_CONTEXT; values are
+        returned encoded (see encode_test_value) as sollya objects can not
+        be sent back to the parent process """
+    fct, test_case_list = _OUTPUT_CHECK_CONTEXT
+    start, end = chunk_bounds
+    return encode_test_value(
+        fct.accuracy.get_output_check_value_batch(fct, test_case_list[start:end])
+    )
+
+
+def flatten_table_content(table):
+    """ return the values of <table> as a flat list (row-major order) """
+    if len(table.dimensions) == 1:
+        return list(table.table)
+    return [value for line in table.table for value in line]
+
+def get_support_src_list(extra_src_list=None):
+    """ return the list of support library sources linked with
+        generated functions (extended with extra_src_list, a list of
+        other source names from metalibm_core/support_lib) """
+    src_name_list = ["ml_libm_compatibility.c", "ml_multi_prec_lib.c"] + (extra_src_list or [])
+    return [
+        "%s/metalibm_core/support_lib/%s" % (os.environ["ML_SRC_DIR"], src_name)
+        for src_name in src_name_list
+    ]
+
+def build_code_function(src_list, bin_file, processor, link_trigger=False, libraries=None, support_sources=None):
     """ Build the code function for processor
         Args:
             src_list(list): list of source file (string)
             bin_file(str): name of the binary file (build result)
             processor: target
             link_trigger: enable/disable binary link
+            libraries(list): extra link options (e.g. ["-lmpfr"])
+            support_sources(list): extra support_lib source names
+                compiled with the linked binary
+                (e.g. ["ml_exhaustive_test.c"])
         Return:
             bool, str (error, stdout) """
     compiler = processor.get_compiler()
     test_file = bin_file
     DEFAULT_OPTIONS = ["-O2", "-DML_DEBUG"]
     compiler_options = " ".join(DEFAULT_OPTIONS + processor.get_compilation_options())
+    include_option = "-I{}/metalibm_core".format(os.environ["ML_SRC_DIR"])
+    link_option_list = []
     if not(link_trigger):
         # build only, disable link
         compiler_options += " -c  "
     else:
-        src_list += [
-            "%s/metalibm_core/support_lib/ml_libm_compatibility.c" % (os.environ["ML_SRC_DIR"]),
-            "%s/metalibm_core/support_lib/ml_multi_prec_lib.c" % (os.environ["ML_SRC_DIR"]),
+        src_list = src_list + [
+            "%s/metalibm_core/support_lib/%s" % (os.environ["ML_SRC_DIR"], src_name)
+            for src_name in (support_sources or [])
         ]
+        # support sources are linked from a prebuilt static library
+        support_library = get_support_library(
+            compiler, compiler_options.split() + [include_option],
+            get_support_src_list(["ml_test_file.c"]))
+        if support_library is None:
+            src_list += get_support_src_list(["ml_test_file.c"])
+        else:
+            link_option_list.append(support_library)
+        link_option_list += libraries or []
     Log.report(Log.Info, "Compiler options: \"{}\"".format(compiler_options))
 
+    # build results are shared through a cache indexed by the
+    # preprocessed sources and the compiler configuration
+    build_key = get_build_key(
+        compiler, compiler_options.split() + [include_option], src_list,
+        link_option_list)
+    if load_build_result(build_key, test_file):
+        return 0, "build result fetched from cache"
+
     build_command = "{compiler} {options} -I{ML_SRC_DIR}/metalibm_core \
-    {src_files} -o {test_file} -lm ".format(
+    {src_files} -o {test_file} {libraries} -lm ".format(
         compiler=compiler,
         src_files = (" ".join(src_list)),
         test_file=test_file,
         options=compiler_options,
+        libraries=" ".join(link_option_list),
         ML_SRC_DIR=os.environ["ML_SRC_DIR"])
 
     Log.report(Log.Info, "Building source with command: {}".format(build_command))
     build_result, build_stdout = get_cmd_stdout(build_command)
+    if not build_result:
+        store_build_result(build_key, test_file)
     return build_result, build_stdout
 
+def build_shared_object(src_list, so_file, processor):
+    """ Build the sources src_list into the shared object so_file
+        Args:
+            src_list(list): list of source file (string)
+            so_file(str): name of the shared object (build result)
+            processor: target
+        Return:
+            bool, str (error, stdout) """
+    compiler = processor.get_compiler()
+    DEFAULT_OPTIONS = ["-O2", "-shared", "-fPIC"]
+    compiler_options = " ".join(DEFAULT_OPTIONS + processor.get_compilation_options())
+    include_option = "-I{}/metalibm_core".format(os.environ["ML_SRC_DIR"])
+    support_library = get_support_library(
+        compiler, compiler_options.split() + [include_option],
+        get_support_src_list())
+    if support_library is None:
+        src_list = src_list + get_support_src_list()
+        support_library = ""
+    build_command = "{compiler} {options} -I{ML_SRC_DIR}/metalibm_core \
+    {src_files} -o {so_file} {support_library} -lm ".format(
+        compiler=compiler,
+        src_files = (" ".join(src_list)),
+        so_file=so_file,
+        support_library=support_library,
+        options=compiler_options,
+        ML_SRC_DIR=os.environ["ML_SRC_DIR"])
+
+    Log.report(Log.Info, "Building shared object with command: {}".format(build_command))
+    return get_cmd_stdout(build_command)
+
 def get_cmd_stdout(cmd):
     """ execute cmd on a subprocess and return return-code and stdout
         message """
@@ -185,6 +295,19 @@ class ML_FunctionBasis(object):
     self.auto_test_number = args.auto_test
     self.auto_test_range = args.auto_test_range
     self.auto_test_std   = args.auto_test_std 
+    # number of processes used to compute test output values
+    self.auto_test_jobs  = args.auto_test_jobs
+    # random seed of auto-test input generation (None: not seeded)
+    self.auto_test_seed  = args.auto_test_seed
+    # binary file storing auto-test vectors (None: embedded tables)
+    self.auto_test_file  = args.auto_test_file
+    # number of threads of the exhaustive auto-test driver (0: one per core)
+    self.auto_test_threads = args.auto_test_threads
+    # execute auto-test in-process (shared object) rather than
+    # through a test binary
+    self.in_process_test = args.in_process_test
+    if self.in_process_test and self.auto_test_number == AUTO_TEST_EXHAUSTIVE:
+      Log.report(Log.Error, "in-process test is not compatible with exhaustive auto-test")
 
     # enable the computation of maximal error during functional testing
     self.compute_max_error = args.compute_max_error
@@ -200,6 +323,11 @@ class ML_FunctionBasis(object):
     # binary execution
     self.execute_trigger = args.execute_trigger
 
+    # output file of generation profile (None: profiling disabled)
+    self.profile_passes = args.profile_passes
+    # reuse function pass results within the process
+    self.incremental_passes = args.incremental_passes
+
     self.language = args.language
 
     Log.report(Log.Info, "auto test: {}, {}, {}".format(self.auto_test_enable, self.auto_test_number,  self.auto_test_range))
@@ -254,9 +382,16 @@ class ML_FunctionBasis(object):
         ]
     )
 
+    Log.report(Log.Info, "inserting value numbering pass\n")
+    pass_value_numbering = PassValueNumbering(self.processor)
+    self.pass_scheduler.register_pass(
+        pass_value_numbering,
+        pass_slot=PassScheduler.Optimization
+        )
     Log.report(Log.Info, "inserting sub-expr sharing pass\n")
     self.pass_scheduler.register_pass(
         PassSubExpressionSharing(self.processor),
+        pass_dep=AfterPassById(pass_value_numbering.get_pass_id()),
         pass_slot=PassScheduler.Optimization
         )
     #Log.report(Log.Info, "inserting fused fma pass\n")
@@ -479,149 +614,250 @@ class ML_FunctionBasis(object):
                optimization
 
         """
-    # generate scheme
-    function_group = self.generate_function_list()
-
-    ## apply @p pass_object optimization pass
-    #  to the scheme of each entity in code_entity_list
-    def execute_pass_on_fct_group(scheduler, pass_object, function_group):
-        """ execute an optimization pass on a function_group """
-        return pass_object.execute_on_fct_group(function_group)
-
-    Log.report(Log.Info, "Applying <Start> stage passes")
-    _ = self.pass_scheduler.get_full_execute_from_slot(
-      function_group,
-      PassScheduler.Start,
-      execute_pass_on_fct_group
-    )
-
-    # generate vector size
-    if self.get_vector_size() != 1:
-        scalar_scheme = self.implementation.get_scheme()
-        scalar_arg_list = self.implementation.get_arg_list()
-        self.implementation.clear_arg_list()
-
-        function_group = self.generate_vector_implementation(
-            scalar_scheme, scalar_arg_list, self.get_vector_size()
-        )
-
-    # format instantiation
-    Log.report(Log.Info, "Applying <Typing> stage passes")
-    _ = self.pass_scheduler.get_full_execute_from_slot(
+    # profiling is left to an enclosing generation which already enabled it
+    profile_owner = self.profile_passes and not PASS_PROFILER.enabled
+    if profile_owner:
+      PASS_PROFILER.enable()
+    try:
+      # generate scheme
+      with PASS_PROFILER.section("phase", "scheme_generation"):
+        function_group = self.generate_function_list()
+
+      ## apply @p pass_object optimization pass
+      #  to the scheme of each entity in code_entity_list
+      def execute_pass_on_fct_group(scheduler, pass_object, function_group):
+          """ execute an optimization pass on a function_group """
+          with incremental_pass_execution(self.incremental_passes):
+              return pass_object.execute_on_fct_group(function_group)
+
+      Log.report(Log.Info, "Applying <Start> stage passes")
+      _ = self.pass_scheduler.get_full_execute_from_slot(
         function_group,
-        PassScheduler.Typing,
+        PassScheduler.Start,
         execute_pass_on_fct_group
-    )
+      )
 
-    # format instantiation
-    Log.report(Log.Info, "Applying <Optimization> stage passes")
-    _ = self.pass_scheduler.get_full_execute_from_slot(
-        function_group,
-        PassScheduler.Optimization,
-        execute_pass_on_fct_group
-    )
+      # generate vector size
+      if self.get_vector_size() != 1:
+          scalar_scheme = self.implementation.get_scheme()
+          scalar_arg_list = self.implementation.get_arg_list()
+          self.implementation.clear_arg_list()
 
-    # format instantiation
-    Log.report(Log.Info, "Applying <JustBeforeCodeGen> stage passes")
-    _ = self.pass_scheduler.get_full_execute_from_slot(
-        function_group,
-        PassScheduler.JustBeforeCodeGen,
-        execute_pass_on_fct_group
-    )
+          function_group = self.generate_vector_implementation(
+              scalar_scheme, scalar_arg_list, self.get_vector_size()
+          )
 
-    main_pre_statement = Statement()
-    main_statement = Statement()
+      # format instantiation
+      Log.report(Log.Info, "Applying <Typing> stage passes")
+      _ = self.pass_scheduler.get_full_execute_from_slot(
+          function_group,
+          PassScheduler.Typing,
+          execute_pass_on_fct_group
+      )
 
-    CstError = Constant(1, precision=ML_Int32)
-    CstSuccess = Constant(0, precision=ML_Int32)
+      # format instantiation
+      Log.report(Log.Info, "Applying <Optimization> stage passes")
+      _ = self.pass_scheduler.get_full_execute_from_slot(
+          function_group,
+          PassScheduler.Optimization,
+          execute_pass_on_fct_group
+      )
 
-    def add_fct_call_check_in_main(fct_group, code_function):
-        """ adding call to code_function with return value check
-            in main statement """
-        scheme = code_function.get_scheme()
-        opt_scheme = self.optimise_scheme(
-            scheme, enable_subexpr_sharing = enable_subexpr_sharing
-        )
-        code_function.set_scheme(opt_scheme)
-        fct_call = code_function.build_function_object()()
-        main_pre_statement.add(fct_call)
-        main_statement.add(
-            ConditionBlock(
-                fct_call,
-                Return(CstError)
-            )
-        )
+      # format instantiation
+      Log.report(Log.Info, "Applying <JustBeforeCodeGen> stage passes")
+      _ = self.pass_scheduler.get_full_execute_from_slot(
+          function_group,
+          PassScheduler.JustBeforeCodeGen,
+          execute_pass_on_fct_group
+      )
 
-    # generate auto-test wrapper
-    if self.auto_test_enable:
-        auto_test_function_group = self.generate_test_wrapper(
-            test_num = self.auto_test_number if self.auto_test_number else 0,
-            test_range = self.auto_test_range
-        )
-        auto_test_function_group.apply_to_all_functions(add_fct_call_check_in_main)
-        # appending auto-test wrapper to general code_function_list
-        function_group.merge_with_group(auto_test_function_group)
-
-    if self.bench_enabled:
-        bench_function_group = self.generate_bench_wrapper(
-            test_num = self.bench_test_number if self.bench_test_number else 1000,
-            test_range = self.bench_test_range
-        )
+      main_pre_statement = Statement()
+      main_statement = Statement()
 
-        bench_function_group.apply_to_all_functions(add_fct_call_check_in_main)
-        # appending bench wrapper to general code_function_list
-        function_group.merge_with_group(bench_function_group)
+      CstError = Constant(1, precision=ML_Int32)
+      CstSuccess = Constant(0, precision=ML_Int32)
 
-    # adding main function
-    if self.bench_enabled or self.auto_test_enable:
-        main_function = CodeFunction("main", output_format=ML_Int32)
-        main_function.set_scheme(
-            Statement(
-                main_pre_statement,
-                main_statement,
-                Return(CstSuccess)
+      def add_fct_call_check_in_main(fct_group, code_function):
+          """ adding call to code_function with return value check
+              in main statement """
+          scheme = code_function.get_scheme()
+          opt_scheme = self.optimise_scheme(
+              scheme, enable_subexpr_sharing = enable_subexpr_sharing
+          )
+          code_function.set_scheme(opt_scheme)
+          fct_call = code_function.build_function_object()()
+          main_pre_statement.add(fct_call)
+          main_statement.add(
+              ConditionBlock(
+                  fct_call,
+                  Return(CstError)
+              )
+          )
+
+      with PASS_PROFILER.section("phase", "test_generation"):
+        # generate auto-test wrapper
+        if self.auto_test_enable and self.in_process_test:
+            # tests are executed in-process once the function is built
+            # (see execute_in_process_test), no wrapper is generated
+            pass
+        elif self.auto_test_enable and self.auto_test_number == AUTO_TEST_EXHAUSTIVE:
+            auto_test_function_group = self.generate_exhaustive_test_wrapper(
+                test_range = self.auto_test_range
             )
-        )
-        function_group.add_core_function(main_function)
-
-    # generate C code to implement scheme
-    self.generate_code(function_group, language = self.language)
-
-    build_trigger = self.build_enable or self.execute_trigger
-    link_trigger = self.execute_trigger
-
-    if build_trigger:
-        test_file = "./test_%s.bin" % self.function_name
-        build_result, build_stdout = build_code_function(
-            [self.output_file],
-            test_file, 
-            self.processor,
-            link_trigger)
-
-        if build_result:
-            Log.report(
-                Log.Error, "build failed: \n {}".format(build_stdout),
-                error=BuildError()
+            # the MPFR reference (sub function) is only called by the driver
+            auto_test_function_group.apply_to_core_functions(add_fct_call_check_in_main)
+            function_group.merge_with_group(auto_test_function_group)
+        elif self.auto_test_enable:
+            auto_test_function_group = self.generate_test_wrapper(
+                test_num = self.auto_test_number if self.auto_test_number else 0,
+                test_range = self.auto_test_range
             )
-        else:
-            Log.report(Log.Info, "build result: {}\n{}".format(build_result, build_stdout))
-
-        # only executing if build was successful
-        if not(build_result) and self.execute_trigger:
-            test_command = " %s " % self.processor.get_execution_command(test_file)
-            Log.report(Log.Info, "VALIDATION {} command line: {}".format(
-                self.get_name(), test_command
-            ))
-            # executing test command
-            test_result, test_stdout = get_cmd_stdout(test_command)
-            if not test_result:
-                print(test_stdout)
-                Log.report(Log.Info, "VALIDATION SUCCESS")
-            else:
-                 Log.report(
-                    Log.Error, "VALIDATION FAILURE [{}]\n{}".format(test_result, test_stdout),
-                    error=ValidError()
-                )
+            auto_test_function_group.apply_to_all_functions(add_fct_call_check_in_main)
+            # appending auto-test wrapper to general code_function_list
+            function_group.merge_with_group(auto_test_function_group)
+
+        if self.bench_enabled:
+            bench_function_group = self.generate_bench_wrapper(
+                test_num = self.bench_test_number if self.bench_test_number else 1000,
+                test_range = self.bench_test_range
+            )
+
+            bench_function_group.apply_to_all_functions(add_fct_call_check_in_main)
+            # appending bench wrapper to general code_function_list
+            function_group.merge_with_group(bench_function_group)
+
+      # adding main function
+      if self.bench_enabled or (self.auto_test_enable and not self.in_process_test):
+          main_function = CodeFunction("main", output_format=ML_Int32)
+          main_function.set_scheme(
+              Statement(
+                  main_pre_statement,
+                  main_statement,
+                  Return(CstSuccess)
+              )
+          )
+          function_group.add_core_function(main_function)
+
+      # generate C code to implement scheme
+      with PASS_PROFILER.section("phase", "code_generation"):
+        self.generate_code(function_group, language = self.language)
+      DiskCache.report_stats()
+      report_dispatch_stats()
+      report_function_pass_stats()
+
+      build_trigger = self.build_enable or self.execute_trigger
+      # in-process test replaces binary link and execution
+      link_trigger = self.execute_trigger and not self.in_process_test
+
+      if build_trigger:
+          test_file = "./test_%s.bin" % self.function_name
+          with PASS_PROFILER.section("phase", "build"), PASS_PROFILER.tool("compiler"):
+              build_result, build_stdout = build_code_function(
+                  [self.output_file],
+                  test_file, 
+                  self.processor,
+                  link_trigger,
+                  libraries = self.get_test_libraries(),
+                  support_sources = self.get_test_support_sources())
+
+          if build_result:
+              Log.report(
+                  Log.Error, "build failed: \n {}".format(build_stdout),
+                  error=BuildError()
+              )
+          else:
+              Log.report(Log.Info, "build result: {}\n{}".format(build_result, build_stdout))
+
+          # only executing if build was successful
+          if not(build_result) and link_trigger:
+              test_command = " %s " % self.processor.get_execution_command(test_file)
+              Log.report(Log.Info, "VALIDATION {} command line: {}".format(
+                  self.get_name(), test_command
+              ))
+              # executing test command
+              with PASS_PROFILER.section("phase", "test_execution"):
+                  test_result, test_stdout = get_cmd_stdout(test_command)
+              if not test_result:
+                  print(test_stdout)
+                  Log.report(Log.Info, "VALIDATION SUCCESS")
+              else:
+                   Log.report(
+                      Log.Error, "VALIDATION FAILURE [{}]\n{}".format(test_result, test_stdout),
+                      error=ValidError()
+                  )
+
+      if self.in_process_test and self.auto_test_enable:
+          with PASS_PROFILER.section("phase", "test_execution"):
+              self.execute_in_process_test()
+
+    finally:
+      if profile_owner:
+        PASS_PROFILER.dump(self.profile_passes)
+        PASS_PROFILER.disable()
+
+  ## build the generated function as a shared object and load it
+  #  in the current process
+  #  @return SharedFunction object
+  def build_shared_function(self):
+    so_file = "./lib_%s.so" % self.function_name
+    wrapper_file = "./%s_array.c" % self.function_name
+    wrapper_stream = open(wrapper_file, "w")
+    wrapper_stream.write(get_array_wrapper_code(
+      self.implementation.get_name(), self.get_input_precisions(), self.precision
+    ))
+    wrapper_stream.close()
+    with PASS_PROFILER.tool("compiler"):
+      build_result, build_stdout = build_shared_object(
+        [self.output_file, wrapper_file], so_file, self.processor
+      )
+    if build_result:
+      Log.report(
+        Log.Error, "shared object build failed: \n {}".format(build_stdout),
+        error=BuildError()
+      )
+    return SharedFunction(
+      so_file, self.implementation.get_name(),
+      self.get_input_precisions(), self.precision
+    )
+
+  ## execute the auto-test in-process: the function is loaded from
+  #  a shared object and evaluated on NumPy arrays of test inputs,
+  #  accuracy is checked against the expected output values
+  #  @return dict of error statistics (see check_output_arrays)
+  def execute_in_process_test(self):
+    if not is_numpy_available():
+      Log.report(Log.Error, "numpy is required for in-process test execution")
+    if self.get_vector_size() != 1:
+      Log.report(Log.Error, "in-process test execution only supports scalar implementations")
+    test_num = self.auto_test_number if self.auto_test_number else 0
+    test_total = test_num + (len(self.standard_test_cases) if self.auto_test_std else 0)
+    test_case_list, output_value_list = self.get_test_vectors(test_num, self.auto_test_range, test_total)
+
+    shared_function = self.build_shared_function()
+    input_arrays = [
+      [float(test_case[in_id]) for test_case in test_case_list] for in_id in range(self.get_arity())
+    ]
+    output_arrays = [
+      [float(output_values[o]) for output_values in output_value_list]
+      for o in range(self.accuracy.get_num_output_value())
+    ]
+    result = shared_function.evaluate(*input_arrays)
+    stats = check_output_arrays(result, output_arrays)
+    Log.report(
+      Log.Info, "in-process test of {}: {} failure(s) / {} test(s), max abs error {}, max rel error {}",
+      self.function_name, stats["failure_num"], stats["test_num"],
+      stats["max_abs_error"], stats["max_rel_error"]
+    )
+    if stats["failure_num"]:
+      failure_index = stats["failure_index"][0]
+      Log.report(
+        Log.Error, "VALIDATION FAILURE: {} failure(s), first one for input(s) {}, result is {} vs expected {}",
+        stats["failure_num"], test_case_list[failure_index],
+        result[failure_index], output_value_list[failure_index],
+        error=ValidError()
+      )
+    Log.report(Log.Info, "VALIDATION SUCCESS")
+    return stats
 
 
 
@@ -825,14 +1061,20 @@ class ML_FunctionBasis(object):
   def numeric_emulate(self, input_value):
     raise NotImplementedError
 
+  ## provide numeric evaluation of the main function on a list of inputs
+  #  may be overloaded by meta-functions able to evaluate a whole input
+  #  vector at once, default to one numeric_emulate call per input
+  #  @param input_list list of input tuples (SollyaObject)
+  #  @return list of SollyaObject output values (same order as input_list)
+  def numeric_emulate_batch(self, input_list):
+    return [self.numeric_emulate(*input_values) for input_values in input_list]
+
 
   ## Generate a test wrapper for the @p self function 
   #  @param test_num   number of test to perform
   #  @param test_range numeric range for test's inputs
   #  @param debug enable debug mode
   def generate_test_wrapper(self, test_num = 10, test_range=Interval(-1.0, 1.0), debug=False):
-    low_input = inf(test_range)
-    high_input = sup(test_range)
     auto_test = CodeFunction("test_wrapper", output_format = ML_Int32)
 
     tested_function    = self.implementation.get_function_object()
@@ -858,52 +1100,33 @@ class ML_FunctionBasis(object):
 
     Log.report(Log.Info, "test test_total, test_num, diff: {} {} {}".format(test_total, test_num, diff))
 
-    sollya_precision = self.precision.get_sollya_object()
-    interval_size = high_input - low_input 
+    # when a test vector file is used, tables are declared
+    # without content and loaded at runtime
+    test_file_mode = not self.auto_test_file is None
 
     input_tables = [
       ML_NewTable(
         dimensions = [test_total], 
         storage_precision = self.get_input_precision(i), 
-        tag = self.uniquify_name("input_table_arg%d" % i)
+        tag = self.uniquify_name("input_table_arg%d" % i),
+        empty = test_file_mode
       ) for i in range(self.get_arity())
     ]
     ## output values required to check results are stored in output table
     num_output_value = self.accuracy.get_num_output_value()
-    output_table = ML_NewTable(dimensions = [test_total, num_output_value], storage_precision = self.precision, tag = self.uniquify_name("output_table"))
+    output_table = ML_NewTable(dimensions = [test_total, num_output_value], storage_precision = self.precision, tag = self.uniquify_name("output_table"), empty = test_file_mode)
 
     # general index for input/output tables
     table_index = 0
 
-    test_case_list = []
-
-    if self.auto_test_std:
-      # standard test cases
-      for i in range(num_std_case):
-        input_list = []
-        for in_id in range(self.get_arity()):
-          input_value = self.get_input_precision(in_id).round_sollya_object(self.standard_test_cases[i][0], RN)
-          input_list.append(input_value)
-        test_case_list.append(tuple(input_list))
-
+    test_case_list, output_value_list = self.get_test_vectors(test_num, test_range, test_total)
 
-    # random test cases
-    for i in range(test_num):
-      input_list = []
-      for in_id in range(self.get_arity()):
-        input_value = random.uniform(low_input, high_input)
-        input_value = self.precision.round_sollya_object(input_value, RN)
-        input_list.append(input_value)
-      test_case_list.append(tuple(input_list))
-
-    # generating output from the concatenated list
-    # of all inputs
     for table_index, input_tuple in enumerate(test_case_list):
       # storing inputs
       for in_id in range(self.get_arity()):
         input_tables[in_id][table_index] = input_tuple[in_id]
-      # computing and storing output values
-      output_values = self.accuracy.get_output_check_value(self, input_tuple)
+      # storing output values
+      output_values = output_value_list[table_index]
       for o in range(num_output_value):
         output_table[table_index][o] = output_values[o]
 
@@ -920,9 +1143,235 @@ class ML_FunctionBasis(object):
       printf_success_function(),
       Return(Constant(0, precision = ML_Int32))
     )
+    if test_file_mode:
+      test_scheme = Statement(
+        self.get_test_file_load_statement(input_tables, output_table),
+        test_scheme
+      )
     auto_test.set_scheme(test_scheme)
     return FunctionGroup([auto_test])
 
+  ## return the extra libraries required to link the test binary
+  def get_test_libraries(self):
+    if self.auto_test_enable and self.auto_test_number == AUTO_TEST_EXHAUSTIVE:
+      return ["-lmpfr", "-lgmp", "-lpthread"]
+    return []
+
+  ## return the support_lib sources required to link the test binary
+  def get_test_support_sources(self):
+    if self.auto_test_enable and self.auto_test_number == AUTO_TEST_EXHAUSTIVE:
+      return ["ml_exhaustive_test.c"]
+    return []
+
+  ## Generate an exhaustive test wrapper: every input of @p test_range
+  #  is tested against a MPFR reference computed by the test binary
+  #  itself (from generate_emulate), the input space being split between
+  #  threads (see support_lib/ml_exhaustive_test.h).
+  #  Only scalar single precision functions of arity 1 are supported.
+  #  @param test_range numeric range for test's inputs
+  #  @return FunctionGroup of the reference and test wrapper functions
+  def generate_exhaustive_test_wrapper(self, test_range=Interval(-1.0, 1.0)):
+    if self.precision != ML_Binary32 or self.get_input_precisions() != [ML_Binary32] or self.get_vector_size() != 1:
+      Log.report(Log.Error, "exhaustive auto-test is only supported for scalar binary32 functions of arity 1")
+
+    # MPFR reference function
+    mpfr_result = Variable("result", precision = ML_Mpfr_t)
+    mpfr_x = Variable("vx", precision = ML_Mpfr_t)
+    mpfr_rnd = Variable("rnd", precision = ML_Int32)
+    mpfr_ternary = Variable("ternary", precision = ML_Int32, var_type = Variable.Local)
+    try:
+      emulate_scheme = self.generate_emulate(mpfr_ternary, mpfr_result, mpfr_x, mpfr_rnd)
+    except (NotImplementedError, TypeError) as e:
+      Log.report(Log.Error, "exhaustive auto-test requires generate_emulate(result_ternary, result, mpfr_x, mpfr_rnd) for {}", self.function_name, error=e)
+    reference_function = CodeFunction(
+      self.uniquify_name("mpfr_reference"),
+      [mpfr_result, mpfr_x, mpfr_rnd],
+      output_format = ML_Int32
+    )
+    reference_function.set_scheme(Statement(emulate_scheme, Return(mpfr_ternary)))
+
+    # accuracy check performed by the test driver
+    if isinstance(self.accuracy, ML_CorrectlyRounded):
+      accuracy_check, goal = "ML_EXHAUSTIVE_CORRECTLY_ROUNDED", 0
+    elif isinstance(self.accuracy, ML_Faithful):
+      accuracy_check, goal = "ML_EXHAUSTIVE_FAITHFUL", 0
+    elif isinstance(self.accuracy, ML_DegradedAccuracyAbsolute):
+      accuracy_check, goal = "ML_EXHAUSTIVE_DEGRADED_ABSOLUTE", self.accuracy.goal
+    elif isinstance(self.accuracy, ML_DegradedAccuracyRelative):
+      accuracy_check, goal = "ML_EXHAUSTIVE_DEGRADED_RELATIVE", self.accuracy.goal
+    else:
+      Log.report(Log.Error, "accuracy {} is not supported by exhaustive auto-test", self.accuracy)
+
+    def get_c_bound_cst(value):
+      """ C binary32 constant for a (possibly infinite) range bound """
+      if value == -ml_infty:
+        return "-INFINITY"
+      return ML_Binary32.get_cst(value)
+
+    # one thread per core unless a number of threads was explicitly requested
+    thread_num = max(self.auto_test_threads, 0)
+    exhaustive_op = FunctionOperator(
+      "ml_exhaustive_test_binary32",
+      arg_map = {
+        0: "\"%s\"" % self.function_name,
+        1: self.implementation.get_name(),
+        2: reference_function.get_name(),
+        3: get_c_bound_cst(inf(test_range)),
+        4: get_c_bound_cst(sup(test_range)),
+        5: accuracy_check,
+        6: ML_Binary64.get_cst(goal),
+        7: str(thread_num),
+      },
+      declare_prototype = reference_function.get_function_object(),
+      require_header = ["support_lib/ml_exhaustive_test.h"]
+    )
+    exhaustive_function = FunctionObject("ml_exhaustive_test_binary32", [], ML_Int32, exhaustive_op)
+
+    auto_test = CodeFunction("test_wrapper", output_format = ML_Int32)
+    auto_test.set_scheme(Statement(Return(exhaustive_function())))
+    return FunctionGroup([auto_test], [reference_function])
+
+  ## write the content of @p input_tables and @p output_table to the
+  #  binary test vector file self.auto_test_file and generate the
+  #  statement loading them at runtime
+  #  @return Statement object
+  def get_test_file_load_statement(self, input_tables, output_table):
+    table_list = input_tables + [output_table]
+    offset_list = write_test_vector_file(
+      self.auto_test_file,
+      [(table.get_storage_precision(), flatten_table_content(table)) for table in table_list]
+    )
+    load_statement = Statement()
+    for table, offset in zip(table_list, offset_list):
+      table_size = len(flatten_table_content(table)) * table.get_storage_precision().get_bit_size() // 8
+      read_op = FunctionOperator(
+        "ml_read_test_table",
+        arg_map = {
+          0: get_c_string_literal(self.auto_test_file),
+          1: "%dl" % offset,
+          2: FO_Arg(0),
+          3: "%d" % table_size
+        },
+        require_header = ["support_lib/ml_test_file.h"]
+      )
+      read_function = FunctionObject("ml_read_test_table", [table.get_precision()], ML_Int32, read_op)
+      load_statement.add(
+        ConditionBlock(
+          read_function(table),
+          Return(Constant(1, precision = ML_Int32))
+        )
+      )
+    return load_statement
+
+  ## return the auto-test vectors (test_case_list, output_value_list),
+  #  fetched from the persistent store when a seeded set with the
+  #  same characteristics has already been generated
+  #  @param test_total total number of test cases (standard + random)
+  def get_test_vectors(self, test_num, test_range, test_total):
+    test_vector_key = self.get_test_vector_key(test_total, test_range)
+    test_vectors = load_test_vectors(test_vector_key)
+    if test_vectors is None:
+      test_vectors = self.generate_test_vectors(test_num, test_range)
+      store_test_vectors(test_vector_key, test_vectors)
+    return test_vectors
+
+  ## return the key identifying the auto-test vector set of @p test_total
+  #  test cases in @p test_range in the persistent test vector store
+  #  (None if vectors are not reproducible, i.e. no seed was given)
+  def get_test_vector_key(self, test_total, test_range):
+    key_elements = self.get_test_vector_key_elements()
+    if key_elements is None:
+      return None
+    source_hash = get_method_source_hash(self, ["numeric_emulate", "numeric_emulate_batch"])
+    return get_test_vector_key(
+      self.function_name, source_hash, self.auto_test_seed,
+      test_total, test_range, self.auto_test_std,
+      self.precision.get_name(),
+      [precision.get_name() for precision in self.get_input_precisions()],
+      type(self.accuracy).__name__, getattr(self.accuracy, "goal", None),
+      key_elements
+    )
+
+  ## return the list of the instance specific values read by
+  #  numeric_emulate (e.g. a logarithm basis), which are part of the
+  #  test vector store key. Meta-functions whose emulation depends on
+  #  such values must overload this method.
+  #  @return list of values, or None if the emulation can not be
+  #          identified (test vectors are then not stored)
+  def get_test_vector_key_elements(self):
+    return []
+
+  ## generate the input tuples of standard test cases (if enabled) and
+  #  @p test_num random test cases in @p test_range, and their expected
+  #  output values
+  #  @return (test_case_list, output_value_list)
+  def generate_test_vectors(self, test_num, test_range):
+    low_input = inf(test_range)
+    high_input = sup(test_range)
+    test_case_list = []
+
+    if not self.auto_test_seed is None:
+      random.seed(self.auto_test_seed)
+
+    if self.auto_test_std:
+      # standard test cases
+      for i in range(len(self.standard_test_cases)):
+        input_list = []
+        for in_id in range(self.get_arity()):
+          input_value = self.get_input_precision(in_id).round_sollya_object(self.standard_test_cases[i][0], RN)
+          input_list.append(input_value)
+        test_case_list.append(tuple(input_list))
+
+
+    # random test cases
+    for i in range(test_num):
+      input_list = []
+      for in_id in range(self.get_arity()):
+        input_value = random.uniform(low_input, high_input)
+        input_value = self.precision.round_sollya_object(input_value, RN)
+        input_list.append(input_value)
+      test_case_list.append(tuple(input_list))
+
+    # computing output values from the concatenated list
+    # of all inputs
+    output_value_list = self.compute_output_check_values(test_case_list)
+    return test_case_list, output_value_list
+
+  ## compute the reference values required to check each test case
+  #  of test_case_list, using self.auto_test_jobs processes
+  #  @param test_case_list list of input tuples
+  #  @return list of output value tuples (same order as test_case_list)
+  def compute_output_check_values(self, test_case_list):
+    global _OUTPUT_CHECK_CONTEXT
+    jobs = self.auto_test_jobs or multiprocessing.cpu_count()
+    jobs = min(jobs, len(test_case_list))
+    if jobs <= 1 or not hasattr(os, "fork"):
+      return self.accuracy.get_output_check_value_batch(self, test_case_list)
+    Log.report(Log.Info, "computing {} test output values with {} processes", len(test_case_list), jobs)
+    # deterministic split in contiguous chunks, several per process
+    # to balance load between processes
+    chunk_size = max(1, len(test_case_list) // (4 * jobs))
+    chunk_list = [
+      (start, min(start + chunk_size, len(test_case_list))) for start in range(0, len(test_case_list), chunk_size)
+    ]
+    _OUTPUT_CHECK_CONTEXT = (self, test_case_list)
+    try:
+      if hasattr(multiprocessing, "get_context"):
+        pool = multiprocessing.get_context("fork").Pool(jobs)
+      else:
+        pool = multiprocessing.Pool(jobs)
+      try:
+        chunk_result_list = pool.map(_compute_output_check_chunk, chunk_list)
+      finally:
+        pool.close()
+        pool.join()
+    finally:
+      _OUTPUT_CHECK_CONTEXT = None
+    return [
+      output_values for chunk_result in chunk_result_list
+      for output_values in decode_test_value(chunk_result)
+    ]
+
   ## return a FunctionObject display
   #  an error index, a list of argument values
   #  and a result value
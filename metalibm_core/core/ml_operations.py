@@ -96,7 +96,7 @@ def std_merge_abstract_format(*args):
 ## parent to Metalibm's operation
 #  @brief Every operation class must inherit from this class
 class ML_Operation(object):
-    pass
+    __slots__ = ()
 
 
 ## implicit operation conversion (from number to Constant when required)
@@ -121,17 +121,38 @@ def implicit_op(op):
         raise Exception()
 
 
+## tag for a node whose live-range interval has not been evaluated yet
+class PendingInterval(object):
+    pass
+
 ## Parent for abstract operations
 #  @brief parent to Metalibm's abstract operation
 class AbstractOperation(ML_Operation):
     name = "AbstractOperation"
     extra_inputs = []
     global_index = 0
+    ## incremented each time the inputs of an existing node are modified
+    #  (used to invalidate cached traversal orders)
+    graph_version = 0
     str_del = "| "
+    ## fields common to most nodes are stored in slots, the others
+    #  (and the fields of sub-classes) fall back to the instance's dict
+    #  which is only allocated when used.
+    #  Sub-classes must not declare their own __slots__, so that every
+    #  node keeps the same layout (required by change_to)
+    __slots__ = (
+        "attributes", "index", "inputs",
+        # interval evaluated from the node's inputs (by range_function)
+        # when no interval has been set explicitly, memoized on first access
+        "evaluated_interval",
+        "specifier", "likely", "value", "var_type",
+        "__dict__", "__weakref__",
+    )
 
     ## init operation handle
     def __init__(self, **init_map):
         self.attributes = Attributes(**init_map)
+        self.evaluated_interval = PendingInterval
         self.index = AbstractOperation.global_index; AbstractOperation.global_index += 1
         self.get_handle().set_node(self)
 
@@ -285,16 +306,42 @@ class AbstractOperation(ML_Operation):
     #  @param self Operation node
     #  @param index integer id of the input to swap
     #  @param new_input new value of the input to be set
+    #  Only the evaluated interval of @p self is invalidated: nodes do not
+    #  know their users, users whose interval has already been evaluated
+    #  keep it (see invalidate_intervals)
     def set_input(self, index, new_input):
         # FIXME: discard tuple -> list -> tuple transform 
         input_list = list(self.inputs) 
         input_list[index] = new_input
         self.inputs = tuple(input_list)
+        # the evaluated interval depends on the previous input
+        self.evaluated_interval = PendingInterval
+        AbstractOperation.graph_version += 1
+
+    ## replace the complete list of node's inputs
+    #  (same interval invalidation limit as set_input)
+    def set_inputs(self, new_inputs):
+        self.inputs = tuple(new_inputs)
+        self.evaluated_interval = PendingInterval
+        AbstractOperation.graph_version += 1
+
+    ## test if the interval of @p self must still be evaluated
+    #  from its inputs
+    def is_interval_pending(self):
+        return not isinstance(self, ML_LeafNode) and \
+            self.evaluated_interval is PendingInterval and \
+            self.attributes.get_interval() is None and \
+            hasattr(self, "range_function")
 
     ##
     #  @return the node evaluated live-range (when available) 
     def get_interval(self):
-        return self.attributes.get_interval()
+        interval = self.attributes.get_interval()
+        if not interval is None or isinstance(self, ML_LeafNode):
+            return interval
+        if self.is_interval_pending():
+            evaluate_pending_intervals(self)
+        return None if self.evaluated_interval is PendingInterval else self.evaluated_interval
     ## set the node live-range interval
     def set_interval(self, new_interval):
         return self.attributes.set_interval(new_interval)
@@ -417,6 +464,7 @@ class AbstractOperation(ML_Operation):
     ## Add an extra (hidden) input to the operand's standard input
     def add_to_extra_inputs(self, extra_input):
         self.extra_inputs.append(extra_input)
+        AbstractOperation.graph_version += 1
 
 
     ## change the node to mirror optree
@@ -427,6 +475,8 @@ class AbstractOperation(ML_Operation):
         self.inputs = optree.inputs
         self.arity = optree.arity
         self.attributes = optree.attributes
+        self.evaluated_interval = PendingInterval
+        AbstractOperation.graph_version += 1
         if isinstance(optree, SpecifierOperation):
             self.specifier = optree.specifier
 
@@ -514,8 +564,6 @@ class ML_ArithmeticOperation(AbstractOperation):
     """ init function for abstract operation """
     AbstractOperation.__init__(self, **init_map)
     self.inputs = tuple(implicit_op(op) for op in ops)
-    if self.get_interval() == None:
-        self.set_interval(self.range_function(self.inputs))
 
 ## Parent for AbstractOperation with no expected input
 class ML_LeafNode(AbstractOperation):
@@ -546,6 +594,48 @@ def is_leaf_node(node):
     """ Test if node is a leaf one (with no input) """
     return isinstance(node, ML_LeafNode)
 
+def invalidate_intervals(optree):
+    """ reset the evaluated interval of <optree> and of every node it
+        depends on, so that they are evaluated again from their current
+        inputs on next access.
+        set_input only invalidates the modified node, this function must be
+        called on the users (e.g. the graph root) which should account for
+        the modification """
+    stack = [optree]
+    visited = set(stack)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ML_LeafNode):
+            continue
+        node.evaluated_interval = PendingInterval
+        for op in node.inputs:
+            if isinstance(op, AbstractOperation) and not op in visited:
+                visited.add(op)
+                stack.append(op)
+
+def evaluate_pending_intervals(optree):
+    """ evaluate and memoize the interval of <optree> and of every
+        input it depends on whose interval is still pending.
+        Inputs are evaluated before their users using an explicit
+        stack, so that deep graphs do not exhaust the recursion limit """
+    stack = [optree]
+    visited = set(stack)
+    while stack:
+        node = stack[-1]
+        pending_inputs = [
+            op for op in node.inputs if isinstance(op, AbstractOperation) \
+            and op.is_interval_pending() and not op in visited
+        ]
+        if pending_inputs:
+            stack.extend(pending_inputs)
+            visited.update(pending_inputs)
+        else:
+            stack.pop()
+            if node.is_interval_pending():
+                # a (cyclic) re-entrant access during evaluation returns None
+                node.evaluated_interval = None
+                node.evaluated_interval = node.range_function(node.inputs)
+
 ## Constant node class
 class Constant(ML_LeafNode):
     ## Initializer
@@ -724,8 +814,6 @@ def AbstractOperation_init(self, *ops, **init_map):
   """ init function for abstract operation """
   AbstractOperation.__init__(self, **init_map)
   self.inputs = tuple(implicit_op(op) for op in ops)
-  if self.get_interval() == None:
-      self.set_interval(self.range_function(self.inputs))
 
 class GeneralOperation(AbstractOperation):
     arity = 2
@@ -736,8 +824,6 @@ class GeneralOperation(AbstractOperation):
     def __init__(self, *ops, **init_map):
         AbstractOperation.__init__(self, **init_map)
         self.inputs = tuple(implicit_op(op) for op in ops)
-        if self.get_interval() == None:
-            self.set_interval(self.range_function(self.inputs))
     def get_codegen_key(self):
         return None
     def copy(self, copy_map=None):
@@ -1212,6 +1298,7 @@ class ConditionBlock(ControlFlowOperation):
 
     def set_extra_inputs(self, new_extra_inputs):
         self.extra_inputs = new_extra_inputs
+        AbstractOperation.graph_version += 1
 
     def set_parent_list(self, parent_list):
         self.parent_list = parent_list
@@ -1532,6 +1619,7 @@ class Statement(ControlFlowOperation):
     def add(self, optree):
         self.inputs = self.inputs + (optree,)
         self.arity += 1
+        AbstractOperation.graph_version += 1
 
     # push a new statement at the beginning of the inputs list 
     # @param optree ML_Operation object added at the end of inputs list
@@ -1539,6 +1627,7 @@ class Statement(ControlFlowOperation):
         """ add a new unary statement at the beginning of the input list """
         self.inputs = (optree,) + self.inputs
         self.arity += 1
+        AbstractOperation.graph_version += 1
 
     def finish_copy(self, new_copy, copy_map = {}):
         new_copy.arity = self.arity
@@ -1658,6 +1747,7 @@ class SpecificOperation(SpecifierOperation, GeneralOperation):
 
     def set_extra_inputs(self, new_extra_inputs):
         self.extra_inputs = new_extra_inputs
+        AbstractOperation.graph_version += 1
 
     def get_return_value(self):
         return self.extra_inputs[self.return_value_index]
@@ -1838,6 +1928,7 @@ class SwitchBlock(ControlFlowOperation):
 
     def set_extra_inputs(self, new_extra_inputs):
         self.extra_inputs = new_extra_inputs
+        AbstractOperation.graph_version += 1
 
     def set_parent_list(self, parent_list):
         self.parent_list = parent_list
@@ -410,7 +410,7 @@ class OptimizationEngine(object):
                                             # conversion insertion
                                             input_list = list(optree.inputs)
                                             input_list[op_index] = Conversion(op, precision = new_type)
-                                            optree.inputs = tuple(input_list)
+                                            optree.set_inputs(input_list)
                                             match_found = True
                                             break
                             break
@@ -200,11 +200,12 @@ class ML_Table(ML_LeafNode):
         if self in copy_map:
             return copy_map[self]
         else:
-            kwords = self.attributes.__dict__.copy()
+            kwords = self.attributes.get_attribute_map()
             kwords.update({
                 'dimensions' : self.dimensions,
                 'storage_precision' : self.storage_precision,
-                'init_data': self.table
+                'init_data': self.table,
+                'empty': self.empty
                 })
             new_copy = self.__class__(**kwords)
             copy_map[self] = new_copy
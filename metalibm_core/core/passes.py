@@ -26,11 +26,52 @@
 ###############################################################################
 
 import sys
+import contextlib
+from collections import OrderedDict
+
 from metalibm_core.utility.log_report import Log
+from metalibm_core.utility.module_index import (
+    get_indexed_pass_tags, import_pass_module
+)
+from metalibm_core.utility.pass_profiler import PASS_PROFILER
+from metalibm_core.utility.disk_cache import DiskCache
+from metalibm_core.core.graph_walker import get_node_count
+from metalibm_core.core.attributes import Handle
+from metalibm_core.core.graph_fingerprint import (
+    get_graph_fingerprint, get_graph_node_list, has_default_repr
+)
 
 """ custom warning log level for pass management """
 LOG_PASS_INFO = Log.LogLevel("Info", "passes")
 
+## incremental execution of function passes (see
+#  FunctionPass.execute_on_function), disabled by default:
+#  enabled by --incremental-passes for the passes of a generation
+INCREMENTAL_PASS_EXECUTION = [False]
+## in-memory record of the (pass configuration, function fingerprint)
+#  pairs for which the pass left the function unchanged
+#  (cache key -> True)
+FUNCTION_PASS_UNCHANGED_MAP = OrderedDict()
+## maximal number of unchanged records kept in memory
+FUNCTION_PASS_UNCHANGED_MAX_NUM = 4096
+## in-memory cache of pass results:
+#  cache key -> (input variable list, result scheme, handle index map)
+FUNCTION_PASS_RESULT_MAP = OrderedDict()
+## maximal number of pass results kept in memory
+FUNCTION_PASS_RESULT_MAX_NUM = 256
+## statistics of incremental pass execution
+FUNCTION_PASS_STATS = {"unchanged": 0, "reused": 0, "executed": 0}
+
+@contextlib.contextmanager
+def incremental_pass_execution(enabled):
+    """ enable (or disable) incremental execution of function passes
+        for the body of the with statement """
+    INCREMENTAL_PASS_EXECUTION.insert(0, enabled)
+    try:
+        yield
+    finally:
+        INCREMENTAL_PASS_EXECUTION.pop(0)
+
 ## Parent class for all pass dependency
 class PassDependency:
     ## test if the  @p self dependency is resolved
@@ -91,6 +132,22 @@ class PassWrapper:
 def default_execute_pass(pass_scheduler, pass_object, inputs):
   return [pass_object.execute(pass_input) for pass_input in inputs]
 
+def get_input_scheme_list(inputs):
+  """ list the operation graphs of pass inputs: <inputs> is a
+      FunctionGroup, a list of CodeFunction/CodeEntity or a list of
+      operation nodes """
+  if hasattr(inputs, "core_function_list"):
+    inputs = inputs.core_function_list + inputs.sub_function_list
+  scheme_list = [op.get_scheme() if hasattr(op, "get_scheme") else op for op in inputs]
+  return [scheme for scheme in scheme_list if not scheme is None]
+
+def get_input_node_count(inputs):
+  """ number of nodes in the operation graphs of pass inputs """
+  return get_node_count(get_input_scheme_list(inputs))
+
+def get_pass_name(pass_object):
+  return pass_object.pass_tag or pass_object.__class__.__name__
+
 class PassScheduler:
   class Start: 
     tag = "start"
@@ -168,7 +225,10 @@ class PassScheduler:
   def execute_pass_list(self, pass_list, inputs, execution_function):
     inter_values = inputs
     for pass_object in pass_list:
-      inter_values = execution_function(self, pass_object, inputs)
+      with PASS_PROFILER.section(
+          "pass", get_pass_name(pass_object),
+          lambda: get_input_node_count(inputs)):
+        inter_values = execution_function(self, pass_object, inputs)
     return inter_values
 
   def flush_rdy_pass_list(self):
@@ -189,15 +249,18 @@ class PassScheduler:
     self.enqueue_slot_to_waiting(pass_slot = pass_slot)
     passes_to_execute = self.update_rdy_pass_list()
     intermediary_values = inputs
-    while len(passes_to_execute) > 0:
-      intermediary_values = self.execute_pass_list(
-        passes_to_execute, 
-        intermediary_values,
-        execution_function
-      )
-      self.executed_passes += passes_to_execute
-      self.flush_rdy_pass_list()
-      passes_to_execute = self.update_rdy_pass_list()
+    slot_name = "none" if pass_slot is None else pass_slot.tag
+    with PASS_PROFILER.section(
+        "stage", slot_name, lambda: get_input_node_count(inputs)):
+      while len(passes_to_execute) > 0:
+        intermediary_values = self.execute_pass_list(
+          passes_to_execute, 
+          intermediary_values,
+          execution_function
+        )
+        self.executed_passes += passes_to_execute
+        self.flush_rdy_pass_list()
+        passes_to_execute = self.update_rdy_pass_list()
     return intermediary_values
 
 
@@ -235,12 +298,16 @@ class Pass:
   #  @return[Pass] pass object 
   @staticmethod
   def get_pass_by_tag(tag):
+    # pass modules are imported on first request
+    if not tag in Pass.pass_map:
+      import_pass_module(tag)
     return Pass.pass_map[tag]
 
-  ## return the list of tags of registered passes
+  ## return the list of tags of registered and indexed (not yet
+  #  imported) passes
   @staticmethod
   def get_pass_tag_list():
-    return [tag for tag in Pass.pass_map]
+    return sorted(set(Pass.pass_map) | set(get_indexed_pass_tags()))
 
 
 ## Abstract parent to optimization pass
@@ -272,16 +339,157 @@ class OptreeOptimization(OptimizationPass):
     raise NotImplemented
 
 
+def get_config_value_str(value):
+    """ return a string description of a pass configuration value
+        which does not depend on object addresses """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return repr(value)
+    elif isinstance(value, (list, tuple)):
+        return "[{}]".format(",".join(get_config_value_str(v) for v in value))
+    elif isinstance(value, type):
+        return "<{}.{}>".format(value.__module__, value.__name__)
+    elif has_default_repr(value):
+        # e.g. target objects
+        return "<{}>".format(value.__class__.__name__)
+    else:
+        return "{}:{}".format(value.__class__.__name__, value)
+
+def copy_input_variable(var):
+    """ return a free copy of the input variable <var> """
+    new_var = var.__class__(tag=var.get_tag(), var_type=var.get_var_type())
+    new_var.attributes = var.attributes.get_copy()
+    return new_var
+
+def copy_function_scheme(scheme, arg_list, new_arg_list):
+    """ copy <scheme>, replacing the input variables of <arg_list>
+        by the ones of <new_arg_list> """
+    return scheme.copy(dict(zip(arg_list, new_arg_list)))
+
+def get_handle_index_map(input_node_list, result_node_list):
+    """ return the map: index of a node in <input_node_list> -> index in
+        <result_node_list> of the node its handle points to (nodes whose
+        handle points out of <result_node_list> are not listed) """
+    result_index_map = dict((node, index) for index, node in enumerate(result_node_list))
+    handle_index_map = {}
+    for index, node in enumerate(input_node_list):
+        handle_node = node.get_handle().get_node()
+        if handle_node in result_index_map:
+            handle_index_map[index] = result_index_map[handle_node]
+    return handle_index_map
+
+def update_handles(input_node_list, result_node_list, handle_index_map):
+    """ make the handles of the nodes of <input_node_list> point to the
+        nodes of <result_node_list> as described by <handle_index_map>
+        (see get_handle_index_map), the new nodes of <result_node_list>
+        carry those handles (or a new handle) """
+    input_node_set = set(input_node_list)
+    for node in result_node_list:
+        if not node in input_node_set:
+            node.set_handle(Handle(node))
+    for index in sorted(handle_index_map):
+        handle = input_node_list[index].get_handle()
+        result_node = result_node_list[handle_index_map[index]]
+        handle.set_node(result_node)
+        if not result_node in input_node_set:
+            result_node.set_handle(handle)
+
+def store_function_pass_result(cache_key, fct, fingerprint, input_node_list):
+    """ store a copy of the scheme of <fct> (whose fingerprint is
+        <fingerprint>) as the pass result associated with <cache_key>,
+        <input_node_list> being the node list of <fct> before the pass """
+    arg_list = [copy_input_variable(arg) for arg in fct.get_arg_list()]
+    try:
+        result_scheme = copy_function_scheme(fct.get_scheme(), fct.get_arg_list(), arg_list)
+    except (NotImplementedError, RuntimeError):
+        # copy is not supported by every node class (nor for too deep graphs)
+        return
+    # result is only kept if its copy is faithful
+    if get_graph_fingerprint(arg_list + [result_scheme], [fct.get_name(), fct.get_output_format()]) != fingerprint:
+        return
+    handle_index_map = get_handle_index_map(
+        input_node_list,
+        get_graph_node_list(fct.get_arg_list() + [fct.get_scheme()])
+    )
+    FUNCTION_PASS_RESULT_MAP[cache_key] = arg_list, result_scheme, handle_index_map
+    while len(FUNCTION_PASS_RESULT_MAP) > FUNCTION_PASS_RESULT_MAX_NUM:
+        FUNCTION_PASS_RESULT_MAP.popitem(last=False)
+
+def store_function_pass_unchanged(cache_key):
+    """ record that the pass execution described by <cache_key> left
+        the function unchanged """
+    FUNCTION_PASS_UNCHANGED_MAP[cache_key] = True
+    while len(FUNCTION_PASS_UNCHANGED_MAP) > FUNCTION_PASS_UNCHANGED_MAX_NUM:
+        FUNCTION_PASS_UNCHANGED_MAP.popitem(last=False)
+
+def report_function_pass_stats(level=LOG_PASS_INFO):
+    """ report incremental pass execution statistics """
+    Log.report(
+        level, "function passes: {} execution(s), {} skipped (unchanged), {} reused result(s)",
+        FUNCTION_PASS_STATS["executed"], FUNCTION_PASS_STATS["unchanged"],
+        FUNCTION_PASS_STATS["reused"])
+
+
 class FunctionPass(OptreeOptimization):
     """ pass which execute on functions node:
         (ML_Operation, CodeFunction or FunctionGroup) """
+    ## allow incremental execution (when enabled for the generation, see
+    #  incremental_pass_execution): a function whose fingerprint and pass
+    #  configuration match a previous execution in the current process is
+    #  not processed again (see execute_on_function). Passes with side
+    #  effects (e.g. dump) must disable it
+    incremental = True
+
     def __init__(self, descriptor="", target=None):
         OptreeOptimization.__init__(self, descriptor, target)
 
     def execute_on_optree(self, optree, fct=None, fct_group=None, memoization_map=None):
         raise NotImplementedError
 
+    def get_config_key(self):
+        """ return the list of strings describing the pass and its
+            configuration (instance fields, memoization tables excepted) """
+        config_key = [self.__class__.__module__, self.__class__.__name__]
+        for field_name in sorted(vars(self)):
+            value = getattr(self, field_name)
+            if field_name == "pass_id" or isinstance(value, (dict, set)):
+                continue
+            config_key.append("{}={}".format(field_name, get_config_value_str(value)))
+        return config_key
+
     def execute_on_function(self, fct, fct_group):
+        if not self.incremental or not INCREMENTAL_PASS_EXECUTION[0]:
+            return self.execute_on_function_scheme(fct, fct_group)
+        fingerprint = fct.get_fingerprint()
+        cache_key = DiskCache.get_key("function_pass", fingerprint, *self.get_config_key())
+        if cache_key in FUNCTION_PASS_UNCHANGED_MAP:
+            Log.report(LOG_PASS_INFO, "pass {} skipped on unchanged fct {}", self.pass_tag, fct.get_name())
+            FUNCTION_PASS_STATS["unchanged"] += 1
+            return
+        elif cache_key in FUNCTION_PASS_RESULT_MAP:
+            Log.report(LOG_PASS_INFO, "pass {} result reused for fct {}", self.pass_tag, fct.get_name())
+            FUNCTION_PASS_STATS["reused"] += 1
+            arg_list, result_scheme, handle_index_map = FUNCTION_PASS_RESULT_MAP[cache_key]
+            input_node_list = get_graph_node_list(fct.get_arg_list() + [fct.get_scheme()])
+            fct.set_scheme(copy_function_scheme(result_scheme, arg_list, fct.get_arg_list()))
+            # the handles of the original scheme are updated as the pass
+            # would have done it (e.g. change_handle in fuse_fma)
+            update_handles(
+                input_node_list,
+                get_graph_node_list(fct.get_arg_list() + [fct.get_scheme()]),
+                handle_index_map
+            )
+            return
+        FUNCTION_PASS_STATS["executed"] += 1
+        input_node_list = get_graph_node_list(fct.get_arg_list() + [fct.get_scheme()])
+        self.execute_on_function_scheme(fct, fct_group)
+        result_fingerprint = fct.get_fingerprint()
+        if result_fingerprint == fingerprint:
+            store_function_pass_unchanged(cache_key)
+        else:
+            store_function_pass_result(cache_key, fct, result_fingerprint, input_node_list)
+
+    def execute_on_function_scheme(self, fct, fct_group):
+        """ execute the pass on the scheme of <fct> """
         Log.report(Log.Info, "executing pass {} on fct {}".format(
             self.pass_tag, fct.get_name()))
         optree = fct.get_scheme()
@@ -307,6 +515,8 @@ class PassQuit(OptreeOptimization):
 
 class PassDump(FunctionPass):
   pass_tag = "dump"
+  # dump must be executed at each run
+  incremental = False
   def __init__(self, *args):
     OptimizationPass.__init__(self, "dump")
 
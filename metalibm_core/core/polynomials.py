@@ -36,6 +36,11 @@ import sollya
 from sollya import SollyaObject, coeff
 S2 = SollyaObject(2)
 from ..utility.log_report import Log
+from ..utility.disk_cache import DiskCache
+from ..utility.pass_profiler import PASS_PROFILER
+from ..utility.sollya_cache import (
+    sollya_exact_str, supnorm, get_settings_key
+)
 
 
 def is_cst_with_value(coeff, value):
@@ -75,6 +80,77 @@ class SollyaError(Exception):
     """ Exception to indicate an error in pythonsollya """
     pass
 
+
+## persistent cache of fpminimax results, shared across processes
+FPMINIMAX_CACHE = DiskCache("fpminimax")
+
+def get_fpminimax_key(function, poly_degree, precision_list, approx_interval, modifiers, retry):
+    """ build the content-addressed cache key of a fpminimax call, including
+        sollya's global settings which affect the result """
+    return DiskCache.get_key(
+        sollya_exact_str(function),
+        sollya_exact_str(poly_degree),
+        sollya_exact_str(precision_list),
+        sollya_exact_str(approx_interval),
+        sollya_exact_str(list(modifiers)),
+        retry,
+        *get_settings_key()
+    )
+
+def cached_fpminimax(function, poly_degree, precision_list, approx_interval, modifiers, retry=False):
+    """ wrapper around sollya.fpminimax whose successful results are
+        stored in FPMINIMAX_CACHE
+
+        Args:
+            function, poly_degree, precision_list, approx_interval, modifiers:
+                fpminimax arguments
+            retry (bool): retry with more points (sollya.settings.points)
+                while fpminimax fails
+        Return:
+            SollyaObject: the polynomial (or sollya error object)
+    """
+    cache_key = get_fpminimax_key(function, poly_degree, precision_list, approx_interval, modifiers, retry)
+    coeff_list = FPMINIMAX_CACHE.get(cache_key)
+    if not coeff_list is None:
+        Log.report(Log.Info, "fpminimax result found in cache")
+        sollya_poly = SollyaObject(0)
+        for index, coeff_str in enumerate(coeff_list):
+            coeff_value = sollya.parse(coeff_str)
+            if coeff_value != 0:
+                sollya_poly += coeff_value * sollya.x**index
+        return sollya_poly
+
+    with PASS_PROFILER.tool("sollya"):
+        sollya_poly = sollya.fpminimax(function, poly_degree, precision_list,
+                                       approx_interval, *modifiers)
+    if retry:
+        while sollya_poly.is_error() and sollya.settings.points < 10000:
+            # We don't want sollya.settings.points to be too large. A value <
+            # 20000 does not impact too much the timings for the moment.
+            # We also give an odd value to sollya.settings.points (even though
+            # it should not be needed anymore) to avoid errors when working on a
+            # symmetric interval. See this clear explanation by Sylvain
+            # Chevillard on the Sollya mailing list at
+            # https://lists.gforge.inria.fr/pipermail/sollya-users/2017-August/000056.html
+            sollya.settings.points = 2 * sollya.settings.points - 1
+            Log.report(Log.Warning,
+                       "Trying with more points: {}"
+                       .format(sollya.settings.points))
+            with PASS_PROFILER.tool("sollya"):
+                sollya_poly = sollya.fpminimax(function, poly_degree,
+                                               precision_list, approx_interval,
+                                               *modifiers)
+
+        # Reset points to its default value
+        sollya.settings.points = sollya.default
+
+    if not sollya_poly.is_error():
+        FPMINIMAX_CACHE.put(cache_key, [
+            sollya_exact_str(coeff(sollya_poly, index))
+            for index in range(int(sollya.degree(sollya_poly)) + 1)
+        ])
+    return sollya_poly
+
 class Polynomial(object):
     """ Mathematical polynomial object class """
 
@@ -186,26 +262,8 @@ class Polynomial(object):
           else:
             precision_list.append(c)
 
-        sollya_poly = sollya.fpminimax(function, poly_degree, precision_list,
-                                       approx_interval, *modifiers)
-        while sollya_poly.is_error() and sollya.settings.points < 10000:
-            # We don't want sollya.settings.points to be too large. A value <
-            # 20000 does not impact too much the timings for the moment.
-            # We also give an odd value to sollya.settings.points (even though
-            # it should not be needed anymore) to avoid errors when working on a
-            # symmetric interval. See this clear explanation by Sylvain
-            # Chevillard on the Sollya mailing list at
-            # https://lists.gforge.inria.fr/pipermail/sollya-users/2017-August/000056.html
-            sollya.settings.points = 2 * sollya.settings.points - 1
-            Log.report(Log.Warning,
-                       "Trying with more points: {}"
-                       .format(sollya.settings.points))
-            sollya_poly = sollya.fpminimax(function, poly_degree,
-                                           precision_list, approx_interval,
-                                           *modifiers)
-
-        # Reset points to its default value
-        sollya.settings.points = sollya.default
+        sollya_poly = cached_fpminimax(function, poly_degree, precision_list,
+                                       approx_interval, modifiers, retry=True)
 
         if sollya_poly.is_error():
             # We could try other parameters before crashing Metalibm:
@@ -239,14 +297,14 @@ class Polynomial(object):
         """ construct a polynomial object from a function approximation using
             sollya's fpminimax """
         tightness = kwords["tightness"] if "tightness" in kwords else S2**-24
-        error_function = kwords["error_function"] if "error_function" in kwords else lambda p, f, ai, mod, t: sollya.supnorm(p, f, ai, mod, t)
+        error_function = kwords["error_function"] if "error_function" in kwords else lambda p, f, ai, mod, t: supnorm(p, f, ai, mod, t)
         precision_list = []
         for c in coeff_formats:
             if isinstance(c, ML_FP_Format):
                 precision_list.append(c.get_sollya_object())
             else:
                 precision_list.append(c)
-        sollya_poly = sollya.fpminimax(function, poly_degree, precision_list, approx_interval, *modifiers)
+        sollya_poly = cached_fpminimax(function, poly_degree, precision_list, approx_interval, modifiers)
         if sollya_poly.is_error():
             print("function: {}, poly_degree: {}, precision_list: {}, approx_interval: {}, modifiers: {}".format(function, poly_degree, precision_list, approx_interval, modifiers))
             raise SollyaError()
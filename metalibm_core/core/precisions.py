@@ -38,6 +38,14 @@ import sollya
 from .ml_operations import LogicalOr, Comparison, FunctionObject, Min, Abs, Subtraction, Division
 from metalibm_core.code_generation.generator_utility import *
 
+## evaluate @p emulated_function on each input tuple of @p input_list
+#  using its numeric_emulate_batch method when available
+#  @return list of emulated output values
+def _numeric_emulate_batch(emulated_function, input_list):
+  if hasattr(emulated_function, "numeric_emulate_batch"):
+    return emulated_function.numeric_emulate_batch(input_list)
+  return [emulated_function.numeric_emulate(*input_values) for input_values in input_list]
+
 ## Parent class for output precision indication/constraint
 class ML_FunctionPrecision(object): 
   def __init__(self, precision):
@@ -54,6 +62,11 @@ class ML_FunctionPrecision(object):
   def get_output_check_value(self, emulated_function, input_values):
     """ return the reference values required to check result """
     raise NotImplementedError
+  ## return the list of output value tuples required to check
+  #  each input tuple of @p input_list (default: one
+  #  get_output_check_value call per input)
+  def get_output_check_value_batch(self, emulated_function, input_list):
+    return [self.get_output_check_value(emulated_function, input_values) for input_values in input_list]
   ## return an Operation graph for testing if test_result
   #  fails numeric test defined by @p self accuracy and @p stored_outputs
   #  numeric output values
@@ -129,6 +142,11 @@ class ML_CorrectlyRounded(ML_FunctionPrecision):
   def get_output_check_value(self, emulated_function, input_values):
     expected_value = self.precision.round_sollya_object(emulated_function.numeric_emulate(*input_values), sollya.RN)
     return (expected_value,)
+  def get_output_check_value_batch(self, emulated_function, input_list):
+    return [
+      (self.precision.round_sollya_object(emulated_value, sollya.RN),)
+      for emulated_value in _numeric_emulate_batch(emulated_function, input_list)
+    ]
 
   def compute_error(self, local_result, output_values, relative = False):
     precision = local_result.get_precision()
@@ -172,6 +190,14 @@ class ML_Faithful(ML_TwoFactorPrecision):
     def get_check_value_high_bound(self, emulated_function, input_values):
         high_bound = self.precision.round_sollya_object(emulated_function.numeric_emulate(*input_values), sollya.RU)
         return high_bound
+    def get_output_check_value_batch(self, emulated_function, input_list):
+        """ emulate each input once and derive both bounds from the
+            emulated value """
+        return [
+            (self.precision.round_sollya_object(emulated_value, sollya.RD),
+             self.precision.round_sollya_object(emulated_value, sollya.RU))
+            for emulated_value in _numeric_emulate_batch(emulated_function, input_list)
+        ]
 
 ## Degraded accuracy function output precision indication
 class ML_DegradedAccuracy(ML_TwoFactorPrecision):
@@ -194,6 +220,15 @@ class ML_DegradedAccuracy(ML_TwoFactorPrecision):
         cr_value = self.get_check_value_cr(emulated_function, input_values)
         value_goal = self.get_value_error_goal(cr_value)
         return cr_value + value_goal
+    def get_output_check_value_batch(self, emulated_function, input_list):
+        """ emulate each input once and derive both bounds from the
+            correctly rounded value """
+        check_value_list = []
+        for emulated_value in _numeric_emulate_batch(emulated_function, input_list):
+            cr_value = self.precision.round_sollya_object(emulated_value, sollya.RN)
+            value_goal = self.get_value_error_goal(cr_value)
+            check_value_list.append((cr_value - value_goal, cr_value + value_goal))
+        return check_value_list
 
     def set_precision(self, precision):
         self.precision = precision
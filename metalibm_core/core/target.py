@@ -31,16 +31,29 @@
 # author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
 ###############################################################################
 
+from metalibm_core.utility.module_index import (
+    get_indexed_target_names, import_target_module
+)
+
 class TargetRegister(object):
     target_map = {}
 
+    @staticmethod
+    def get_target_names():
+        """ return the names of registered and indexed (not yet
+            imported) targets """
+        return sorted(set(TargetRegister.target_map) | set(get_indexed_target_names()))
+
     @staticmethod
     def get_target_name_list():
-        for target_name in TargetRegister.target_map:
+        for target_name in TargetRegister.get_target_names():
             print(target_name)
 
     @staticmethod
     def get_target_by_name(target_name):
+        # target modules are imported on first request
+        if not target_name in TargetRegister.target_map:
+            import_target_module(target_name)
         return TargetRegister.target_map[target_name]
 
     @staticmethod
@@ -37,6 +37,8 @@ from metalibm_core.core.ml_hdl_operations import (
 from metalibm_core.core.advanced_operations import (
     FixedPointPosition
 )
+from metalibm_core.core.graph_walker import post_order_walk
+
 from metalibm_core.utility.log_report import Log
 
 CP_LOG2_CST = math.log(2.0)
@@ -206,8 +208,35 @@ class Pass_CriticalPathEval(OptreeOptimization):
     #  @param memoization_map memoization map of parallel executions
     #  @param debug enable debug messages
     #  @return boolean support
+    def get_critical_path_inputs(self, optree):
+        """ list the operands of optree whose critical path must be
+            evaluated before optree's """
+        if isinstance(optree, (Variable, Signal, Constant, FixedPointPosition)):
+            return []
+        elif isinstance(optree, ReferenceAssign):
+            return [optree.get_input(1)]
+        elif isinstance(optree, (TypeCast, SpecificOperation)):
+            return [optree.get_input(0)]
+        elif isinstance(optree, ML_LeafNode):
+            return []
+        return optree.get_inputs()
+
     def evaluate_critical_path(self, optree):
-        """  evalute the critical path of optree towards any input """
+        """  evalute the critical path of optree towards any input.
+             The operands are evaluated beforehand in post-order so that
+             deep graphs do not exceed the recursion limit """
+        if optree in self.memoization_map:
+            return self.memoization_map[optree]
+        for node in post_order_walk(
+                optree, get_inputs=self.get_critical_path_inputs,
+                skip=self.memoization_map.__contains__):
+            if not node is optree:
+                self.evaluate_node_critical_path(node)
+        return self.evaluate_node_critical_path(optree)
+
+    def evaluate_node_critical_path(self, optree):
+        """ evaluate the critical path of optree, assuming the critical
+            paths of its operands have already been evaluated """
         if optree in self.memoization_map:
             return self.memoization_map[optree]
         elif isinstance(optree, Statement):
@@ -43,14 +43,19 @@ from metalibm_core.core.ml_operations import (
     BitLogicLeftShift, BitLogicRightShift, BitArithmeticRightShift,
     Return, TableLoad, SpecificOperation, ExceptionOperation,
     NoResultOperation, Split, ComponentSelection, FunctionCall,
-    Conversion, DivisionSeed
+    Conversion, DivisionSeed, TableStore, Dereference,
+    ML_ArithmeticOperation, ControlFlowOperation, AbstractVariable
 )
+from metalibm_core.core.ml_table import ML_Table
 from metalibm_core.core.ml_hdl_operations import (
     Process, Loop, ComponentInstance, Assert, Wait, PlaceHolder
 )
 from metalibm_core.core.passes import (
     Pass, LOG_PASS_INFO, FunctionPass
 )
+from metalibm_core.core.graph_walker import (
+    post_order_walk, pre_order_walk, get_post_order, context_walk
+)
 
 
 
@@ -114,121 +119,114 @@ def silence_fp_operations(optree, force=False, memoization_map=None):
     """ ensure that all floating-point operations from optree root
         have the silent attribute set to True """
     memoization_map = {} if memoization_map is None else memoization_map
-    if optree in memoization_map:
-        return
-    else:
-        memoization_map[optree] = optree
-        if isinstance(optree, ML_LeafNode):
-            pass
-        else:
-            for op in optree.inputs:
-                silence_fp_operations(op, force=force, memoization_map=memoization_map)
-            for op in optree.get_extra_inputs():
-                silence_fp_operations(op, force = force, memoization_map = memoization_map)
-            if isinstance(optree, Multiplication) or isinstance(optree, Addition) or isinstance(optree, FusedMultiplyAdd) or isinstance(optree, Subtraction):
-                # FIXME no check on optree precision
-                if optree.get_silent() == None: optree.set_silent(True)
-
-def fuse_multiply_add(optree, silence=False, memoization=None, change_handle=True, dot_product_enabled=True):
-    """ whenever possible fuse a multiply and add/sub into a FMA/FMS """
-    memoization = memoization if not memoization is None else {}
-    def local_fuse_fma(op):
-        return fuse_multiply_add(op, silence, memoization, change_handle, dot_product_enabled)
+    for node in get_post_order(optree):
+        if node in memoization_map:
+            continue
+        memoization_map[node] = node
+        if isinstance(node, Multiplication) or isinstance(node, Addition) or isinstance(node, FusedMultiplyAdd) or isinstance(node, Subtraction):
+            # FIXME no check on optree precision
+            if node.get_silent() == None: node.set_silent(True)
+
+def update_inputs(optree, input_function):
+    """ replace each input op of <optree> by input_function(op),
+        <optree> is only modified if one of its inputs changes """
+    new_inputs = tuple(input_function(op) for op in optree.inputs)
+    if any(not new_op is op for new_op, op in zip(new_inputs, optree.inputs)):
+        optree.set_inputs(new_inputs)
+
+def fuse_multiply_add_node(optree, local_fuse_fma, silence=False, change_handle=True, dot_product_enabled=True):
+    """ fuse <optree> with its multiply operand(s) when possible,
+        local_fuse_fma(op) must return the processed version of
+        any operand op """
     if (isinstance(optree, Addition) or isinstance(optree, Subtraction)) and not optree.get_unbreakable():
         if len(optree.inputs) != 2:
             # more than 2-operand addition are not supported yet
-            optree.inputs = tuple(local_fuse_fma(op) for op in optree.inputs)
+            update_inputs(optree, local_fuse_fma)
+            return optree
+
+        elif True in [(op.get_debug() != None and isinstance(op, Multiplication)) for op in optree.inputs]:
+            # exclude node with debug operands
+            update_inputs(optree, local_fuse_fma)
             return optree
 
+        elif dot_product_enabled and isinstance(optree.inputs[0], Multiplication) and isinstance(optree.inputs[1], Multiplication) and not optree.inputs[0].get_prevent_optimization() and not optree.inputs[1].get_prevent_optimization():
+            specifier = FusedMultiplyAdd.DotProductNegate if isinstance(optree, Subtraction) else FusedMultiplyAdd.DotProduct 
+            mult0 = local_fuse_fma(optree.inputs[0].inputs[0])
+            mult1 = local_fuse_fma(optree.inputs[0].inputs[1])
+            mult2 = local_fuse_fma(optree.inputs[1].inputs[0])
+            mult3 = local_fuse_fma(optree.inputs[1].inputs[1])
+            new_op = FusedMultiplyAdd(mult0, mult1, mult2, mult3, specifier = specifier)
+            new_op.attributes = optree.attributes.get_light_copy()
+            new_op.set_silent(silence)
+            new_op.set_index(optree.get_index())
+            # propagating exact attribute
+            if optree.inputs[0].get_exact() and optree.inputs[1].get_exact() and optree.get_exact():
+                new_op.set_exact(True)
+            # modifying handle
+            if change_handle: optree.get_handle().set_node(new_op)
+            return new_op
+
+        elif isinstance(optree.inputs[0], Multiplication) and not optree.inputs[0].get_prevent_optimization():
+            specifier = FusedMultiplyAdd.Subtract if isinstance(optree, Subtraction) else FusedMultiplyAdd.Standard 
+            mult0 = local_fuse_fma(optree.inputs[0].inputs[0])
+            mult1 = local_fuse_fma(optree.inputs[0].inputs[1])
+            addend = local_fuse_fma(optree.inputs[1])
+
+            new_op = FusedMultiplyAdd(mult0, mult1, addend, specifier = specifier)
+            new_op.attributes = optree.attributes.get_light_copy()
+            new_op.set_silent(silence)
+            new_op.set_index(optree.get_index())
+
+            # propagating exact attribute
+            if optree.inputs[0].get_exact() and optree.get_exact():
+                new_op.set_exact(True)
+
+            # modifying handle
+            if change_handle: optree.get_handle().set_node(new_op)
+
+            return new_op
+
+        elif isinstance(optree.inputs[1], Multiplication) and not optree.inputs[1].get_prevent_optimization():
+            specifier = FusedMultiplyAdd.SubtractNegate if isinstance(optree, Subtraction) else FusedMultiplyAdd.Standard 
+            mult0 = local_fuse_fma(optree.inputs[1].inputs[0])
+            mult1 = local_fuse_fma(optree.inputs[1].inputs[1])
+            addend = local_fuse_fma(optree.inputs[0])
+            new_op = FusedMultiplyAdd(mult0, mult1, addend, specifier = specifier)
+            new_op.attributes = optree.attributes.get_light_copy()
+            new_op.set_silent(silence)
+            new_op.set_commutated(True)
+
+            new_op.set_index(optree.get_index())
+            # propagating exact attribute
+            if optree.inputs[1].get_exact() and optree.get_exact():
+                new_op.set_exact(True)
+
+            # modifying handle
+            if change_handle: optree.get_handle().set_node(new_op)
+
+            return new_op
         else:
-            if optree in memoization: 
-                return memoization[optree]
-
-            elif optree.get_unbreakable():
-                optree.inputs = tuple(local_fuse_fma(op) for op in optree.inputs)
-                memoization[optree] = optree
-                return optree
-
-            elif True in [(op.get_debug() != None and isinstance(op, Multiplication)) for op in optree.inputs]:
-                # exclude node with debug operands
-                optree.inputs = tuple(local_fuse_fma(op) for op in optree.inputs)
-                memoization[optree] = optree
-                return optree
-
-            elif dot_product_enabled and isinstance(optree.inputs[0], Multiplication) and isinstance(optree.inputs[1], Multiplication) and not optree.inputs[0].get_prevent_optimization() and not optree.inputs[1].get_prevent_optimization():
-                specifier = FusedMultiplyAdd.DotProductNegate if isinstance(optree, Subtraction) else FusedMultiplyAdd.DotProduct 
-                mult0 = local_fuse_fma(optree.inputs[0].inputs[0])
-                mult1 = local_fuse_fma(optree.inputs[0].inputs[1])
-                mult2 = local_fuse_fma(optree.inputs[1].inputs[0])
-                mult3 = local_fuse_fma(optree.inputs[1].inputs[1])
-                new_op = FusedMultiplyAdd(mult0, mult1, mult2, mult3, specifier = specifier)
-                new_op.attributes = optree.attributes.get_light_copy()
-                new_op.set_silent(silence)
-                new_op.set_index(optree.get_index())
-                # propagating exact attribute
-                if optree.inputs[0].get_exact() and optree.inputs[1].get_exact() and optree.get_exact():
-                    new_op.set_exact(True)
-                # modifying handle
-                if change_handle: optree.get_handle().set_node(new_op)
-                memoization[optree] = new_op
-                return new_op
-
-            elif isinstance(optree.inputs[0], Multiplication) and not optree.inputs[0].get_prevent_optimization():
-                specifier = FusedMultiplyAdd.Subtract if isinstance(optree, Subtraction) else FusedMultiplyAdd.Standard 
-                mult0 = local_fuse_fma(optree.inputs[0].inputs[0])
-                mult1 = local_fuse_fma(optree.inputs[0].inputs[1])
-                addend = local_fuse_fma(optree.inputs[1])
-
-                new_op = FusedMultiplyAdd(mult0, mult1, addend, specifier = specifier)
-                new_op.attributes = optree.attributes.get_light_copy()
-                new_op.set_silent(silence)
-                new_op.set_index(optree.get_index())
-
-                # propagating exact attribute
-                if optree.inputs[0].get_exact() and optree.get_exact():
-                    new_op.set_exact(True)
-
-                # modifying handle
-                if change_handle: optree.get_handle().set_node(new_op)
-
-                memoization[optree] = new_op
-                return new_op
-
-            elif isinstance(optree.inputs[1], Multiplication) and not optree.inputs[1].get_prevent_optimization():
-                specifier = FusedMultiplyAdd.SubtractNegate if isinstance(optree, Subtraction) else FusedMultiplyAdd.Standard 
-                mult0 = local_fuse_fma(optree.inputs[1].inputs[0])
-                mult1 = local_fuse_fma(optree.inputs[1].inputs[1])
-                addend = local_fuse_fma(optree.inputs[0])
-                new_op = FusedMultiplyAdd(mult0, mult1, addend, specifier = specifier)
-                new_op.attributes = optree.attributes.get_light_copy()
-                new_op.set_silent(silence)
-                new_op.set_commutated(True)
-                memoization[optree] = new_op
-
-                new_op.set_index(optree.get_index())
-                # propagating exact attribute
-                if optree.inputs[1].get_exact() and optree.get_exact():
-                    new_op.set_exact(True)
-
-                # modifying handle
-                if change_handle: optree.get_handle().set_node(new_op)
-
-                return new_op
-            else:
-                optree.inputs = tuple(local_fuse_fma(op) for op in optree.inputs)
-                memoization[optree] = optree
-                return optree
+            update_inputs(optree, local_fuse_fma)
+            return optree
     else:
         if optree.get_extra_inputs() != []: 
             optree.set_extra_inputs([local_fuse_fma(op) for op in optree.get_extra_inputs()])
 
-        if isinstance(optree, ML_LeafNode):
-            memoization[optree] = optree
-            return optree
-        else:
-            optree.inputs = tuple(local_fuse_fma(op) for op in optree.inputs)
-            memoization[optree] = optree
-            return optree
+        if not isinstance(optree, ML_LeafNode):
+            update_inputs(optree, local_fuse_fma)
+        return optree
+
+def fuse_multiply_add(optree, silence=False, memoization=None, change_handle=True, dot_product_enabled=True):
+    """ whenever possible fuse a multiply and add/sub into a FMA/FMS """
+    memoization = memoization if not memoization is None else {}
+    def local_fuse_fma(op):
+        # operands are processed before their users: op is either
+        # a processed node or a node built by this pass
+        return memoization.get(op, op)
+    for node in post_order_walk(optree, skip=memoization.__contains__):
+        memoization[node] = fuse_multiply_add_node(
+            node, local_fuse_fma, silence, change_handle, dot_product_enabled)
+    return local_fuse_fma(optree)
 
 
 def subexpression_sharing(optree, sharing_map=None, level_sharing_map=None, current_parent_list=None):
@@ -237,7 +235,7 @@ def subexpression_sharing(optree, sharing_map=None, level_sharing_map=None, curr
     sharing_map = sharing_map or {}
     level_sharing_map = level_sharing_map or [{}]
     current_parent_list = current_parent_list or []
-    def search_level_map(optree):
+    def search_level_map(optree, level_sharing_map):
         """ search if optree has been defined among the active node """
         for level in level_sharing_map:
             if optree in level: return True
@@ -251,49 +249,257 @@ def subexpression_sharing(optree, sharing_map=None, level_sharing_map=None, curr
                 return b
         return None
 
-    if isinstance(optree, ConditionBlock):
-        optree.set_parent_list(current_parent_list)
-        # condition
-        subexpression_sharing(optree.inputs[0], sharing_map, level_sharing_map, current_parent_list + [optree])
-        # branches
-        for op in optree.inputs[1:]:
-            subexpression_sharing(op, sharing_map, [{}] + level_sharing_map, current_parent_list + [optree])
-
-    elif isinstance(optree, SwitchBlock):
-        optree.set_parent_list(current_parent_list)
-
-        # switch value
-        subexpression_sharing(optree.inputs[0], sharing_map, level_sharing_map, current_parent_list + [optree])
-        # case_statement
-        case_map = optree.get_case_map()
-        for case in case_map:
-            op = case_map[case]
-            subexpression_sharing(op, sharing_map, [{}] + level_sharing_map, current_parent_list + [optree])
-
-    elif isinstance(optree, Statement):
-        if not optree.get_prevent_optimization(): 
-          for op in optree.inputs:
-              subexpression_sharing(op, sharing_map, [{}] + level_sharing_map, current_parent_list)
-
-    elif isinstance(optree, Loop):
-        pass
-        #for op in optree.inputs:
-        #    subexpression_sharing(op, sharing_map, [{}] + level_sharing_map, current_parent_list)
-
-    elif isinstance(optree, ML_LeafNode):
-        pass
-    else:
-        if optree in sharing_map:
-            if not search_level_map(optree): 
-                # parallel branch sharing possibility
-                ancestor = common_ancestor(sharing_map[optree], current_parent_list)            
-                if ancestor != None:
-                    ancestor.add_to_pre_statement(optree)
+    def expand(optree, context):
+        """ process <optree> and list the (input, context) to be walked """
+        level_sharing_map, current_parent_list = context
+        if isinstance(optree, ConditionBlock):
+            optree.set_parent_list(current_parent_list)
+            # condition
+            input_list = [(optree.inputs[0], (level_sharing_map, current_parent_list + [optree]))]
+            # branches
+            for op in optree.inputs[1:]:
+                input_list.append((op, ([{}] + level_sharing_map, current_parent_list + [optree])))
+            return input_list
+
+        elif isinstance(optree, SwitchBlock):
+            optree.set_parent_list(current_parent_list)
+
+            # switch value
+            input_list = [(optree.inputs[0], (level_sharing_map, current_parent_list + [optree]))]
+            # case_statement
+            case_map = optree.get_case_map()
+            for case in case_map:
+                op = case_map[case]
+                input_list.append((op, ([{}] + level_sharing_map, current_parent_list + [optree])))
+            return input_list
+
+        elif isinstance(optree, Statement):
+            if not optree.get_prevent_optimization(): 
+                return [(op, ([{}] + level_sharing_map, current_parent_list)) for op in optree.inputs]
+            return []
+
+        elif isinstance(optree, Loop):
+            return []
+
+        elif isinstance(optree, ML_LeafNode):
+            return []
         else:
-            sharing_map[optree] = current_parent_list
-            level_sharing_map[0][optree] = current_parent_list
-            for op in optree.inputs:
-                subexpression_sharing(op, sharing_map, level_sharing_map, current_parent_list)
+            if optree in sharing_map:
+                if not search_level_map(optree, level_sharing_map): 
+                    # parallel branch sharing possibility
+                    ancestor = common_ancestor(sharing_map[optree], current_parent_list)            
+                    if ancestor != None:
+                        ancestor.add_to_pre_statement(optree)
+                return []
+            else:
+                sharing_map[optree] = current_parent_list
+                level_sharing_map[0][optree] = current_parent_list
+                return [(op, context) for op in optree.inputs]
+
+    context_walk(optree, (level_sharing_map, current_parent_list), expand)
+
+
+def get_format_key(precision):
+    """ return a hashable key identifying the format <precision> """
+    try:
+        hash(precision)
+        return precision
+    except TypeError:
+        # formats overloading __eq__ without __hash__
+        return (precision.__class__, str(precision))
+
+def get_constant_value_key(value):
+    """ return a hashable key identifying the constant <value>,
+        or None if <value> can not be hashed """
+    if isinstance(value, float):
+        # repr distinguishes signed zeros
+        return (float, repr(value))
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return (value.__class__, value)
+
+def get_node_extra_inputs(optree):
+    """ return the list of hidden inputs of a control-flow node
+        (pre-statement, switch cases) """
+    if isinstance(optree, ControlFlowOperation):
+        return list(optree.get_extra_inputs())
+    return []
+
+def get_value_numbering_inputs(optree):
+    """ input function of value numbering walks: operands and hidden
+        inputs of control-flow nodes, leaf nodes, loops and protected
+        statements are not walked through """
+    if isinstance(optree, ML_LeafNode):
+        return ()
+    elif isinstance(optree, Loop) or (isinstance(optree, Statement) and optree.get_prevent_optimization()):
+        return ()
+    return tuple(optree.get_inputs()) + tuple(get_node_extra_inputs(optree))
+
+def get_mutable_leaf_set(optree, mutable_set=None, memoization_map=None):
+    """ list the leaf nodes (variables, tables) of the graph <optree>
+        whose value can be modified by a ReferenceAssign or a TableStore """
+    mutable_set = set() if mutable_set is None else mutable_set
+    memoization_map = {} if memoization_map is None else memoization_map
+
+    def get_operands(node):
+        return () if isinstance(node, ML_LeafNode) else node.get_inputs()
+
+    def add_destination(dest):
+        for node in pre_order_walk(dest, get_inputs=get_operands):
+            if isinstance(node, ML_LeafNode):
+                mutable_set.add(node)
+
+    def get_inputs(node):
+        if isinstance(node, ML_LeafNode):
+            return ()
+        return tuple(node.get_inputs()) + tuple(get_node_extra_inputs(node))
+
+    for node in post_order_walk(optree, get_inputs=get_inputs, skip=memoization_map.__contains__):
+        memoization_map[node] = True
+        if isinstance(node, ReferenceAssign):
+            add_destination(node.get_input(0))
+        elif isinstance(node, TableStore):
+            add_destination(node.get_input(1))
+    return mutable_set
+
+
+def is_value_numbering_candidate(optree, mutable_set):
+    """ predicate testing if <optree> is a pure operation which can be
+        merged with any structurally equivalent node """
+    if not isinstance(optree, ML_ArithmeticOperation):
+        return False
+    elif isinstance(optree, (TableStore, Dereference, SpecificOperation)):
+        return False
+    elif isinstance(optree, TableLoad):
+        table = optree.get_input(0)
+        return isinstance(table, ML_Table) and not table in mutable_set
+    return True
+
+def is_trapping_operation(optree):
+    """ predicate testing if evaluating <optree> may trap, access
+        memory out of bounds (table load, integer division) or raise
+        floating-point flags (non-silent floating-point operation): such
+        an operation must not be evaluated ahead of the conditions
+        guarding it """
+    if isinstance(optree, TableLoad):
+        return True
+    elif isinstance(optree.get_precision(), ML_FP_Format):
+        return not optree.get_silent() is True
+    elif isinstance(optree, (Division, Modulo)):
+        return True
+    return False
+
+def get_branch_path(optree, index, extra, branch_path):
+    """ return the branch path of the input <index> of <optree> (extra
+        input if <extra> is set), <optree> having the branch path
+        <branch_path> """
+    if isinstance(optree, ConditionBlock) and not extra and index > 0:
+        # then/else branches (the pre-statement and the condition
+        # are evaluated before the branches)
+        return branch_path + ((optree, index),)
+    elif isinstance(optree, SwitchBlock) and extra:
+        # switch cases
+        return branch_path + ((optree, index),)
+    return branch_path
+
+def get_value_key(optree, input_list):
+    """ return the value numbering key of <optree> whose inputs have
+        been replaced by their representative in <input_list> """
+    return (
+        optree.__class__,
+        optree.get_codegen_key(),
+        get_format_key(optree.get_precision()),
+        tuple(input_list),
+        tuple(getattr(optree, attr, None) for attr in ("specifier", "likely", "align")),
+        optree.get_silent(),
+        optree.get_rounding_mode(),
+    )
+
+def value_numbering(optree, value_map=None, representative_map=None, tainted_set=None, mutable_set=None, branch_path=()):
+    """ merge structurally equivalent pure operations of the graph <optree>
+
+        Each node is associated with a representative: the first node
+        encountered with the same class, codegen key, precision, input
+        representatives and constant value. The inputs of every node are
+        replaced by their representative and the representative of <optree>
+        is returned.
+        Nodes depending on a mutable leaf (local variable, table modified by
+        TableStore) are never merged: their value depends on the program
+        point where they are evaluated.
+        Trapping operations (see is_trapping_operation) are only merged
+        within the same branch (<branch_path> lists the enclosing
+        (control-flow node, branch index) pairs): nodes shared between
+        branches are hoisted ahead of the branch conditions by
+        sub-expression sharing. """
+    value_map = {} if value_map is None else value_map
+    representative_map = {} if representative_map is None else representative_map
+    tainted_set = set() if tainted_set is None else tainted_set
+    mutable_set = get_mutable_leaf_set(optree) if mutable_set is None else mutable_set
+    # branch path of each walked node: the path of the first user walking
+    # through it, assigned when the walk reaches it
+    branch_path_map = {optree: branch_path}
+
+    def get_inputs(node):
+        node_path = branch_path_map[node]
+        input_list = get_value_numbering_inputs(node)
+        operand_num = len(input_list) - len(get_node_extra_inputs(node))
+        for index, op in enumerate(input_list):
+            if not op in branch_path_map:
+                if index < operand_num:
+                    branch_path_map[op] = get_branch_path(node, index, False, node_path)
+                else:
+                    branch_path_map[op] = get_branch_path(node, index - operand_num, True, node_path)
+            yield op
+
+    def register(key, node):
+        try:
+            return value_map.setdefault(key, node)
+        except TypeError:
+            # unhashable codegen key or specifier
+            return node
+
+    for node in post_order_walk(optree, get_inputs=get_inputs, skip=representative_map.__contains__):
+        if isinstance(node, Constant):
+            value_key = get_constant_value_key(node.get_value())
+            if value_key is None or node.get_debug():
+                representative = node
+            else:
+                representative = register(
+                    (Constant, get_format_key(node.get_precision()), value_key),
+                    node)
+        elif isinstance(node, AbstractVariable) and node.get_var_type() is AbstractVariable.Input and not node in mutable_set:
+            representative = node
+        elif isinstance(node, ML_Table) and not node in mutable_set:
+            representative = node
+        elif isinstance(node, ML_LeafNode):
+            representative = node
+            tainted_set.add(node)
+        elif isinstance(node, Loop) or (isinstance(node, Statement) and node.get_prevent_optimization()):
+            # loop bodies and protected statements are left untouched
+            representative = node
+        else:
+            # inputs have already been processed
+            tainted = False
+            for index, op in enumerate(node.get_inputs()):
+                op_representative = representative_map[op]
+                if not op_representative is op:
+                    node.set_input(index, op_representative)
+                tainted |= op_representative in tainted_set
+
+            representative = node
+            if tainted:
+                tainted_set.add(node)
+            elif is_value_numbering_candidate(node, mutable_set) and not node.get_debug() and not node.get_prevent_optimization():
+                value_key = get_value_key(node, node.get_inputs())
+                if is_trapping_operation(node):
+                    value_key = value_key, branch_path_map[node]
+                representative = register(value_key, node)
+
+        representative_map[node] = representative
+
+    return representative_map[optree]
 
 
 ## Generic vector promotion pass
@@ -343,6 +549,21 @@ class PassSubExpressionSharing(FunctionPass):
 
 
 
+class PassValueNumbering(FunctionPass):
+    """ merge structurally equivalent pure operations (global value
+        numbering) """
+    pass_tag = "value_numbering"
+    def __init__(self, target):
+        FunctionPass.__init__(self, "value_numbering")
+
+    def execute_on_optree(self, optree, fct=None, fct_group=None, memoization_map=None):
+        representative_map = {}
+        new_optree = value_numbering(optree, representative_map=representative_map)
+        merged_num = len([op for op in representative_map if not representative_map[op] is op])
+        Log.report(Log.Verbose, "value numbering merged {} node(s)", merged_num)
+        return new_optree
+
+
 class PassCheckProcessorSupport(FunctionPass):
     pass_tag = "check_processor_support"
     def __init__(self, target, language=C_Code, debug=False):
@@ -406,7 +627,7 @@ class PassCheckProcessorSupport(FunctionPass):
                                             # conversion insertion
                                             input_list = list(optree.inputs)
                                             input_list[op_index] = Conversion(op, precision = new_type)
-                                            optree.inputs = tuple(input_list)
+                                            optree.set_inputs(input_list)
                                             match_found = True
                                             break
                             break
@@ -458,5 +679,8 @@ Pass.register(PassFuseFMA)
 Log.report(LOG_PASS_INFO, "Registering sub_expr_sharing pass")
 Pass.register(PassSubExpressionSharing)
 
+Log.report(LOG_PASS_INFO, "Registering value_numbering pass")
+Pass.register(PassValueNumbering)
+
 Log.report(LOG_PASS_INFO, "Registering check_processor_support pass")
 Pass.register(PassCheckProcessorSupport)
@@ -48,6 +48,7 @@ from metalibm_core.core.ml_operations import (
 from metalibm_core.core.ml_hdl_operations import (
     Process, Loop, ComponentInstance, Assert, Wait, PlaceHolder
 )
+from metalibm_core.core.graph_walker import post_order_walk, get_post_order
 from metalibm_core.core.passes import (
     Pass, LOG_PASS_INFO, FunctionPass
 )
@@ -262,108 +263,106 @@ post_typing_process_rules = {
 }
 
 
-def instantiate_abstract_precision(optree, default_precision=None,
-                                   memoization_map=None):
-    """ recursively determine an abstract precision for each node """
-    memoization_map = memoization_map or {}
-    if optree in memoization_map:
-        return memoization_map[optree]
-    elif optree.get_precision() != None: 
-        memoization_map[optree] = optree.get_precision()
+def get_abstract_precision_inputs(optree, default_precision, memoization_map):
+    """ generate the inputs of <optree> to be typed before it, with the
+        default precision of each input
+        (pairs (input, default_precision)).
+        The inputs are generated lazily: the default precision of the
+        value of a ReferenceAssign is the precision of its destination,
+        which is only known once the destination has been processed """
+    if optree.get_precision() != None:
         if not isinstance(optree, ML_LeafNode):
             for inp in optree.inputs:
-                instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-            for inp in optree.get_extra_inputs():
-                instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-        return optree.get_precision()
+                yield inp, default_precision
+        # leaf nodes (e.g. RaiseReturn) may also have extra inputs
+        for inp in optree.get_extra_inputs():
+            yield inp, default_precision
+    elif isinstance(optree, (Constant, Variable)):
+        return
+    elif isinstance(optree, TableLoad):
+        for inp in optree.inputs[1:]:
+            yield inp, ML_Integer
+    elif isinstance(optree, (ConditionBlock, SwitchBlock)):
+        yield optree.get_pre_statement(), default_precision
+        for inp in optree.inputs:
+            yield inp, default_precision
+        for inp in optree.get_extra_inputs():
+            yield inp, default_precision
+    elif isinstance(optree, (Statement, Loop)):
+        for inp in optree.inputs:
+            yield inp, default_precision
+    elif isinstance(optree, ReferenceAssign):
+        var = optree.inputs[0]
+        value = optree.inputs[1]
+        yield var, default_precision
+        yield value, memoization_map.get(var)
     else:
-        if isinstance(optree, Constant):
-            if isinstance(optree.get_value(), FP_SpecialValue):
-                optree.set_precision(optree.get_value().get_precision())
-                memoization_map[optree] = optree.get_precision()
-                return optree.get_precision()
-            else:
-                if default_precision:
-                  new_precision = default_precision
-                else:
-                  new_precision = ML_Integer if isinstance(optree.get_value(), int) else ML_Float
-                optree.set_precision(new_precision)
-                memoization_map[optree] = new_precision
-                return new_precision
-
-        elif isinstance(optree, Variable):
-            if optree.get_var_type() in [Variable.Input, Variable.Local]:
-                Log.report(Log.Error, "%s Variable %s has no defined precision" % (optree.get_var_type(), optree.get_tag()))
+        for inp in optree.inputs:
+            yield inp, default_precision
+        for inp in optree.get_extra_inputs():
+            yield inp, default_precision
+
+def instantiate_abstract_node_precision(optree, default_precision, memoization_map):
+    """ determine the abstract precision of <optree> once its inputs
+        have been processed """
+    if optree.get_precision() != None:
+        memoization_map[optree] = optree.get_precision()
+    elif isinstance(optree, Constant):
+        if isinstance(optree.get_value(), FP_SpecialValue):
+            optree.set_precision(optree.get_value().get_precision())
+            memoization_map[optree] = optree.get_precision()
+        else:
+            if default_precision:
+              new_precision = default_precision
             else:
-                Log.report(Log.Error, "Variable %s error: only Input Variables are supported in instantiate_abstract_precision" % optree.get_tag())
-
-        elif isinstance(optree, TableLoad):
-            # TableLoad operations
-            for inp in optree.inputs[1:]:
-                instantiate_abstract_precision(inp, ML_Integer, memoization_map = memoization_map)
-            format_rule = abstract_typing_rule[optree.__class__]
-            abstract_format = format_rule(optree, *optree.inputs)
-            optree.set_precision(abstract_format)
-            memoization_map[optree] = abstract_format
-            return abstract_format
-
-        elif isinstance(optree, ConditionBlock):
-            # pre statement
-            instantiate_abstract_precision(optree.get_pre_statement(), default_precision, memoization_map = memoization_map)
-            # condition and branches
-            for inp in optree.inputs:
-                instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-            for inp in optree.get_extra_inputs():
-                instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-            memoization_map[optree] = None
-            return None
+              new_precision = ML_Integer if isinstance(optree.get_value(), int) else ML_Float
+            optree.set_precision(new_precision)
+            memoization_map[optree] = new_precision
 
-        elif isinstance(optree, SwitchBlock):
-            # pre statement
-            instantiate_abstract_precision(optree.get_pre_statement(), default_precision, memoization_map = memoization_map)
+    elif isinstance(optree, Variable):
+        if optree.get_var_type() in [Variable.Input, Variable.Local]:
+            Log.report(Log.Error, "%s Variable %s has no defined precision" % (optree.get_var_type(), optree.get_tag()))
+        else:
+            Log.report(Log.Error, "Variable %s error: only Input Variables are supported in instantiate_abstract_precision" % optree.get_tag())
 
-            case_map = optree.get_case_map()
-            for inp in optree.inputs:
-                instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-            for inp in optree.get_extra_inputs():
-                instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-            memoization_map[optree] = None
-            return None
+    elif isinstance(optree, (ConditionBlock, SwitchBlock, Statement, Loop)):
+        memoization_map[optree] = None
 
-        elif isinstance(optree, Statement):
-            for inp in optree.inputs:
-                instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
+    elif isinstance(optree, ReferenceAssign):
+        pass
 
-            memoization_map[optree] = None
-            return None
+    else:
+        # all other operations (TableLoad included)
+        format_rule = abstract_typing_rule[optree.__class__]
+        abstract_format = format_rule(optree, *optree.inputs)
+        optree.set_precision(abstract_format)
+        memoization_map[optree] = abstract_format
 
-        elif isinstance(optree, Loop):
-            for inp in optree.inputs:
-                instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-
-            memoization_map[optree] = None
-            return None
-
-        elif isinstance(optree, ReferenceAssign):
-            var = optree.inputs[0]
-            value = optree.inputs[1]
-            var_type = instantiate_abstract_precision(var, default_precision, memoization_map = memoization_map)
-            value_type = instantiate_abstract_precision(value, var_type, memoization_map = memoization_map)
-            return None
-                    
-        else:
-            # all other operations
-            for inp in optree.inputs:
-                instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
-            for inp in optree.get_extra_inputs():
-                instantiate_abstract_precision(inp, default_precision, memoization_map = memoization_map)
+def instantiate_abstract_precision(optree, default_precision=None,
+                                   memoization_map=None):
+    """ determine an abstract precision for each node, the default
+        precision of each node (used for untyped constants) is the one
+        its first user passes down """
+    memoization_map = memoization_map or {}
+    if optree in memoization_map:
+        return memoization_map[optree]
+    # default precision of each walked node, assigned by its first user
+    # when the walk reaches it
+    default_map = {optree: default_precision}
+
+    def get_inputs(node):
+        if node.get_precision() != None:
+            # typed nodes are registered before their inputs are walked
+            memoization_map[node] = node.get_precision()
+        for op, op_default in get_abstract_precision_inputs(node, default_map[node], memoization_map):
+            if not op in default_map:
+                default_map[op] = op_default
+            yield op
 
-            format_rule = abstract_typing_rule[optree.__class__]
-            abstract_format = format_rule(optree, *optree.inputs)
-            optree.set_precision(abstract_format)
+    for node in post_order_walk(optree, get_inputs=get_inputs, skip=memoization_map.__contains__):
+        instantiate_abstract_node_precision(node, default_map[node], memoization_map)
 
-            memoization_map[optree] = abstract_format
-            return abstract_format
+    return memoization_map.get(optree)
 
 def merge_ops_abstract_format(optree, args, default_precision = None):
     """ merging input format in multi-ary operation to determined result format """
@@ -465,38 +464,36 @@ def merge_format(optree, args, default_precision = None):
       return None
     return result_format
 
-def instantiate_precision(optree, default_precision=None, memoization_map=None, backend=None):
-    """ instantiate final precisions and insert required conversions
-        if the operation is not supported """
-    memoization_map = memoization_map if not memoization_map is None else {}
-    result_precision = optree.get_precision()
-
-    if optree in memoization_map:
-        return memoization_map[optree]
-
+def instantiate_node_precision(optree, default_precision=None, backend=None):
+    """ instantiate the final precision of <optree> (whose inputs must
+        already have been processed) and apply post-typing rules """
     if not isinstance(optree, ML_LeafNode):
-        for inp in optree.inputs:
-            instantiate_precision(
-                inp, default_precision,
-                memoization_map=memoization_map,
-                backend=backend
-            )
-
+        result_precision = optree.get_precision()
         # instanciating if abstract precision
         if isinstance(result_precision, ML_AbstractFormat):
             format_rule = practical_typing_rule[optree.__class__]
             result_precision = format_rule(backend, optree, default_precision)
             optree.set_precision(result_precision)
 
-    for inp in optree.get_extra_inputs():
-        instantiate_precision(inp, default_precision, memoization_map=memoization_map, backend=backend)
-
-    memoization_map[optree] = optree.get_precision()
-
     if optree.__class__ in post_typing_process_rules:
         post_rule = post_typing_process_rules[optree.__class__]
         post_rule(backend, optree)
 
+def instantiate_precision(optree, default_precision=None, memoization_map=None, backend=None):
+    """ instantiate final precisions and insert required conversions
+        if the operation is not supported """
+    memoization_map = memoization_map if not memoization_map is None else {}
+
+    if optree in memoization_map:
+        return memoization_map[optree]
+
+    # operands (and extra inputs) are processed before their users
+    for node in get_post_order(optree):
+        if node in memoization_map:
+            continue
+        instantiate_node_precision(node, default_precision, backend=backend)
+        memoization_map[node] = node.get_precision()
+
     return optree.get_precision()
 
 class PassInstantiateAbstractPrecision(FunctionPass):
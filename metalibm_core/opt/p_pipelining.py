@@ -39,6 +39,7 @@ from metalibm_core.core.ml_hdl_operations import (
 )
 from metalibm_core.core.advanced_operations import FixedPointPosition
 from metalibm_core.core.ml_hdl_format import ML_StdLogic
+from metalibm_core.core.graph_walker import post_order_walk
 
 
 class RetimeMap:
@@ -130,7 +131,24 @@ def node_has_inputs(optree):
         return True
 
 
+def get_retime_inputs(op):
+    """ list the inputs of op which must be retimed before op """
+    if isinstance(op, StaticDelay) or not node_has_inputs(op):
+        return []
+    return op.get_inputs()
+
+
 def retime_op(op, retime_map):
+    """ Process op and each of its (transitive) inputs and if necessary
+        generate necessary forwarding stage.
+        The inputs are retimed in post-order (before the node using them)
+        without recursion, so that deep datapaths can be processed """
+    for node in post_order_walk(op, get_inputs=get_retime_inputs,
+                                skip=retime_map.hasBeenProcessed):
+        retime_node(node, retime_map)
+
+
+def retime_node(op, retime_map):
     """ Process each input of op and if necessary generate necessary
         forwarding stage """
     op_stage = op.attributes.init_stage
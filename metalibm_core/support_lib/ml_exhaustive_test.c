@@ -0,0 +1,188 @@
+#include <support_lib/ml_exhaustive_test.h>
+#include <support_lib/ml_types.h>
+#include <inttypes.h>
+#include <pthread.h>
+#include <unistd.h>
+#include <stdlib.h>
+#include <stdio.h>
+#include <math.h>
+
+/** precision (in bits) of the MPFR reference values */
+#define ML_EXHAUSTIVE_REF_PREC 128
+
+/** number of failing inputs displayed per thread */
+#define ML_EXHAUSTIVE_MAX_DISPLAY 4
+
+typedef struct {
+  const char* name;
+  ml_binary32_function_t fct;
+  ml_mpfr_reference_t reference;
+  float low;
+  float high;
+  int include_nan;
+  int accuracy;
+  double goal;
+  /* range of input encodings [start, end) */
+  uint64_t start;
+  uint64_t end;
+  /* results */
+  uint64_t test_count;
+  uint64_t failure_count;
+  double max_ulp_error;
+  uint32_t max_ulp_input;
+} ml_exhaustive_task_t;
+
+
+/** return the error between @p result and @p ref in ulps of @p ref */
+static double ml_ulp_error_binary32(float result, mpfr_t ref, mpfr_t tmp)
+{
+  if (mpfr_nan_p(ref)) return isnan(result) ? 0.0 : INFINITY;
+  if (isnan(result)) return INFINITY;
+  if (mpfr_inf_p(ref) || isinf(result)) {
+    return (mpfr_cmp_d(ref, result) == 0) ? 0.0 : INFINITY;
+  }
+  mpfr_set_flt(tmp, result, MPFR_RNDN);
+  mpfr_sub(tmp, tmp, ref, MPFR_RNDN);
+  mpfr_abs(tmp, tmp, MPFR_RNDN);
+  if (!mpfr_zero_p(ref)) {
+    /* binary32 ulp of ref (subnormal ulp below the normal range) */
+    long exp = mpfr_get_exp(ref) - 1;
+    if (exp < -126) exp = -126;
+    mpfr_mul_2si(tmp, tmp, 23 - exp, MPFR_RNDN);
+  } else {
+    mpfr_mul_2si(tmp, tmp, 149, MPFR_RNDN);
+  }
+  return mpfr_get_d(tmp, MPFR_RNDU);
+}
+
+/** check @p result against the reference @p ref */
+static int ml_check_binary32(ml_exhaustive_task_t* task, float result, mpfr_t ref, mpfr_t tmp)
+{
+  float expected;
+  if (mpfr_nan_p(ref)) return isnan(result);
+  switch (task->accuracy) {
+  case ML_EXHAUSTIVE_CORRECTLY_ROUNDED:
+    expected = mpfr_get_flt(ref, MPFR_RNDN);
+    return (result == expected) || (isnan(result) && isnan(expected));
+  case ML_EXHAUSTIVE_FAITHFUL:
+    return (result == mpfr_get_flt(ref, MPFR_RNDD)) || (result == mpfr_get_flt(ref, MPFR_RNDU));
+  case ML_EXHAUSTIVE_DEGRADED_ABSOLUTE:
+  case ML_EXHAUSTIVE_DEGRADED_RELATIVE:
+    if (isnan(result)) return 0;
+    if (mpfr_inf_p(ref) || isinf(result)) return mpfr_cmp_d(ref, result) == 0;
+    mpfr_set_flt(tmp, result, MPFR_RNDN);
+    mpfr_sub(tmp, tmp, ref, MPFR_RNDN);
+    mpfr_abs(tmp, tmp, MPFR_RNDN);
+    if (task->accuracy == ML_EXHAUSTIVE_DEGRADED_RELATIVE) {
+      mpfr_div(tmp, tmp, ref, MPFR_RNDN);
+      mpfr_abs(tmp, tmp, MPFR_RNDN);
+    }
+    return mpfr_cmp_d(tmp, task->goal) <= 0;
+  default:
+    return 0;
+  }
+}
+
+static void* ml_exhaustive_worker(void* arg)
+{
+  ml_exhaustive_task_t* task = (ml_exhaustive_task_t*) arg;
+  mpfr_t vx, ref, tmp;
+  uint64_t encoding;
+
+  mpfr_init2(vx, 24);
+  mpfr_init2(ref, ML_EXHAUSTIVE_REF_PREC);
+  mpfr_init2(tmp, ML_EXHAUSTIVE_REF_PREC);
+
+  for (encoding = task->start; encoding < task->end; ++encoding) {
+    uif_conv_t conv;
+    float result;
+    double ulp_error;
+    conv.u = (uint32_t) encoding;
+    if (isnan(conv.f)) {
+      if (!task->include_nan) continue;
+    } else if (conv.f < task->low || conv.f > task->high) continue;
+
+    task->test_count++;
+    result = task->fct(conv.f);
+    mpfr_set_flt(vx, conv.f, MPFR_RNDN);
+    task->reference(ref, vx, MPFR_RNDN);
+
+    ulp_error = ml_ulp_error_binary32(result, ref, tmp);
+    if (ulp_error > task->max_ulp_error) {
+      task->max_ulp_error = ulp_error;
+      task->max_ulp_input = conv.u;
+    }
+    if (!ml_check_binary32(task, result, ref, tmp)) {
+      if (task->failure_count < ML_EXHAUSTIVE_MAX_DISPLAY) {
+        printf("error: %s(%a) [%"PRIx32"], result is %a vs expected %a\n",
+               task->name, conv.f, conv.u, result, mpfr_get_d(ref, MPFR_RNDN));
+      }
+      task->failure_count++;
+    }
+  }
+
+  mpfr_clears(vx, ref, tmp, (mpfr_ptr) 0);
+  mpfr_free_cache();
+  return NULL;
+}
+
+int ml_exhaustive_test_binary32(
+  const char* name, ml_binary32_function_t fct, ml_mpfr_reference_t reference,
+  float low, float high, int accuracy, double goal, int thread_num)
+{
+  const uint64_t input_num = UINT64_C(1) << 32;
+  ml_exhaustive_task_t* task_list;
+  pthread_t* thread_list;
+  uint64_t test_count = 0, failure_count = 0;
+  double max_ulp_error = 0.0;
+  uint32_t max_ulp_input = 0;
+  int i;
+
+  if (thread_num <= 0) {
+    long cpu_num = sysconf(_SC_NPROCESSORS_ONLN);
+    thread_num = cpu_num > 0 ? (int) cpu_num : 1;
+  }
+  task_list = calloc(thread_num, sizeof(ml_exhaustive_task_t));
+  thread_list = calloc(thread_num, sizeof(pthread_t));
+  if (!task_list || !thread_list) {
+    printf("unable to allocate exhaustive test tasks\n");
+    return 1;
+  }
+
+  for (i = 0; i < thread_num; ++i) {
+    ml_exhaustive_task_t* task = task_list + i;
+    task->name = name;
+    task->fct = fct;
+    task->reference = reference;
+    task->low = low;
+    task->high = high;
+    task->include_nan = isinf(low) && low < 0 && isinf(high) && high > 0;
+    task->accuracy = accuracy;
+    task->goal = goal;
+    task->start = input_num * i / thread_num;
+    task->end = input_num * (i + 1) / thread_num;
+    if (pthread_create(thread_list + i, NULL, ml_exhaustive_worker, task)) {
+      printf("unable to create exhaustive test thread %d\n", i);
+      return 1;
+    }
+  }
+
+  for (i = 0; i < thread_num; ++i) {
+    pthread_join(thread_list[i], NULL);
+    test_count += task_list[i].test_count;
+    failure_count += task_list[i].failure_count;
+    if (task_list[i].max_ulp_error > max_ulp_error) {
+      max_ulp_error = task_list[i].max_ulp_error;
+      max_ulp_input = task_list[i].max_ulp_input;
+    }
+  }
+
+  printf("exhaustive test of %s: %"PRIu64" inputs tested with %d threads, %"PRIu64" failure(s)\n",
+         name, test_count, thread_num, failure_count);
+  printf("max %s error is %.3f ulp(s), reached at input [%"PRIx32"]\n",
+         name, max_ulp_error, max_ulp_input);
+
+  free(task_list);
+  free(thread_list);
+  return failure_count != 0;
+}
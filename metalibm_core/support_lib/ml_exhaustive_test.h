@@ -0,0 +1,34 @@
+#ifndef ML_EXHAUSTIVE_TEST
+#define ML_EXHAUSTIVE_TEST
+
+#include <stdint.h>
+#include <mpfr.h>
+
+/** accuracy check performed by the exhaustive test driver */
+#define ML_EXHAUSTIVE_CORRECTLY_ROUNDED   0
+#define ML_EXHAUSTIVE_FAITHFUL            1
+#define ML_EXHAUSTIVE_DEGRADED_ABSOLUTE   2
+#define ML_EXHAUSTIVE_DEGRADED_RELATIVE   3
+
+/** single precision function under test */
+typedef float (*ml_binary32_function_t)(float);
+
+/** MPFR reference: evaluate the function on @p x into @p result,
+ *  rounded in direction @p rnd, and return the mpfr ternary value */
+typedef int32_t (*ml_mpfr_reference_t)(mpfr_t result, mpfr_t x, int32_t rnd);
+
+/** Test @p fct against @p reference on every binary32 input in
+ *  [@p low, @p high] (NaN inputs are included if the range is
+ *  [-infty, +infty]), splitting the input space between @p thread_num
+ *  threads (0: one thread per online processor).
+ *  Failure count and maximal error (in ulps) are reported on stdout.
+ *  @param name function name (used in messages)
+ *  @param accuracy one of the ML_EXHAUSTIVE_* accuracy checks
+ *  @param goal error bound for degraded accuracy checks
+ *  @return 0 if no failure was detected, 1 otherwise
+ */
+int ml_exhaustive_test_binary32(
+  const char* name, ml_binary32_function_t fct, ml_mpfr_reference_t reference,
+  float low, float high, int accuracy, double goal, int thread_num);
+
+#endif /* ML_EXHAUSTIVE_TEST */
@@ -0,0 +1,36 @@
+#include <support_lib/ml_test_file.h>
+#include <stdio.h>
+
+/** size (in bytes) of the chunks read from test vector files */
+#define ML_TEST_FILE_CHUNK_SIZE (1 << 20)
+
+int ml_read_test_table(const char* filename, long offset, void* table, size_t size)
+{
+  FILE* test_file = fopen(filename, "rb");
+  char* dst = (char*) table;
+  size_t remaining = size;
+
+  if (!test_file) {
+    printf("unable to open test vector file %s\n", filename);
+    return 1;
+  }
+  if (fseek(test_file, offset, SEEK_SET)) {
+    printf("unable to seek position %ld in test vector file %s\n", offset, filename);
+    fclose(test_file);
+    return 1;
+  }
+  while (remaining > 0) {
+    size_t chunk_size = remaining < ML_TEST_FILE_CHUNK_SIZE ? remaining : ML_TEST_FILE_CHUNK_SIZE;
+    size_t read_size = fread(dst, 1, chunk_size, test_file);
+    if (read_size != chunk_size) {
+      printf("test vector file %s is too short\n", filename);
+      fclose(test_file);
+      return 1;
+    }
+    dst += read_size;
+    remaining -= read_size;
+  }
+
+  fclose(test_file);
+  return 0;
+}
@@ -0,0 +1,17 @@
+#ifndef ML_TEST_FILE
+#define ML_TEST_FILE
+
+#include <stddef.h>
+
+
+/** Load a test table from a binary test vector file, the file is
+ *  streamed by chunks (no whole-file buffering)
+ *  @param filename path of the binary test vector file
+ *  @param offset position (in bytes) of the table data in the file
+ *  @param table destination buffer
+ *  @param size number of bytes to be read
+ *  @return 0 on success, 1 if the file could not be opened or is too short
+ */
+int ml_read_test_table(const char* filename, long offset, void* table, size_t size);
+
+#endif /* ML_TEST_FILE */
@@ -1476,7 +1476,7 @@ class VectorBackend(GenericProcessor):
 
   def __init__(self, *args):
     GenericProcessor.__init__(self, *args)
-    self.simplified_rec_op_map[OpenCL_Code] = self.generate_supported_op_map(language = OpenCL_Code)
+    self.simplified_rec_op_map[OpenCL_Code] = self.get_supported_op_map(language = OpenCL_Code)
 
 
   def is_supported_operation(self, optree, language = C_Code, debug = False, fallback = True,  key_getter = lambda self, optree: self.get_operation_keys(optree)):
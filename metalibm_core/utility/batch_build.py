@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Batch build of generated functions into a single shared library
+
+    The sources of many meta-functions (and the support library) are
+    compiled through a generated Makefile driven with make -j, so that the
+    whole library is built in one step using every core. A JSON manifest
+    lists the functions and the symbols exported by the library. """
+
+import os
+import json
+import subprocess
+import multiprocessing
+
+from .log_report import Log
+
+
+## default options for position independent library objects
+LIBRARY_OPTIONS = ["-O2", "-fPIC"]
+
+
+class LibrarySource(object):
+    """ description of a source file to be built into a library """
+    def __init__(self, src_file, compiler, option_list, symbol=None, info=None):
+        """ Args:
+                src_file (str): path of the C source
+                compiler (str): compiler command
+                option_list (list): compilation options
+                symbol (str): name of the function implemented by the source
+                info (dict): additional manifest information
+        """
+        self.src_file = os.path.abspath(src_file)
+        self.compiler = compiler
+        self.option_list = option_list
+        self.symbol = symbol
+        self.info = info or {}
+
+    def get_object_name(self, index):
+        base_name = os.path.splitext(os.path.basename(self.src_file))[0]
+        return "{}_{}.o".format(index, base_name)
+
+
+def get_function_source(fct):
+    """ return the LibrarySource describing the generated code of the
+        meta-function <fct> (ML_FunctionBasis object) """
+    if fct.auto_test_enable or fct.bench_enabled:
+        Log.report(
+            Log.Error,
+            "{} can not be built into a library: it embeds a test or bench wrapper",
+            fct.function_name)
+    option_list = LIBRARY_OPTIONS + fct.processor.get_compilation_options() + [
+        "-I{}/metalibm_core".format(os.environ["ML_SRC_DIR"])
+    ]
+    info = {
+        "precision": str(fct.precision),
+        "input_precisions": [str(precision) for precision in fct.get_input_precisions()],
+        "target": fct.processor.target_name,
+    }
+    return LibrarySource(
+        fct.output_file, fct.processor.get_compiler(), option_list,
+        symbol=fct.function_name, info=info)
+
+def get_support_sources(compiler):
+    """ return the LibrarySource list of the support library """
+    option_list = LIBRARY_OPTIONS + ["-I{}/metalibm_core".format(os.environ["ML_SRC_DIR"])]
+    return [
+        LibrarySource(
+            "%s/metalibm_core/support_lib/%s" % (os.environ["ML_SRC_DIR"], src_name),
+            compiler, option_list)
+        for src_name in ["ml_libm_compatibility.c", "ml_multi_prec_lib.c"]
+    ]
+
+def generate_makefile(source_list, lib_file, build_dir, link_compiler):
+    """ return the content of a Makefile building every source of
+        <source_list> into objects of <build_dir> and linking them
+        into the shared library <lib_file> """
+    object_list = [
+        os.path.join(build_dir, source.get_object_name(index))
+        for index, source in enumerate(source_list)
+    ]
+    makefile = ".PHONY: all\nall: {}\n\n".format(lib_file)
+    makefile += "{}: {}\n\t{} -shared -o $@ $^ -lm\n\n".format(
+        lib_file, " ".join(object_list), link_compiler)
+    for source, object_file in zip(source_list, object_list):
+        makefile += "{}: {}\n\t{} {} -c $< -o $@\n\n".format(
+            object_file, source.src_file, source.compiler,
+            " ".join(source.option_list))
+    return makefile
+
+def get_exported_symbols(lib_file):
+    """ return the sorted list of functions exported by the shared
+        library <lib_file> (empty if nm is not available) """
+    try:
+        nm_output = subprocess.check_output(
+            ["nm", "-D", "--defined-only", lib_file]).decode("utf-8")
+    except (OSError, subprocess.CalledProcessError):
+        Log.report(Log.Warning, "unable to list symbols of {}", lib_file)
+        return []
+    symbol_list = []
+    for line in nm_output.splitlines():
+        fields = line.split()
+        if len(fields) == 3 and fields[1] in "TW":
+            symbol_list.append(fields[2])
+    return sorted(symbol_list)
+
+def build_library(source_list, lib_file, build_dir=None, jobs=None):
+    """ build <source_list> (list of LibrarySource) into the shared library
+        <lib_file> with at most <jobs> concurrent compilations (default:
+        one per core) and write the manifest <lib_file>.json
+
+        Returns the manifest (dict) """
+    if not source_list:
+        Log.report(Log.Error, "no source to build library {} from", lib_file)
+    symbol_list = [source.symbol for source in source_list if source.symbol]
+    duplicate_list = set(symbol for symbol in symbol_list if symbol_list.count(symbol) > 1)
+    if duplicate_list:
+        Log.report(Log.Error, "duplicated function(s) in library: {}", ", ".join(sorted(duplicate_list)))
+    lib_file = os.path.abspath(lib_file)
+    build_dir = os.path.abspath(build_dir or os.path.splitext(lib_file)[0] + "_build")
+    if not os.path.isdir(build_dir):
+        os.makedirs(build_dir)
+    link_compiler = source_list[0].compiler
+    source_list = source_list + get_support_sources(link_compiler)
+    makefile = os.path.join(build_dir, "Makefile")
+    with open(makefile, "w") as makefile_stream:
+        makefile_stream.write(generate_makefile(source_list, lib_file, build_dir, link_compiler))
+    jobs = multiprocessing.cpu_count() if jobs is None else jobs
+    build_command = ["make", "-j{}".format(jobs), "-f", makefile]
+    Log.report(Log.Info, "building library {} with command: {}", lib_file, " ".join(build_command))
+    if subprocess.call(build_command):
+        Log.report(Log.Error, "build of library {} failed", lib_file)
+
+    exported_symbols = get_exported_symbols(lib_file)
+    missing_list = [symbol for symbol in symbol_list if not symbol in exported_symbols]
+    if missing_list and exported_symbols:
+        Log.report(Log.Warning, "function(s) not exported by {}: {}", lib_file, ", ".join(missing_list))
+    manifest = {
+        "library": lib_file,
+        "functions": [
+            dict(symbol=source.symbol, source=source.src_file, **source.info)
+            for source in source_list if source.symbol
+        ],
+        "symbols": exported_symbols,
+    }
+    with open(lib_file + ".json", "w") as manifest_stream:
+        json.dump(manifest, manifest_stream, indent=2, sort_keys=True)
+    return manifest
+
+def build_function_library(fct_list, lib_file, build_dir=None, jobs=None):
+    """ build the code generated by the meta-functions <fct_list>
+        (ML_FunctionBasis objects whose gen_implementation has been called)
+        into the shared library <lib_file> """
+    return build_library(
+        [get_function_source(fct) for fct in fct_list], lib_file,
+        build_dir=build_dir, jobs=jobs)
+
+
+if __name__ == "__main__":
+    import argparse
+    arg_parser = argparse.ArgumentParser(" Metalibm batch library build")
+    arg_parser.add_argument("--output", dest="output", default="libml.so",
+                            help="shared library to build")
+    arg_parser.add_argument("--compiler", dest="compiler", default="gcc",
+                            help="compiler command")
+    arg_parser.add_argument("--jobs", dest="jobs", type=int, default=None,
+                            help="maximal number of concurrent compilations")
+    arg_parser.add_argument("sources", nargs="+", help="generated C sources")
+    args = arg_parser.parse_args()
+    option_list = LIBRARY_OPTIONS + ["-I{}/metalibm_core".format(os.environ["ML_SRC_DIR"])]
+    build_library(
+        [LibrarySource(src_file, args.compiler, option_list) for src_file in args.sources],
+        args.output, jobs=args.jobs)
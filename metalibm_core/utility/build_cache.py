@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Persistent cache of compilation results
+
+    Build results (objects or linked binaries) are stored in a DiskCache
+    namespace, indexed by the compiler identity, the compilation options
+    and the hash of every preprocessed source. Preprocessing is done
+    without line markers so that a source rebuilt from another working
+    directory still hits the cache.
+
+    Computing a key costs one extra preprocessor run per source (about
+    10 to 15 ms with gcc, mostly process startup, to be compared with 15
+    to 90 ms for the compilation of a support library source and more
+    for a generated function). It is not paid when caching is disabled,
+    and the hashes of the support library sources, which do not change
+    during a run, are only computed once per process. """
+
+import os
+import stat
+import atexit
+import shutil
+import hashlib
+import tempfile
+import subprocess
+
+from .log_report import Log
+from .disk_cache import (
+    DiskCache, LOG_CACHE_INFO, get_cache_dir, is_cache_enabled
+)
+
+
+## persistent storage of build results
+BUILD_CACHE = DiskCache("build", max_size=512 * 2**20, memory=False)
+
+## map of compiler -> version string (memoized)
+COMPILER_VERSION_MAP = {}
+
+
+def get_compiler_version(compiler):
+    """ return the version banner of <compiler> (memoized) """
+    if not compiler in COMPILER_VERSION_MAP:
+        try:
+            version = subprocess.check_output(
+                [compiler, "--version"], stderr=subprocess.STDOUT)
+        except (OSError, subprocess.CalledProcessError):
+            version = b""
+        COMPILER_VERSION_MAP[compiler] = version.decode("utf-8", "replace")
+    return COMPILER_VERSION_MAP[compiler]
+
+## map of support library key -> archive path, for the current process
+SUPPORT_LIBRARY_MAP = {}
+## map of (compiler, options, sources) -> archive path, for the current
+#  process: avoids preprocessing the support sources for each build
+SUPPORT_LIBRARY_REQUEST_MAP = {}
+
+## directory of the support library sources
+SUPPORT_SRC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "support_lib")
+## map of (compiler, options, support source) -> preprocessed digest,
+#  for the current process
+SUPPORT_SRC_HASH_MAP = {}
+
+def get_preprocessed_hash(compiler, option_list, src_file):
+    """ return the digest of <src_file> preprocessed by <compiler>
+        with options <option_list>, None if preprocessing failed.
+        Digests of support library sources are memoized """
+    if os.path.dirname(os.path.abspath(src_file)) == SUPPORT_SRC_DIR:
+        request = (compiler, tuple(option_list), os.path.abspath(src_file))
+        if not request in SUPPORT_SRC_HASH_MAP:
+            SUPPORT_SRC_HASH_MAP[request] = get_uncached_preprocessed_hash(
+                compiler, option_list, src_file)
+        return SUPPORT_SRC_HASH_MAP[request]
+    return get_uncached_preprocessed_hash(compiler, option_list, src_file)
+
+def get_uncached_preprocessed_hash(compiler, option_list, src_file):
+    """ return the digest of <src_file> preprocessed by <compiler>
+        with options <option_list>, None if preprocessing failed """
+    cmd = [compiler, "-E", "-P"] + option_list + [src_file]
+    cmd_process = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    preprocessed, _ = cmd_process.communicate()
+    if cmd_process.returncode:
+        return None
+    return hashlib.sha256(preprocessed).hexdigest()
+
+def get_build_key(compiler, option_list, src_list, link_option_list):
+    """ return the build cache key of the compilation of <src_list>
+        by <compiler> with <option_list> and link options <link_option_list>,
+        None if caching is disabled (the sources are then not preprocessed)
+        or if the sources could not be preprocessed """
+    if not is_cache_enabled():
+        return None
+    return get_source_key(compiler, option_list, src_list, link_option_list)
+
+def get_source_key(compiler, option_list, src_list, link_option_list):
+    """ return the key of the compilation of <src_list> by <compiler>
+        with <option_list> and <link_option_list> (see get_build_key),
+        computed even if caching is disabled """
+    src_hash_list = [
+        get_preprocessed_hash(compiler, option_list, src_file) for src_file in src_list
+    ]
+    if None in src_hash_list:
+        return None
+    return DiskCache.get_key(
+        "build", get_compiler_version(compiler), " ".join(option_list),
+        " ".join(link_option_list), *src_hash_list)
+
+def load_build_result(key, result_file):
+    """ copy the build result associated to <key> into <result_file>,
+        return True on success, False if no such result exists """
+    if key is None:
+        return False
+    content = BUILD_CACHE.get(key)
+    if content is None:
+        return False
+    with open(result_file, "wb") as result_stream:
+        result_stream.write(content)
+    # restoring execution permission of linked binaries
+    file_mode = os.stat(result_file).st_mode
+    os.chmod(result_file, file_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    Log.report(LOG_CACHE_INFO, "build result {} fetched from cache", result_file)
+    return True
+
+def store_build_result(key, result_file):
+    """ store the content of <result_file> as the build result of <key> """
+    if key is None:
+        return
+    try:
+        with open(result_file, "rb") as result_stream:
+            content = result_stream.read()
+    except (IOError, OSError):
+        return
+    BUILD_CACHE.put(key, content)
+
+def get_support_library_dir():
+    """ return the directory storing prebuilt support libraries """
+    if is_cache_enabled():
+        return os.path.join(get_cache_dir(), "support_lib")
+    # no persistent storage: archives only live as long as the process
+    if not None in SUPPORT_LIBRARY_MAP:
+        support_library_dir = tempfile.mkdtemp(prefix="ml_support_lib_")
+        atexit.register(shutil.rmtree, support_library_dir, True)
+        SUPPORT_LIBRARY_MAP[None] = support_library_dir
+    return SUPPORT_LIBRARY_MAP[None]
+
+def build_support_library(compiler, option_list, src_list, archive_path):
+    """ compile <src_list> with <compiler> and <option_list> and gather
+        the resulting objects in the static library <archive_path>,
+        return True on success """
+    archive_dir = os.path.dirname(archive_path)
+    if not os.path.isdir(archive_dir):
+        try:
+            os.makedirs(archive_dir)
+        except OSError:
+            # directory may have been created concurrently
+            if not os.path.isdir(archive_dir):
+                return False
+    build_dir = tempfile.mkdtemp(prefix=".tmp_", dir=archive_dir)
+    try:
+        obj_list = []
+        for index, src_file in enumerate(src_list):
+            obj_file = os.path.join(build_dir, "support_{}.o".format(index))
+            cmd = [compiler] + option_list + ["-c", src_file, "-o", obj_file]
+            if subprocess.call(cmd):
+                Log.report(Log.Warning, "unable to build support library source {}", src_file)
+                return False
+            obj_list.append(obj_file)
+        tmp_archive = os.path.join(build_dir, os.path.basename(archive_path))
+        if subprocess.call(["ar", "rcs", tmp_archive] + obj_list):
+            return False
+        # atomic publication, concurrent builders produce identical archives
+        os.rename(tmp_archive, archive_path)
+        return True
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+def get_support_library(compiler, option_list, src_list):
+    """ return the path of a static library containing <src_list> built
+        with <compiler> and <option_list>; the library is built once per
+        (compiler, options, sources) and shared between builds and
+        processes. Returns None if the library could not be built """
+    request = (compiler, tuple(option_list), tuple(src_list))
+    if request in SUPPORT_LIBRARY_REQUEST_MAP:
+        return SUPPORT_LIBRARY_REQUEST_MAP[request]
+    archive_path = get_support_library_path(compiler, option_list, src_list)
+    SUPPORT_LIBRARY_REQUEST_MAP[request] = archive_path
+    return archive_path
+
+def get_support_library_path(compiler, option_list, src_list):
+    """ return the path of the static library containing <src_list> built
+        with <compiler> and <option_list>, indexed by the content of the
+        preprocessed sources (see get_support_library) """
+    key = get_source_key(compiler, option_list, src_list, ["support_lib"])
+    if key is None:
+        return None
+    if key in SUPPORT_LIBRARY_MAP:
+        return SUPPORT_LIBRARY_MAP[key]
+    archive_path = os.path.join(get_support_library_dir(), "libml_support_{}.a".format(key[:16]))
+    if os.path.exists(archive_path):
+        Log.report(LOG_CACHE_INFO, "support library {} fetched from cache", archive_path)
+    else:
+        Log.report(Log.Info, "building support library {}", archive_path)
+        if not build_support_library(compiler, option_list, src_list, archive_path):
+            # failure is memoized: sources are built with each function
+            archive_path = None
+    SUPPORT_LIBRARY_MAP[key] = archive_path
+    return archive_path
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Persistent content-addressed cache shared between metalibm processes
+
+    Each cache is identified by a namespace (e.g. "fpminimax") and stores
+    pickled values in files named after the SHA-256 of the entry key.
+    The storage directory can be set through the ML_CACHE_DIR environment
+    variable (default: ~/.cache/metalibm) and the whole mechanism can be
+    disabled by setting ML_DISABLE_CACHE. """
+
+import os
+import sys
+import pickle
+import hashlib
+import tempfile
+
+from .log_report import Log
+
+## custom log level for cache management messages
+LOG_CACHE_INFO = Log.LogLevel("Info", "cache")
+
+## default maximal size (in bytes) of a cache namespace on disk
+DEFAULT_CACHE_MAX_SIZE = 256 * 2**20
+
+## version of the cache entry layout, part of every entry key
+CACHE_FORMAT_VERSION = "1"
+
+
+def get_cache_dir():
+    """ return the root directory of metalibm persistent caches """
+    if "ML_CACHE_DIR" in os.environ:
+        return os.environ["ML_CACHE_DIR"]
+    return os.path.join(os.path.expanduser("~"), ".cache", "metalibm")
+
+def is_cache_enabled():
+    """ test if persistent caching has been disabled by the user """
+    return not "ML_DISABLE_CACHE" in os.environ
+
+
+class DiskCache(object):
+    """ On-disk cache with an in-memory front layer, size capped with
+        least-recently-used eviction """
+    ## map of namespace -> DiskCache, used to report statistics
+    cache_map = {}
+
+    def __init__(self, namespace, max_size=DEFAULT_CACHE_MAX_SIZE, memory=True):
+        """ Args:
+                namespace (str): cache name, used as sub-directory name
+                max_size (int): maximal size (in bytes) of the cache on disk
+                memory (bool): keep entries in memory once loaded
+        """
+        self.namespace = namespace
+        self.max_size = max_size
+        self.memory = memory
+        self.memory_map = {}
+        self.hit_count = 0
+        self.miss_count = 0
+        # approximation of the on-disk size, None until first evaluated
+        self.disk_size = None
+        DiskCache.cache_map[namespace] = self
+
+    @staticmethod
+    def get_key(*key_elements):
+        """ build a content-addressed key from a list of objects,
+            each element is converted to str before hashing """
+        key_hash = hashlib.sha256()
+        for elt in (CACHE_FORMAT_VERSION,) + key_elements:
+            key_hash.update(str(elt).encode("utf-8"))
+            key_hash.update(b"\0")
+        return key_hash.hexdigest()
+
+    def get_dir(self):
+        return os.path.join(get_cache_dir(), self.namespace)
+
+    def get_entry_path(self, key):
+        return os.path.join(self.get_dir(), key[:2], key)
+
+    def get(self, key, default=None):
+        """ return the value associated to @p key, or @p default
+            if no such entry exists """
+        if not is_cache_enabled():
+            return default
+        if key in self.memory_map:
+            self.hit_count += 1
+            return self.memory_map[key]
+        entry_path = self.get_entry_path(key)
+        try:
+            with open(entry_path, "rb") as entry_stream:
+                value = pickle.load(entry_stream)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            self.miss_count += 1
+            Log.report(LOG_CACHE_INFO, "{} cache miss {}", self.namespace, key)
+            return default
+        try:
+            # refreshing access time for LRU eviction
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+        self.hit_count += 1
+        Log.report(LOG_CACHE_INFO, "{} cache hit {}", self.namespace, key)
+        if self.memory:
+            self.memory_map[key] = value
+        return value
+
+    def put(self, key, value):
+        """ store @p value under @p key, the write is atomic so concurrent
+            processes sharing the cache directory never see a partial entry """
+        if not is_cache_enabled():
+            return
+        if self.memory:
+            self.memory_map[key] = value
+        entry_path = self.get_entry_path(key)
+        entry_dir = os.path.dirname(entry_path)
+        try:
+            if not os.path.isdir(entry_dir):
+                os.makedirs(entry_dir)
+        except OSError:
+            # directory may have been created concurrently
+            if not os.path.isdir(entry_dir):
+                Log.report(Log.Warning, "unable to create cache directory {}", entry_dir)
+                return
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=entry_dir, prefix=".tmp_")
+        try:
+            with os.fdopen(tmp_fd, "wb") as tmp_stream:
+                pickle.dump(value, tmp_stream, protocol=2)
+            os.rename(tmp_path, entry_path)
+        except (IOError, OSError, pickle.PicklingError, TypeError) as e:
+            Log.report(Log.Warning, "unable to store {} cache entry: {}", self.namespace, e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.update_disk_size(os.path.getsize(entry_path))
+
+    def list_entries(self):
+        """ return the list of (path, size, mtime) of all the entries
+            stored on disk """
+        entry_list = []
+        for dirpath, _, filenames in os.walk(self.get_dir()):
+            for filename in filenames:
+                if filename.startswith(".tmp_"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entry_list.append((path, stat.st_size, stat.st_mtime))
+        return entry_list
+
+    def update_disk_size(self, new_entry_size):
+        if self.disk_size is None:
+            self.disk_size = sum(size for _, size, _ in self.list_entries())
+        else:
+            self.disk_size += new_entry_size
+        if self.disk_size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """ remove least recently used entries until the cache size
+            is below 3/4 of its maximal size """
+        entry_list = sorted(self.list_entries(), key=lambda entry: entry[2])
+        self.disk_size = sum(size for _, size, _ in entry_list)
+        target_size = (self.max_size * 3) // 4
+        for path, size, _ in entry_list:
+            if self.disk_size <= target_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.disk_size -= size
+            self.memory_map.pop(os.path.basename(path), None)
+        Log.report(LOG_CACHE_INFO, "{} cache evicted to {} bytes", self.namespace, self.disk_size)
+
+    def clear(self):
+        """ remove every entry of the cache (memory and disk) """
+        self.memory_map.clear()
+        for path, _, _ in self.list_entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.disk_size = 0
+
+    def get_stats(self):
+        """ return a dict of hit/miss statistics """
+        total = self.hit_count + self.miss_count
+        return {
+            "hit": self.hit_count,
+            "miss": self.miss_count,
+            "hit_rate": (float(self.hit_count) / total) if total else 0.0,
+        }
+
+    @staticmethod
+    def report_stats(level=LOG_CACHE_INFO):
+        """ report hit/miss statistics for every registered cache """
+        for namespace in sorted(DiskCache.cache_map):
+            stats = DiskCache.cache_map[namespace].get_stats()
+            Log.report(level, "{} cache: {} hit(s), {} miss(es) ({:.1f}%)",
+                       namespace, stats["hit"], stats["miss"],
+                       100.0 * stats["hit_rate"])
+
+
+if __name__ == "__main__":
+    for namespace in sys.argv[1:]:
+        cache = DiskCache(namespace)
+        entry_list = cache.list_entries()
+        print("{}: {} entries, {} bytes".format(
+            namespace, len(entry_list), sum(size for _, size, _ in entry_list)))
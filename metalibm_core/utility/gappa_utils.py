@@ -31,12 +31,21 @@
 # author(s): Nicolas Brunie (nicolas.brunie@kalray.eu)
 ###############################################################################
 
+import os
 import re
-import subprocess
 import sys
+import hashlib
+import tempfile
+import subprocess
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 
 import sollya
 
+from .log_report import Log
+from .disk_cache import DiskCache
+from .pass_profiler import PASS_PROFILER
+
 def parse_gappa_interval(interval_value):
     # search for middle ","
     end_index = len(interval_value)
@@ -49,27 +58,120 @@ def parse_gappa_interval(interval_value):
     return sollya.Interval(sollya.parse(v0), sollya.parse(v1))
 
 
-def execute_gappa_script_extract(gappa_code, gappa_filename = "gappa_tmp.g"):
-    result = {}
-    gappa_stream = open(gappa_filename, "w")
+## persistent cache of gappa results, indexed by script digest
+GAPPA_CACHE = DiskCache("gappa")
+
+## keep gappa scripts on disk after execution (debug)
+GAPPA_KEEP_SCRIPTS = "ML_KEEP_GAPPA_FILES" in os.environ
+
+
+def get_gappa_key(gappa_code):
+    """ return the cache key of the script <gappa_code> """
+    return DiskCache.get_key(
+        hashlib.sha256(gappa_code.encode("utf-8")).hexdigest())
+
+def execute_gappa_script(gappa_code, gappa_filename="gappa_tmp.g"):
+    """ execute gappa on <gappa_code> and return its raw output
+        the script is written to a unique temporary file whose name
+        is derived from <gappa_filename>, so that concurrent
+        executions (threads or processes) never collide """
+    prefix = os.path.splitext(os.path.basename(gappa_filename))[0] + "_"
+    fd, script_path = tempfile.mkstemp(prefix=prefix, suffix=".g")
+    gappa_stream = os.fdopen(fd, "w")
     gappa_stream.write(gappa_code)
     gappa_stream.close()
-    gappa_cmd = "gappa {}".format(gappa_filename)
-    cmd_result = subprocess.check_output(
-        gappa_cmd, stderr=subprocess.STDOUT, shell=True)
+    gappa_cmd = "gappa {}".format(script_path)
+    try:
+        with PASS_PROFILER.tool("gappa"):
+            cmd_result = subprocess.check_output(
+                gappa_cmd, stderr=subprocess.STDOUT, shell=True)
+    except subprocess.CalledProcessError:
+        if GAPPA_KEEP_SCRIPTS:
+            Log.report(Log.Info, "gappa script {} failed", script_path)
+        else:
+            Log.report(Log.Info, "gappa script failed")
+        raise
+    finally:
+        if not GAPPA_KEEP_SCRIPTS:
+            os.remove(script_path)
     if sys.version_info >= (3, 0):
-        gappa_result = str(cmd_result, 'utf-8')
+        return str(cmd_result, 'utf-8')
     else:
-        gappa_result = str(cmd_result)
+        return str(cmd_result)
+
+def extract_gappa_results(gappa_result):
+    """ extract the goal intervals from the raw gappa output <gappa_result>
+        as a dict goal -> interval string """
+    result = {}
     start_result_index = gappa_result.index("Results")
     for result_line in gappa_result[start_result_index:].splitlines()[1:]:
         if not " in " in result_line: continue
         result_split = result_line.split(" in ")
         var = result_split[0].replace(" ", "")
         interval_value = result_split[1].replace(" ", "")
-        result[var] = parse_gappa_interval(interval_value)
+        result[var] = interval_value
     return result
 
+def execute_gappa_script_raw(gappa_code, gappa_filename="gappa_tmp.g"):
+    """ return the results of <gappa_code> as a dict goal -> interval
+        string, from the persistent cache when possible """
+    key = get_gappa_key(gappa_code)
+    result = GAPPA_CACHE.get(key)
+    if result is None:
+        result = extract_gappa_results(
+            execute_gappa_script(gappa_code, gappa_filename))
+        GAPPA_CACHE.put(key, result)
+    return result
+
+def get_gappa_job_number():
+    """ return the number of gappa processes which can be run concurrently
+        (ML_GAPPA_JOBS environment variable, default: number of cores) """
+    if "ML_GAPPA_JOBS" in os.environ:
+        return max(1, int(os.environ["ML_GAPPA_JOBS"]))
+    return multiprocessing.cpu_count()
+
+def execute_gappa_script_list(gappa_code_list, gappa_filename_list, jobs=None):
+    """ execute a list of independent gappa scripts, running at most
+        <jobs> gappa processes concurrently (default: one per core)
+
+        Returns a list of dict goal -> interval string, with None for
+        each script whose results could not be extracted.
+        Cache accesses and output parsing are performed in the calling
+        thread, worker threads only wait for gappa processes """
+    key_list = [get_gappa_key(gappa_code) for gappa_code in gappa_code_list]
+    result_list = [GAPPA_CACHE.get(key) for key in key_list]
+    miss_list = [index for index, result in enumerate(result_list) if result is None]
+    jobs = get_gappa_job_number() if jobs is None else jobs
+    jobs = min(jobs, len(miss_list))
+
+    def run_script(index):
+        return execute_gappa_script(gappa_code_list[index], gappa_filename_list[index])
+
+    if jobs > 1:
+        pool = ThreadPool(jobs)
+        try:
+            output_list = pool.map(run_script, miss_list)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        output_list = [run_script(index) for index in miss_list]
+
+    for index, gappa_output in zip(miss_list, output_list):
+        try:
+            result_list[index] = extract_gappa_results(gappa_output)
+        except ValueError:
+            continue
+        GAPPA_CACHE.put(key_list[index], result_list[index])
+    return result_list
+
+def execute_gappa_script_extract(gappa_code, gappa_filename = "gappa_tmp.g"):
+    """ execute (or fetch from cache) <gappa_code> and return its results
+        as a dict goal -> sollya interval """
+    raw_result = execute_gappa_script_raw(gappa_code, gappa_filename)
+    return dict(
+        (var, parse_gappa_interval(raw_result[var])) for var in raw_result)
+
 
 ## Check if gappa binary is available in the execution environement
 def is_gappa_installed():
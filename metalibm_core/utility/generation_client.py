@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Thin client of the metalibm generation server
+
+    Forwards a meta-function command line to a running generation server
+    (see generation_server) and reproduces its output and exit status:
+        python -m metalibm_core.utility.generation_client ml_exp --precision binary32
+    is a drop-in replacement for
+        python metalibm_functions/ml_exp.py --precision binary32
+    When no server is reachable the meta-function script is executed
+    locally. This module only depends on the standard library so that
+    the client starts fast. """
+
+import os
+import sys
+import json
+import socket
+
+
+def get_default_socket_path():
+    """ return the server socket path (ML_SERVER_SOCKET environment
+        variable, default: per-user file in the temporary directory) """
+    if "ML_SERVER_SOCKET" in os.environ:
+        return os.environ["ML_SERVER_SOCKET"]
+    return "/tmp/metalibm_server_{}.sock".format(os.getuid())
+
+def get_function_module(function_name):
+    """ convert a meta-function designation (ml_exp, ml_exp.py,
+        metalibm_functions/ml_exp.py or a dotted module name) into the
+        name of the module implementing it """
+    if function_name.endswith(".py"):
+        function_name = function_name[:-3]
+    function_name = function_name.replace(os.sep, ".")
+    if not "." in function_name:
+        function_name = "metalibm_functions." + function_name
+    return function_name
+
+def send_request(request, socket_path=None):
+    """ send <request> (dict) to the server listening on <socket_path>
+        and return its response (dict); raise socket.error if the
+        server is not reachable """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path or get_default_socket_path())
+        client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        client.shutdown(socket.SHUT_WR)
+        response = b""
+        while True:
+            data = client.recv(65536)
+            if not data:
+                break
+            response += data
+    finally:
+        client.close()
+    return json.loads(response.decode("utf-8"))
+
+def generate(function_name, argv, socket_path=None):
+    """ request the generation of <function_name> with command line
+        arguments <argv>, relative paths being resolved from the current
+        directory, and return the server response """
+    request = {
+        "module": get_function_module(function_name),
+        "argv": argv,
+        "cwd": os.getcwd(),
+    }
+    return send_request(request, socket_path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: generation_client <meta-function> [arguments]")
+        exit(1)
+    function_name, argv = sys.argv[1], sys.argv[2:]
+    try:
+        response = generate(function_name, argv)
+    except (socket.error, OSError):
+        # no server: local execution of the meta-function script
+        module = get_function_module(function_name)
+        os.execv(sys.executable, [sys.executable, "-m", module] + argv)
+    sys.stdout.write(response["log"])
+    exit(response["status"])
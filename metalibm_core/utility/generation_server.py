@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Long-running generation server
+
+    Keeps metalibm (targets, passes, sollya) loaded in a bounded pool of
+    worker processes and serves generation requests received on a local
+    UNIX socket: each request names a meta-function module and its
+    command line arguments (as accepted by ML_NewArgTemplate); the
+    response holds the exit status, the generated source path and the
+    captured output. Workers are long-lived, so their in-memory caches
+    are reused from one request to the next (including function pass
+    results for requests passing --incremental-passes).
+
+        python -m metalibm_core.utility.generation_server --jobs 4
+    Requests are sent with generation_client. """
+
+import os
+import sys
+import json
+import runpy
+import argparse
+import tempfile
+import traceback
+import multiprocessing
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+import sollya
+
+# importing targets and passes before workers are forked
+import metalibm_core.utility.ml_template
+from metalibm_core.core.ml_function import ML_FunctionBasis
+from metalibm_core.core.attributes import Attributes
+from metalibm_core.utility.log_report import Log
+from metalibm_core.utility.pass_profiler import PASS_PROFILER
+from metalibm_core.utility.generation_client import (
+    get_default_socket_path, get_function_module
+)
+
+
+def save_process_state():
+    """ return the process-wide state which may be modified by a
+        generation request (command line parsing, meta-function
+        construction and generation) """
+    return {
+        "log": (
+            list(Log.enabled_levels), Log.exit_on_error, Log.break_on_error,
+            Log.dump_stdout
+        ),
+        "attributes": (
+            list(Attributes.default_precision),
+            list(Attributes.default_rounding_mode),
+            list(Attributes.default_silent)
+        ),
+        "sollya": (
+            sollya.settings.prec, sollya.settings.points,
+            sollya.settings.display
+        ),
+        "profiler": PASS_PROFILER.enabled,
+        "argv": list(sys.argv),
+        "cwd": os.getcwd(),
+    }
+
+def restore_process_state(state):
+    """ restore the process-wide state saved by save_process_state """
+    Log.enabled_levels[:] = state["log"][0]
+    Log.exit_on_error, Log.break_on_error, Log.dump_stdout = state["log"][1:]
+    Attributes.default_precision[:] = state["attributes"][0]
+    Attributes.default_rounding_mode[:] = state["attributes"][1]
+    Attributes.default_silent[:] = state["attributes"][2]
+    sollya.settings.prec, sollya.settings.points, sollya.settings.display = state["sollya"]
+    if PASS_PROFILER.enabled and not state["profiler"]:
+        # a request which failed before dumping its profile
+        PASS_PROFILER.disable()
+    sys.argv = state["argv"]
+    os.chdir(state["cwd"])
+
+def execute_request(request):
+    """ execute a generation request in the current (worker) process and
+        return the response dict (status, output_file, log) """
+    saved_state = save_process_state()
+    # capturing stdout/stderr at file descriptor level,
+    # so that compiler and gappa outputs are collected too
+    log_stream = tempfile.TemporaryFile()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = os.dup(1), os.dup(2)
+    os.dup2(log_stream.fileno(), 1)
+    os.dup2(log_stream.fileno(), 2)
+    status, output_file = 0, None
+    try:
+        os.chdir(request["cwd"])
+        sys.argv = [request["module"]] + request["argv"]
+        module_globals = runpy.run_module(
+            request["module"], run_name="__main__", alter_sys=False)
+        fct_list = [
+            value for value in module_globals.values()
+            if isinstance(value, ML_FunctionBasis)
+        ]
+        if fct_list:
+            output_file = os.path.abspath(fct_list[0].output_file)
+    except SystemExit as e:
+        # same exit status as the interpreter: exit() / exit(None) is a
+        # success, other non-integer codes are printed and are a failure
+        if e.code is None:
+            status = 0
+        elif isinstance(e.code, int):
+            status = e.code
+        else:
+            sys.stderr.write("{}\n".format(e.code))
+            status = 1
+    except:
+        traceback.print_exc()
+        status = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_fds[0], 1)
+        os.dup2(saved_fds[1], 2)
+        os.close(saved_fds[0])
+        os.close(saved_fds[1])
+        # restoring global state modified by the request
+        restore_process_state(saved_state)
+    log_stream.seek(0)
+    log = log_stream.read().decode("utf-8", "replace")
+    log_stream.close()
+    return {"status": status, "output_file": output_file, "log": log}
+
+
+class GenerationRequestHandler(socketserver.StreamRequestHandler):
+    """ connection handler: reads one JSON request, executes it in
+        the server worker pool and writes back the JSON response """
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline().decode("utf-8"))
+            response = self.server.pool.apply(execute_request, (request,))
+        except Exception as e:
+            response = {"status": 1, "output_file": None, "log": "invalid request: {}\n".format(e)}
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+class GenerationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """ UNIX socket server dispatching generation requests to a bounded
+        pool of long-lived worker processes """
+    daemon_threads = True
+
+    def __init__(self, socket_path, jobs):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        if hasattr(multiprocessing, "get_context"):
+            self.pool = multiprocessing.get_context("fork").Pool(jobs)
+        else:
+            self.pool = multiprocessing.Pool(jobs)
+        socketserver.UnixStreamServer.__init__(self, socket_path, GenerationRequestHandler)
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        self.pool.close()
+        self.pool.join()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(" Metalibm generation server")
+    arg_parser.add_argument(
+        "--socket", dest="socket_path", default=get_default_socket_path(),
+        help="path of the UNIX socket (default: ML_SERVER_SOCKET or per-user temporary file)")
+    arg_parser.add_argument(
+        "--jobs", dest="jobs", type=int, default=multiprocessing.cpu_count(),
+        help="number of worker processes (default: one per core)")
+    arg_parser.add_argument(
+        "--preload", dest="preload", default="",
+        help="comma separated list of meta-function modules imported before workers start")
+    args = arg_parser.parse_args(sys.argv[1:])
+
+    for module_name in filter(None, args.preload.split(",")):
+        __import__(get_function_module(module_name))
+
+    server = GenerationServer(args.socket_path, args.jobs)
+    print("metalibm generation server listening on {}".format(args.socket_path))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -48,7 +48,6 @@ from ..core.precisions import *
 
 from ..code_generation.generic_processor import GenericProcessor
 from ..core.target import TargetRegister
-from ..targets import *
 from ..code_generation.code_constant import *
 from ..core.passes import Pass
 
@@ -57,18 +56,42 @@ from ..core.ml_hdl_format import (
     HdlVirtualFormat
 )
 
-from metalibm_core.code_generation.vhdl_backend import VHDLBackend
 
-# import optimization passes
-from metalibm_core.opt import *
+class LazyTargetMap(object):
+    """ map target name -> target class; target and pass modules are
+        not imported at start-up (see utility.module_index), a target
+        module is imported when one of its targets is looked up """
+    def get_name_list(self):
+        return ["none"] + TargetRegister.get_target_names()
 
-# populating target_map
-target_map = {}
-target_map["none"] = GenericProcessor
-for target_name in TargetRegister.target_map:
-    target_map[target_name] = TargetRegister.get_target_by_name(
-        target_name
-    )(None)
+    def __iter__(self):
+        return iter(self.get_name_list())
+
+    def __len__(self):
+        return len(self.get_name_list())
+
+    def __contains__(self, target_name):
+        return target_name in self.get_name_list()
+
+    def __getitem__(self, target_name):
+        if target_name == "none":
+            return GenericProcessor
+        return TargetRegister.get_target_by_name(target_name)(None)
+
+target_map = LazyTargetMap()
+
+
+class LazyTargetDefault(object):
+    """ class attribute descriptor instantiating the target <target_name>
+        on first access """
+    def __init__(self, target_name):
+        self.target_name = target_name
+        self.target = None
+
+    def __get__(self, obj, objtype=None):
+        if self.target is None:
+            self.target = target_map[self.target_name]()
+        return self.target
 
 
 precision_map = {
@@ -170,6 +193,16 @@ def accuracy_parser(accuracy_str):
         return eval(accuracy_str)
 
 
+## value of --auto-test selecting exhaustive testing
+AUTO_TEST_EXHAUSTIVE = "exhaustive"
+
+def auto_test_parser(auto_test_str):
+    """ string -> number of auto-test cases (int) or AUTO_TEST_EXHAUSTIVE """
+    if auto_test_str == AUTO_TEST_EXHAUSTIVE:
+        return AUTO_TEST_EXHAUSTIVE
+    return int(auto_test_str)
+
+
 def interval_parser(interval_str):
     """ string -> Interval conversion """
     return eval(interval_str)
@@ -376,6 +409,16 @@ class DefaultArgTemplate:
     auto_test = False
     auto_test_range = Interval(0, 1)
     auto_test_std = False
+    # number of processes computing auto-test outputs (0: one per core)
+    auto_test_jobs = 1
+    # number of threads of the exhaustive auto-test driver (0: one per core)
+    auto_test_threads = 0
+    # random seed of auto-test input generation (None: not seeded)
+    auto_test_seed = None
+    # binary file storing auto-test vectors (None: embedded tables)
+    auto_test_file = None
+    # execute auto-test in-process (from a shared object)
+    in_process_test = False
     # enable max error computation
     compute_max_error = False
     break_error = False
@@ -397,6 +440,11 @@ class DefaultArgTemplate:
     passes = []
     # built binary execution
     execute_trigger = False
+    # JSON output file of the generation profile (None: disabled)
+    profile_passes = None
+    # reuse function pass results within the process (see
+    # metalibm_core.core.passes.incremental_pass_execution)
+    incremental_passes = False
 
     def __init__(self, **kw):
         for key in kw:
@@ -419,7 +467,7 @@ class DefaultEntityArgTemplate(DefaultArgTemplate):
     accuracy = ML_Faithful
     libm_compliant = False
     # Optimization parameters,
-    backend = VHDLBackend()
+    backend = LazyTargetDefault("vhdl_backend")
     fuse_fma = None
     fast_path_extract = False
     # Debug verbosity,
@@ -514,9 +562,10 @@ class ML_CommonArgTemplate(object):
         # auto-test related arguments
         self.parser.add_argument(
             "--auto-test", dest="auto_test", action="store", nargs='?',
-            const=10, type=int, default=default_arg.auto_test,
+            const=10, type=auto_test_parser, default=default_arg.auto_test,
             help="enable the generation of a self-testing numerical/functionnal\
-      bench")
+      bench (number of random tests, or \"exhaustive\" to test every input\
+      of --auto-test-range)")
 
         self.parser.add_argument(
             "--auto-test-range", dest="auto_test_range", action="store",
@@ -528,6 +577,32 @@ class ML_CommonArgTemplate(object):
             "--auto-test-std", dest="auto_test_std", action="store_const",
             const=True, default=default_arg.auto_test_std,
             help="enabling function test on standard test case list")
+        self.parser.add_argument(
+            "--auto-test-jobs", dest="auto_test_jobs", action="store",
+            nargs='?', const=0, type=int, default=default_arg.auto_test_jobs,
+            help="number of processes used to compute auto-test expected "
+                 "values (no value: one per core)")
+        self.parser.add_argument(
+            "--auto-test-threads", dest="auto_test_threads", action="store",
+            type=int, default=default_arg.auto_test_threads,
+            help="number of threads of the exhaustive auto-test driver "
+                 "(default: one per core)")
+        self.parser.add_argument(
+            "--auto-test-seed", dest="auto_test_seed", action="store",
+            type=int, default=default_arg.auto_test_seed,
+            help="seed of auto-test random input generation, seeded test "
+                 "vectors are kept in a persistent store")
+        self.parser.add_argument(
+            "--auto-test-file", dest="auto_test_file", action="store",
+            default=default_arg.auto_test_file,
+            help="store auto-test vectors in a binary file loaded at runtime "
+                 "rather than in tables embedded in the generated source")
+        self.parser.add_argument(
+            "--in-process-test", dest="in_process_test", action="store_const",
+            const=True, default=default_arg.in_process_test,
+            help="execute auto-test in the generating process: the function "
+                 "is built as a shared object and evaluated on numpy arrays "
+                 "(not compatible with --auto-test exhaustive)")
 
         # enable the computation of eval error (if self-testing enabled)
         self.parser.add_argument(
@@ -584,6 +659,21 @@ class ML_CommonArgTemplate(object):
             "--passes", default=default_arg.passes, action="store", dest="passes",
             type=lambda s: s.split(","), help="comma separated list \
       of slot:pass to be executed ")
+        self.parser.add_argument(
+            "--profile-passes", dest="profile_passes", action="store",
+            nargs="?", const="ml_pass_profile.json",
+            default=default_arg.profile_passes,
+            help="record wall time, node count and peak memory of each "
+                 "generation stage and pass (including sollya, gappa and "
+                 "compiler time) into a JSON file "
+                 "(default: ml_pass_profile.json)")
+        self.parser.add_argument(
+            "--incremental-passes", dest="incremental_passes",
+            action="store_const", const=True,
+            default=default_arg.incremental_passes,
+            help="skip (or reuse the result of) function pass executions "
+                 "on functions already processed by the same pass in the "
+                 "current process (batch generation, generation server)")
         # disable check processor pass
         self.parser.add_argument(
             "--disable-check", default=True, action="store_const",
@@ -605,6 +695,9 @@ class ML_CommonArgTemplate(object):
     # Extract argument from the command-line (sys.argv)
     def arg_extraction(self):
         self.args = self.parser.parse_args(sys.argv[1:])
+        if self.args.in_process_test and self.args.auto_test == AUTO_TEST_EXHAUSTIVE:
+            self.parser.error(
+                "--in-process-test is not compatible with --auto-test exhaustive")
         return self.args
 
     # Return @p self's parser object
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Index of the modules defining targets and optimization passes
+
+    Target and pass modules are large and slow to import; rather than
+    importing all of them at start-up, their sources are scanned for
+    target registrations (TargetRegister.register_new_target) and pass
+    registrations (Pass.register) to build a name -> module index. The
+    index is stored in a DiskCache namespace, keyed on the size and
+    modification time of the scanned files, and modules are only
+    imported when one of their targets or passes is requested. """
+
+import os
+import re
+import importlib
+
+from .disk_cache import DiskCache
+
+
+## packages (directories of metalibm_core) scanned for targets and passes
+SCANNED_DIRS = ["targets", "opt", "code_generation", "core"]
+
+TARGET_NAME_PATTERN = re.compile(r"target_name\s*=\s*[\"'](\w+)[\"']")
+PASS_TAG_PATTERN = re.compile(r"pass_tag\s*=\s*[\"'](\w+)[\"']")
+
+MODULE_INDEX_CACHE = DiskCache("module_index", max_size=2**20)
+
+## index of the current process (memoized)
+_MODULE_INDEX = None
+
+
+def get_source_list():
+    """ return the list of (module name, path) of the scanned sources """
+    core_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    source_list = []
+    for scanned_dir in SCANNED_DIRS:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(core_dir, scanned_dir)):
+            dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+            for filename in sorted(filenames):
+                if not filename.endswith(".py") or filename == "__init__.py":
+                    continue
+                path = os.path.join(dirpath, filename)
+                module = os.path.relpath(path[:-3], core_dir).replace(os.sep, ".")
+                source_list.append(("metalibm_core." + module, path))
+    return source_list
+
+def scan_sources(source_list):
+    """ scan <source_list> and return the index
+        {"targets": name -> module, "passes": tag -> module} """
+    index = {"targets": {}, "passes": {}}
+    for module, path in source_list:
+        with open(path) as source_stream:
+            source = source_stream.read()
+        if "register_new_target" in source:
+            for target_name in TARGET_NAME_PATTERN.findall(source):
+                index["targets"][target_name] = module
+        if "Pass.register(" in source:
+            for pass_tag in PASS_TAG_PATTERN.findall(source):
+                index["passes"][pass_tag] = module
+    return index
+
+def get_module_index():
+    """ return the target / pass module index, (re)generated when
+        one of the scanned sources has changed """
+    global _MODULE_INDEX
+    if _MODULE_INDEX is None:
+        source_list = get_source_list()
+        key = DiskCache.get_key(*[
+            (module, os.path.getsize(path), os.path.getmtime(path))
+            for module, path in source_list
+        ])
+        _MODULE_INDEX = MODULE_INDEX_CACHE.get(key)
+        if _MODULE_INDEX is None:
+            _MODULE_INDEX = scan_sources(source_list)
+            MODULE_INDEX_CACHE.put(key, _MODULE_INDEX)
+    return _MODULE_INDEX
+
+def get_indexed_target_names():
+    return list(get_module_index()["targets"])
+
+def get_indexed_pass_tags():
+    return list(get_module_index()["passes"])
+
+def import_target_module(target_name):
+    """ import the module registering <target_name>,
+        return False if the target is not indexed """
+    module = get_module_index()["targets"].get(target_name)
+    if module is None:
+        return False
+    importlib.import_module(module)
+    return True
+
+def import_pass_module(pass_tag):
+    """ import the module registering the pass <pass_tag>,
+        return False if the pass is not indexed """
+    module = get_module_index()["passes"].get(pass_tag)
+    if module is None:
+        return False
+    importlib.import_module(module)
+    return True
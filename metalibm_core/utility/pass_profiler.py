@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Instrumentation of metalibm generation
+
+    When enabled (--profile-passes option), every generation stage
+    (PassScheduler slot), every optimization pass and the main phases of
+    gen_implementation are recorded as sections with their wall time,
+    the number of nodes of the processed graphs before and after, and the
+    peak memory (resident set size) of the process. The peak memory is
+    the whole-process high-water mark (ru_maxrss): it never decreases, so
+    the "peak_memory_increase" of a section is only the amount by which
+    the section raised the process peak so far, not the memory it
+    allocated (0 for a section which stays under an earlier peak, and
+    it includes the other threads of the process). Time spent in external
+    tools (sollya queries, gappa and compiler sub-processes) is accumulated
+    in every enclosing section; tools run concurrently (e.g. parallel
+    gappa jobs) are accounted for each of their executions. The report is
+    dumped as JSON. """
+
+import json
+import time
+import threading
+import contextlib
+
+try:
+    import resource
+except ImportError:
+    # resource is not available on every platform
+    resource = None
+
+from .log_report import Log
+
+## custom log level for profiling messages
+LOG_PROFILE_INFO = Log.LogLevel("Info", "profile")
+
+
+def get_peak_memory():
+    """ return the peak resident set size of the current process
+        (KiB on Linux, bytes on macOS), None if unavailable.
+        This is a whole-process high-water mark which never decreases """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class PassProfiler(object):
+    """ Recorder of generation sections and external tool timings """
+    def __init__(self):
+        self.enabled = False
+        self.start_time = None
+        # list of section records, in start order
+        self.section_list = []
+        # stack of the records of the currently open sections
+        self.open_sections = []
+        # map tool name -> {"time": ..., "calls": ...}
+        self.tool_map = {}
+        # tools may be run from worker threads (e.g. parallel gappa)
+        self.tool_lock = threading.Lock()
+
+    def enable(self):
+        """ enable profiling and clear previous records """
+        self.enabled = True
+        self.start_time = time.time()
+        self.section_list = []
+        self.open_sections = []
+        self.tool_map = {}
+
+    def disable(self):
+        self.enabled = False
+
+    @contextlib.contextmanager
+    def section(self, kind, name, node_count_function=None):
+        """ record the execution of the body of the with statement as
+            a section <kind>:<name>.
+
+            The record includes the process peak resident set size at
+            the end of the section and its increase over the section
+            (see get_peak_memory)
+
+            Args:
+                kind (str): section category ("stage", "pass", "phase")
+                name (str): section name
+                node_count_function (callable): returns the number of
+                    nodes processed by the section, evaluated before and
+                    after the section (optional)
+        """
+        if not self.enabled:
+            yield
+            return
+        record = {
+            "kind": kind,
+            "name": name,
+            "depth": len(self.open_sections),
+            "start": time.time() - self.start_time,
+            "tools": {},
+        }
+        memory_before = get_peak_memory()
+        if not node_count_function is None:
+            record["node_count_before"] = node_count_function()
+        self.section_list.append(record)
+        self.open_sections.append(record)
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            record["time"] = time.time() - start_time
+            self.open_sections.pop()
+            if not node_count_function is None:
+                record["node_count_after"] = node_count_function()
+            memory_after = get_peak_memory()
+            record["peak_memory"] = memory_after
+            if not memory_after is None:
+                record["peak_memory_increase"] = memory_after - memory_before
+            Log.report(LOG_PROFILE_INFO, "{} {}: {:.3f}s", kind, name, record["time"])
+
+    @contextlib.contextmanager
+    def tool(self, tool_name):
+        """ record the body of the with statement as time spent in the
+            external tool <tool_name> """
+        if not self.enabled:
+            yield
+            return
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            elapsed = time.time() - start_time
+            with self.tool_lock:
+                tool_stats = self.tool_map.setdefault(tool_name, {"time": 0.0, "calls": 0})
+                tool_stats["time"] += elapsed
+                tool_stats["calls"] += 1
+                for record in self.open_sections:
+                    record["tools"][tool_name] = record["tools"].get(tool_name, 0.0) + elapsed
+
+    def get_report(self):
+        """ return the profiling report as a JSON serializable dict """
+        return {
+            "total_time": (time.time() - self.start_time) if self.enabled else None,
+            "peak_memory": get_peak_memory(),
+            "tools": self.tool_map,
+            "sections": self.section_list,
+        }
+
+    def dump(self, output_file):
+        """ write the profiling report to <output_file> in JSON """
+        with open(output_file, "w") as output_stream:
+            json.dump(self.get_report(), output_stream, indent=2, sort_keys=True)
+        Log.report(Log.Info, "pass profile written to {}", output_file)
+
+
+## process-wide profiler, disabled by default
+PASS_PROFILER = PassProfiler()
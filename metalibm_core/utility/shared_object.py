@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" In-process execution of generated functions
+
+    A generated function is built as a shared object together with an
+    array wrapper (applying the function on each element of input arrays)
+    and loaded with ctypes, so that it can be evaluated on NumPy arrays
+    from the generating process. numpy is optional: scalar calls are
+    available without it. """
+
+import os
+import ctypes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .log_report import Log
+from ..core.ml_formats import (
+    ML_Binary32, ML_Binary64, ML_Int32, ML_UInt32, ML_Int64, ML_UInt64
+)
+
+
+## map of metalibm format -> ctypes type
+CTYPES_FORMAT_MAP = {
+    ML_Binary32: ctypes.c_float,
+    ML_Binary64: ctypes.c_double,
+    ML_Int32: ctypes.c_int32,
+    ML_UInt32: ctypes.c_uint32,
+    ML_Int64: ctypes.c_int64,
+    ML_UInt64: ctypes.c_uint64,
+}
+
+## map of metalibm format -> numpy dtype name
+NUMPY_FORMAT_MAP = {
+    ML_Binary32: "float32",
+    ML_Binary64: "float64",
+    ML_Int32: "int32",
+    ML_UInt32: "uint32",
+    ML_Int64: "int64",
+    ML_UInt64: "uint64",
+}
+
+
+def is_numpy_available():
+    """ test if numpy (required for array evaluation) is installed """
+    return not numpy is None
+
+def get_array_wrapper_name(function_name):
+    """ name of the array wrapper of function <function_name> """
+    return "{}_array".format(function_name)
+
+def get_array_wrapper_code(function_name, input_formats, output_format):
+    """ return the C source of the array wrapper of <function_name>:
+        void <function_name>_array(<in0>* x0, ..., <out>* result, long n) """
+    proto_list = ", ".join(fmt.get_name() for fmt in input_formats)
+    array_arg_list = ", ".join(
+        "const {}* x{}".format(fmt.get_name(), i) for i, fmt in enumerate(input_formats)
+    )
+    call_arg_list = ", ".join("x{}[i]".format(i) for i in range(len(input_formats)))
+    return "\n".join([
+        "#include <stdint.h>",
+        "{out} {fname}({protos});".format(out=output_format.get_name(), fname=function_name, protos=proto_list),
+        "void {wrapper}({array_args}, {out}* result, long n) {{".format(
+            wrapper=get_array_wrapper_name(function_name), array_args=array_arg_list,
+            out=output_format.get_name()),
+        "  long i;",
+        "  for (i = 0; i < n; ++i) result[i] = {fname}({call_args});".format(
+            fname=function_name, call_args=call_arg_list),
+        "}",
+        ""
+    ])
+
+
+class SharedFunction(object):
+    """ Generated function loaded from a shared object """
+    def __init__(self, so_file, function_name, input_formats, output_format):
+        """ Args:
+                so_file (str): path to the shared object
+                function_name (str): name of the function symbol
+                input_formats (list): formats of the function arguments
+                output_format (ML_Format): format of the function result
+        """
+        for fmt in input_formats + [output_format]:
+            if not fmt in CTYPES_FORMAT_MAP:
+                Log.report(Log.Error, "format {} is not supported for in-process execution", fmt)
+        self.function_name = function_name
+        self.input_formats = input_formats
+        self.output_format = output_format
+        self.library = ctypes.CDLL(os.path.abspath(so_file))
+
+        self.function = getattr(self.library, function_name)
+        self.function.argtypes = [CTYPES_FORMAT_MAP[fmt] for fmt in input_formats]
+        self.function.restype = CTYPES_FORMAT_MAP[output_format]
+
+        self.array_function = getattr(self.library, get_array_wrapper_name(function_name))
+        self.array_function.argtypes = [
+            ctypes.POINTER(CTYPES_FORMAT_MAP[fmt]) for fmt in input_formats + [output_format]
+        ] + [ctypes.c_long]
+        self.array_function.restype = None
+
+    def __call__(self, *args):
+        """ scalar evaluation """
+        return self.function(*args)
+
+    def evaluate(self, *input_arrays):
+        """ evaluate the function on each element of <input_arrays>
+            (one array-like per argument), returns a numpy array """
+        if not is_numpy_available():
+            Log.report(Log.Error, "numpy is required for array evaluation of {}", self.function_name)
+        arg_arrays = [
+            numpy.ascontiguousarray(array, dtype=NUMPY_FORMAT_MAP[fmt])
+            for array, fmt in zip(input_arrays, self.input_formats)
+        ]
+        size = len(arg_arrays[0]) if arg_arrays else 0
+        result = numpy.empty(size, dtype=NUMPY_FORMAT_MAP[self.output_format])
+        self.array_function(*(
+            [array.ctypes.data_as(ctypes.POINTER(CTYPES_FORMAT_MAP[fmt])) for array, fmt in zip(arg_arrays, self.input_formats)]
+            + [result.ctypes.data_as(ctypes.POINTER(CTYPES_FORMAT_MAP[self.output_format])), size]
+        ))
+        return result
+
+
+def check_output_arrays(result, output_arrays):
+    """ check the result array <result> against the expected values:
+        output_arrays is [expected] for correctly rounded accuracies
+        and [low_bound, high_bound] for two-factor accuracies
+
+        Return:
+            dict of statistics: test number, failure number, maximal
+            absolute / relative errors (w.r.t. the expected value or the
+            middle of the expected interval) and index of the maximal
+            relative error """
+    result = numpy.asarray(result, dtype="float64")
+    output_arrays = [numpy.asarray(array, dtype="float64") for array in output_arrays]
+    if len(output_arrays) == 1:
+        expected, = output_arrays
+        success = (result == expected) | (numpy.isnan(result) & numpy.isnan(expected))
+        reference = expected
+    else:
+        low, high = output_arrays
+        success = ((result >= low) & (result <= high)) | (numpy.isnan(result) & numpy.isnan(low))
+        reference = (low + high) / 2
+    finite = numpy.isfinite(result) & numpy.isfinite(reference)
+    abs_error = numpy.where(finite, numpy.abs(result - reference), 0.0)
+    rel_error = numpy.where(finite & (reference != 0), abs_error / numpy.where(reference != 0, numpy.abs(reference), 1.0), 0.0)
+    return {
+        "test_num": len(result),
+        "failure_num": int(numpy.count_nonzero(~success)),
+        "failure_index": numpy.flatnonzero(~success),
+        "max_abs_error": float(abs_error.max()) if len(result) else 0.0,
+        "max_rel_error": float(rel_error.max()) if len(result) else 0.0,
+        "max_rel_error_index": int(rel_error.argmax()) if len(result) else None,
+    }
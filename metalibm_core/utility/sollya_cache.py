@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Memoized wrappers for expensive numerical sollya queries
+
+    guessdegree, dirtyinfnorm and supnorm are drop-in replacements for
+    the sollya functions of the same name: results are memoized in memory
+    and on disk (see metalibm_core.utility.disk_cache), keyed on the exact
+    printed form of the arguments and of sollya's global settings which
+    may affect the result. Meta-functions should import these functions
+    from this module rather than from sollya. """
+
+import sollya
+
+from sollya import SollyaObject
+
+from .log_report import Log
+from .disk_cache import DiskCache, LOG_CACHE_INFO
+from .pass_profiler import PASS_PROFILER
+
+
+## persistent cache for numerical sollya query results
+SOLLYA_QUERY_CACHE = DiskCache("sollya_query")
+
+
+def sollya_exact_str(value):
+    """ Return a string description of value which does not depend on
+        sollya's current display mode: numbers are printed in
+        hexadecimal, and thus exactly
+
+        Args:
+            value (SollyaObject, list, tuple, int, ...): value to be printed
+        Return:
+            str
+    """
+    if isinstance(value, (list, tuple)):
+        return "[{}]".format(", ".join(sollya_exact_str(v) for v in value))
+    elif isinstance(value, SollyaObject):
+        old_display = sollya.settings.display
+        sollya.settings.display = sollya.hexadecimal
+        try:
+            return str(value)
+        finally:
+            sollya.settings.display = old_display
+    else:
+        return str(value)
+
+def get_settings_key():
+    """ return the list of sollya's global settings which influence
+        numerical queries """
+    return [
+        sollya_exact_str(sollya.settings.prec),
+        sollya_exact_str(sollya.settings.points),
+    ]
+
+def cached_sollya_query(query_name, query_function, *args):
+    """ evaluate query_function(*args) and memoize its result
+
+        Args:
+            query_name (str): name of the query, part of the cache key
+            query_function (callable): sollya function to be evaluated
+            args: query arguments
+        Return:
+            SollyaObject: query result
+    """
+    cache_key = DiskCache.get_key(
+        query_name,
+        *([sollya_exact_str(arg) for arg in args] + get_settings_key())
+    )
+    result_str = SOLLYA_QUERY_CACHE.get(cache_key)
+    if not result_str is None:
+        return sollya.parse(result_str)
+    with PASS_PROFILER.tool("sollya"):
+        result = query_function(*args)
+    if isinstance(result, SollyaObject) and result.is_error():
+        Log.report(LOG_CACHE_INFO, "{} returned an error, not cached", query_name)
+    else:
+        SOLLYA_QUERY_CACHE.put(cache_key, sollya_exact_str(result))
+    return result
+
+
+def guessdegree(*args):
+    """ memoized version of sollya.guessdegree """
+    return cached_sollya_query("guessdegree", sollya.guessdegree, *args)
+
+def dirtyinfnorm(*args):
+    """ memoized version of sollya.dirtyinfnorm """
+    return cached_sollya_query("dirtyinfnorm", sollya.dirtyinfnorm, *args)
+
+def supnorm(*args):
+    """ memoized version of sollya.supnorm """
+    return cached_sollya_query("supnorm", sollya.supnorm, *args)
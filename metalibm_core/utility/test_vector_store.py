@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Persistent store of auto-test vectors
+
+    Test inputs and their expected outputs are stored in a DiskCache
+    namespace, so that a test bench regenerated with the same function,
+    formats, accuracy, test range and random seed does not have to redraw
+    its inputs nor re-emulate its outputs. Sollya values are stored as
+    exact (hexadecimal) strings. """
+
+import struct
+import hashlib
+import inspect
+
+import sollya
+
+from .log_report import Log
+from ..core.ml_formats import ML_FP_Format
+from ..core.special_values import FP_SpecialValue, FP_QNaN, is_nan
+from .disk_cache import DiskCache, LOG_CACHE_INFO
+from .sollya_cache import sollya_exact_str
+
+
+## persistent storage of test vectors
+TEST_VECTOR_STORE = DiskCache("test_vectors", max_size=1024 * 2**20)
+
+
+def encode_test_value(value):
+    """ convert a test value (number, sollya object, or list/tuple/dict
+        of test values) into a picklable object """
+    if isinstance(value, sollya.SollyaObject):
+        return ("sollya", sollya_exact_str(value))
+    elif isinstance(value, dict):
+        return ("dict", [(key, encode_test_value(value[key])) for key in value])
+    elif isinstance(value, tuple):
+        return ("tuple", [encode_test_value(v) for v in value])
+    elif isinstance(value, list):
+        return ("list", [encode_test_value(v) for v in value])
+    else:
+        return ("raw", value)
+
+def decode_test_value(encoded_value):
+    """ inverse of encode_test_value """
+    value_type, value = encoded_value
+    if value_type == "sollya":
+        return sollya.parse(value)
+    elif value_type == "dict":
+        return dict((key, decode_test_value(v)) for key, v in value)
+    elif value_type == "tuple":
+        return tuple(decode_test_value(v) for v in value)
+    elif value_type == "list":
+        return [decode_test_value(v) for v in value]
+    else:
+        return value
+
+
+def get_method_source_hash(obj, method_name_list):
+    """ return a digest of the source code of the methods
+        <method_name_list> of <obj>'s class, or None if a source
+        is not available """
+    source_hash = hashlib.sha256()
+    for method_name in method_name_list:
+        try:
+            source = inspect.getsource(getattr(type(obj), method_name))
+        except (IOError, TypeError, AttributeError):
+            return None
+        source_hash.update(source.encode("utf-8"))
+    return source_hash.hexdigest()
+
+def get_test_vector_key(name, source_hash, seed, *key_elements):
+    """ return the store key of a test vector set, or None if the set
+        can not be identified (no random seed or no emulation source) """
+    if seed is None or source_hash is None:
+        return None
+    return DiskCache.get_key(
+        name, source_hash, seed,
+        *[sollya_exact_str(elt) for elt in key_elements]
+    )
+
+def load_test_vectors(key):
+    """ return the test vector list stored under <key>, None if
+        <key> is None or has not been stored """
+    if key is None:
+        return None
+    encoded_vectors = TEST_VECTOR_STORE.get(key)
+    if encoded_vectors is None:
+        return None
+    Log.report(LOG_CACHE_INFO, "loading {} test vectors from store", len(encoded_vectors))
+    return decode_test_value(encoded_vectors)
+
+def store_test_vectors(key, test_vectors):
+    """ store the list <test_vectors> under <key> (no-op if
+        <key> is None) """
+    if key is None:
+        return
+    TEST_VECTOR_STORE.put(key, encode_test_value(test_vectors))
+
+
+## struct format character of unsigned integers, indexed by bit size
+BINARY_CODING_STRUCT_FORMAT = {8: "B", 16: "H", 32: "I", 64: "Q"}
+
+def is_nan_value(value):
+    """ test if <value> (special value or number) is a NaN """
+    if FP_SpecialValue.is_special_value(value):
+        return is_nan(value)
+    # NaN is the only value which does not compare equal to itself
+    return not value == value
+
+def get_binary_coding(precision, value):
+    """ return the bytes encoding <value> in format <precision>,
+        in the native byte order """
+    if isinstance(precision, ML_FP_Format) and not FP_SpecialValue.is_special_value(value) and is_nan_value(value):
+        value = FP_QNaN(precision)
+    bit_size = precision.get_bit_size()
+    if not bit_size in BINARY_CODING_STRUCT_FORMAT:
+        Log.report(Log.Error, "unsupported format {} for binary test vector file", precision)
+    return struct.pack(
+        "=" + BINARY_CODING_STRUCT_FORMAT[bit_size],
+        precision.get_integer_coding(value)
+    )
+
+def get_c_string_literal(value):
+    """ return the C string literal representing <value> """
+    escaped_value = value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+    return "\"{}\"".format(escaped_value)
+
+def write_test_vector_file(filename, table_list):
+    """ write a binary test vector file: each table is written
+        (row-major, native layout) after the previous one
+
+        Args:
+            filename (str): path of the file to be written
+            table_list (list): list of (storage precision, flat value list)
+        Return:
+            list of int: offset (in bytes) of each table in the file """
+    offset_list = []
+    offset = 0
+    test_file = open(filename, "wb")
+    for precision, value_list in table_list:
+        offset_list.append(offset)
+        data = b"".join(get_binary_coding(precision, value) for value in value_list)
+        test_file.write(data)
+        offset += len(data)
+    test_file.close()
+    Log.report(Log.Info, "{} bytes of test vectors written to {}", offset, filename)
+    return offset_list
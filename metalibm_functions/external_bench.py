@@ -33,8 +33,7 @@ import sys
 import sollya
 
 from sollya import (
-        S2, Interval, ceil, floor, round, inf, sup, pi, log, exp, cos, sin,
-        guessdegree, dirtyinfnorm
+        S2, Interval, ceil, floor, round, inf, sup, pi, log, exp, cos, sin
 )
 
 from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis, DefaultArgTemplate
@@ -104,6 +103,11 @@ class ML_ExternalBench(ML_Function("ml_external_bench")):
   def numeric_emulate(self, *args):
     return self.emulate(*args)
 
+  def get_test_vector_key_elements(self):
+    # the emulation function is provided by the user (e.g. evaluated
+    # from the command line) and can not be identified
+    return None
+
 if __name__ == "__main__":
   # auto-test
   arg_template = ML_NewArgTemplate(default_arg=ML_ExternalBench.get_default_args())
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Whole-libm generation driver
+
+    Generates a declarative list of meta-functions (constructor + argument
+    overloads) in a few long-lived worker processes: each worker imports
+    metalibm and initializes sollya once, and keeps its in-memory caches
+    (approximations, gappa results, test vectors, target dispatch) from one
+    function to the next. Generated sources can then be gathered into a
+    single shared library.
+
+    Usage:
+        python -m metalibm_functions.generate_libm --jobs 8 --output-dir libm/ --library libm/libml.so
+    A custom function list can be loaded with --config FILE, FILE being a
+    python script defining LIBM_FUNCTION_LIST (list of LibmFunction). """
+
+import os
+import re
+import sys
+import time
+import runpy
+import argparse
+import traceback
+import multiprocessing
+
+import sollya
+
+from metalibm_core.core.ml_formats import ML_Binary32, ML_Binary64
+from metalibm_core.utility.log_report import Log
+from metalibm_core.utility.disk_cache import DiskCache
+from metalibm_core.utility.ml_template import target_instanciate
+from metalibm_core.utility.batch_build import (
+    get_function_source, build_library
+)
+
+import metalibm_functions.ml_exp
+import metalibm_functions.ml_exp2
+import metalibm_functions.ml_expm1
+import metalibm_functions.generic_log
+import metalibm_functions.ml_log1p
+import metalibm_functions.ml_cosh
+import metalibm_functions.ml_sinh
+import metalibm_functions.ml_cbrt
+import metalibm_functions.ml_sincos
+
+
+class LibmFunction(object):
+    """ declarative description of a meta-function to generate """
+    def __init__(self, ctor, **arg_map):
+        """ Args:
+                ctor (class): meta-function constructor
+                arg_map: overloads of the meta-function default arguments
+        """
+        self.ctor = ctor
+        self.arg_map = arg_map
+
+    @property
+    def function_name(self):
+        return self.arg_map.get("function_name", self.ctor.function_name)
+
+    def get_arg_template(self, **extra_args):
+        arg_map = dict(self.arg_map)
+        arg_map.update(extra_args)
+        return self.ctor.get_default_args(**arg_map)
+
+
+def get_precision_variants(ctor, base_name, **arg_map):
+    """ return the binary32 (<base_name>f) and binary64 (<base_name>)
+        variants of a meta-function """
+    return [
+        LibmFunction(ctor, precision=precision, function_name=base_name + suffix, **arg_map)
+        for precision, suffix in [(ML_Binary32, "f"), (ML_Binary64, "")]
+    ]
+
+## default content of the generated libm
+LIBM_FUNCTION_LIST = \
+    get_precision_variants(metalibm_functions.ml_exp.ML_Exponential, "ml_exp") + \
+    get_precision_variants(metalibm_functions.ml_exp2.ML_Exp2, "ml_exp2") + \
+    get_precision_variants(metalibm_functions.ml_expm1.ML_ExponentialM1_Red, "ml_expm1") + \
+    get_precision_variants(metalibm_functions.generic_log.ML_GenericLog, "ml_log", basis=sollya.exp(1)) + \
+    get_precision_variants(metalibm_functions.generic_log.ML_GenericLog, "ml_log2", basis=2) + \
+    get_precision_variants(metalibm_functions.generic_log.ML_GenericLog, "ml_log10", basis=10) + \
+    get_precision_variants(metalibm_functions.ml_log1p.ML_Log1p, "ml_log1p") + \
+    get_precision_variants(metalibm_functions.ml_cosh.ML_HyperbolicCosine, "ml_cosh") + \
+    get_precision_variants(metalibm_functions.ml_sinh.ML_HyperbolicSine, "ml_sinh") + \
+    get_precision_variants(metalibm_functions.ml_cbrt.ML_Cbrt, "ml_cbrt") + \
+    get_precision_variants(metalibm_functions.ml_sincos.ML_SinCos, "ml_cos") + \
+    get_precision_variants(metalibm_functions.ml_sincos.ML_SinCos, "ml_sin", sin_output=True)
+
+
+## generation context shared with forked workers:
+#  (list of LibmFunction, dict of common argument overloads)
+_GENERATION_CONTEXT = None
+
+def generate_function(index):
+    """ generate the <index>-th function of the generation context
+        (worker body), returns (index, success, LibrarySource or error
+        message, generation time) """
+    function_list, common_args = _GENERATION_CONTEXT
+    libm_function = function_list[index]
+    start_time = time.time()
+    try:
+        arg_template = libm_function.get_arg_template(**common_args[index])
+        fct = libm_function.ctor(arg_template)
+        fct.gen_implementation()
+        result = get_function_source(fct)
+        success = True
+    except:
+        result = traceback.format_exc()
+        success = False
+    DiskCache.report_stats()
+    return index, success, result, time.time() - start_time
+
+def generate_libm(function_list, output_dir=".", target=None, jobs=None,
+                  incremental_passes=False):
+    """ generate every LibmFunction of <function_list> in <output_dir>
+        with at most <jobs> worker processes (default: one per core),
+        workers are kept alive for the whole generation (and reuse
+        function pass results if <incremental_passes> is set).
+
+        Returns the list of (LibmFunction, success, LibrarySource or error
+        message, generation time) """
+    global _GENERATION_CONTEXT
+    common_args = []
+    for libm_function in function_list:
+        extra_args = {
+            "output_file": os.path.join(output_dir, libm_function.function_name + ".c")
+        }
+        if not target is None:
+            extra_args["target"] = target
+        if incremental_passes:
+            extra_args["incremental_passes"] = True
+        common_args.append(extra_args)
+    _GENERATION_CONTEXT = (function_list, common_args)
+    jobs = multiprocessing.cpu_count() if jobs is None else jobs
+    jobs = max(1, min(jobs, len(function_list)))
+    result_list = [None] * len(function_list)
+    try:
+        if jobs > 1:
+            if hasattr(multiprocessing, "get_context"):
+                pool = multiprocessing.get_context("fork").Pool(jobs)
+            else:
+                pool = multiprocessing.Pool(jobs)
+            try:
+                # single-function tasks, dispatched to the first idle worker
+                for index, success, result, elapsed in pool.imap_unordered(
+                        generate_function, range(len(function_list)), chunksize=1):
+                    result_list[index] = (function_list[index], success, result, elapsed)
+                    Log.report(Log.Info, "{} generated in {:.1f}s", function_list[index].function_name, elapsed)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for index in range(len(function_list)):
+                _, success, result, elapsed = generate_function(index)
+                result_list[index] = (function_list[index], success, result, elapsed)
+    finally:
+        _GENERATION_CONTEXT = None
+    return result_list
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(" Metalibm libm generation")
+    arg_parser.add_argument(
+        "--config", dest="config", default=None,
+        help="python script defining LIBM_FUNCTION_LIST")
+    arg_parser.add_argument(
+        "--jobs", dest="jobs", action="store", nargs='?', const=0, type=int,
+        default=0, help="number of generation worker processes (default: one per core)")
+    arg_parser.add_argument(
+        "--output-dir", dest="output_dir", default=".",
+        help="directory of generated sources")
+    arg_parser.add_argument(
+        "--target", dest="target", type=target_instanciate, default=None,
+        help="target used for every function (default: per-function target)")
+    arg_parser.add_argument(
+        "--match", dest="match_regex", default=".*",
+        help="regular expression selecting the functions to generate")
+    arg_parser.add_argument(
+        "--library", dest="library", default=None,
+        help="build the generated functions into this shared library")
+    arg_parser.add_argument(
+        "--incremental-passes", dest="incremental_passes", action="store_const",
+        const=True, default=False,
+        help="reuse function pass results between the functions generated "
+             "by a worker")
+    arg_parser.add_argument(
+        "--list", dest="list_only", action="store_const", const=True,
+        default=False, help="list the functions and exit")
+    args = arg_parser.parse_args(sys.argv[1:])
+
+    function_list = LIBM_FUNCTION_LIST
+    if args.config:
+        function_list = runpy.run_path(args.config)["LIBM_FUNCTION_LIST"]
+    function_list = [
+        libm_function for libm_function in function_list
+        if re.search(args.match_regex, libm_function.function_name)
+    ]
+    if args.list_only:
+        for libm_function in function_list:
+            print(libm_function.function_name)
+        exit(0)
+
+    if not os.path.isdir(args.output_dir):
+        os.makedirs(args.output_dir)
+    result_list = generate_libm(
+        function_list, args.output_dir, target=args.target,
+        jobs=args.jobs if args.jobs > 0 else None,
+        incremental_passes=args.incremental_passes)
+
+    success = True
+    for libm_function, function_success, result, elapsed in result_list:
+        if function_success:
+            print("{:20} OK     ({:.1f}s)".format(libm_function.function_name, elapsed))
+        else:
+            print("{:20} FAILED ({:.1f}s)\n{}".format(libm_function.function_name, elapsed, result))
+            success = False
+
+    if args.library:
+        source_list = [result for _, function_success, result, _ in result_list if function_success]
+        if source_list:
+            build_library(source_list, args.library, jobs=args.jobs if args.jobs > 0 else None)
+        else:
+            Log.report(Log.Warning, "no function generated, library {} not built", args.library)
+
+    exit(0 if success else 1)
@@ -33,6 +33,7 @@ import sys
 import sollya
 
 from sollya import S2, SollyaObject, Interval, log2, log10, acos, sup
+from metalibm_core.utility.sollya_cache import guessdegree
 
 from metalibm_core.core.ml_function import (
     ML_Function, ML_FunctionBasis, DefaultArgTemplate
@@ -136,7 +137,7 @@ class ML_Acos(ML_FunctionBasis):
 
 
     print "building mathematical polynomial"
-    poly_degree = sup(sollya.guessdegree(acos(x), approx_interval, S2**-(self.precision.get_field_size()))) 
+    poly_degree = sup(guessdegree(acos(x), approx_interval, S2**-(self.precision.get_field_size()))) 
     print "guessed polynomial degree: ", int(poly_degree)
     #global_poly_object = Polynomial.build_from_approximation(log10(1+x)/x, poly_degree, [self.precision]*(poly_degree+1), approx_interval, absolute)
 
@@ -33,8 +33,7 @@ import sys
 import sollya
 
 from sollya import (
-        S2, Interval, ceil, floor, round, inf, sup, pi, log, atan,
-        guessdegree, dirtyinfnorm
+        S2, Interval, ceil, floor, round, inf, sup, pi, log, atan
 )
 
 from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis, DefaultArgTemplate
@@ -32,7 +32,7 @@ import sys
 
 import sollya
 
-from sollya import S2, Interval, ceil, floor, round, inf, sup, log, exp, expm1, log2, guessdegree, dirtyinfnorm, RN, RD
+from sollya import S2, Interval, ceil, floor, round, inf, sup, log, exp, expm1, log2, RN, RD
 try:
     from sollya import cbrt
 except ImportError:
@@ -31,9 +31,9 @@ import sys
 import sollya
 
 from sollya import (
-        S2, Interval, ceil, floor, round, inf, sup, log, exp, cos, pi,
-        guessdegree, dirtyinfnorm
+        S2, Interval, ceil, floor, round, inf, sup, log, exp, cos, pi
 )
+from metalibm_core.utility.sollya_cache import guessdegree, dirtyinfnorm
 
 from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis, DefaultArgTemplate
 
@@ -33,9 +33,9 @@ import sys
 import sollya
 
 from sollya import (
-    S2, Interval, ceil, floor, round, inf, sup, log, exp, expm1, log2, cosh,
-    guessdegree, dirtyinfnorm, RN, acosh, RD
+    S2, Interval, ceil, floor, round, inf, sup, log, exp, expm1, log2, cosh, RN, acosh, RD
 )
+from metalibm_core.utility.sollya_cache import guessdegree, dirtyinfnorm
 from sollya import parse as sollya_parse
 
 from metalibm_core.core.attributes import ML_Debug
@@ -30,9 +30,9 @@
 import sollya
 
 from sollya import (
-    S2, Interval, round, inf, sup, log, expm1, log2,
-    guessdegree, dirtyinfnorm, floor
+    S2, Interval, round, inf, sup, log, expm1, log2, floor
 )
+from metalibm_core.utility.sollya_cache import guessdegree, dirtyinfnorm
 
 from metalibm_core.core.ml_operations import (
     Test, RaiseReturn, Comparison, Statement, NearestInteger,
@@ -32,8 +32,9 @@ import sys
 import sollya
 
 from sollya import (
-        S2, Interval, ceil, floor, round, inf, sup, log, exp, guessdegree
+        S2, Interval, ceil, floor, round, inf, sup, log, exp
 )
+from metalibm_core.utility.sollya_cache import guessdegree
 
 from metalibm_core.core.attributes import ML_Debug
 from metalibm_core.core.ml_operations import *
@@ -36,9 +36,9 @@ import sys
 import sollya
 
 from sollya import (
-        S2, Interval, ceil, floor, round, inf, sup, log, exp, cos, sin,
-        guessdegree
+        S2, Interval, ceil, floor, round, inf, sup, log, exp, cos, sin
 )
+from metalibm_core.utility.sollya_cache import dirtyinfnorm
 
 from metalibm_core.core.ml_function import ML_FunctionBasis
 
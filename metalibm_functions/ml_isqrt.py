@@ -32,7 +32,7 @@ import sys
 
 import sollya
 
-from sollya import S2, Interval, ceil, floor, round, inf, sup, log, exp, expm1, log2, guessdegree, dirtyinfnorm, RN
+from sollya import S2, Interval, ceil, floor, round, inf, sup, log, exp, expm1, log2, RN
 
 from metalibm_core.core.attributes import ML_Debug
 from metalibm_core.core.ml_operations import *
@@ -31,7 +31,8 @@ import sys
 
 import sollya
 
-from sollya import S2, Interval, ceil, floor, round, inf, sup, log, exp, log10, guessdegree
+from sollya import S2, Interval, ceil, floor, round, inf, sup, log, exp, log10
+from metalibm_core.utility.sollya_cache import guessdegree
 
 from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis, DefaultArgTemplate
 
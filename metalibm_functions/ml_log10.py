@@ -32,9 +32,9 @@ import sys
 import sollya
 
 from sollya import (
-        S2, Interval, ceil, floor, round, inf, sup, log, exp, log10,
-        guessdegree, RN, x
+        S2, Interval, ceil, floor, round, inf, sup, log, exp, log10, RN, x
 )
+from metalibm_core.utility.sollya_cache import guessdegree
 
 from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis, DefaultArgTemplate
 
@@ -361,6 +361,9 @@ class ML_Log10(ML_Function("log10")):
   def numeric_emulate(self, input_value):
     return sollya.log(input_value)/sollya.log(self.basis)
 
+  def get_test_vector_key_elements(self):
+    return [self.basis]
+
   standard_test_cases = [(sollya.parse("0x1.42af3ap-1"), None)]
 
 
@@ -32,9 +32,9 @@ import sys
 import sollya
 
 from sollya import (
-        S2, Interval, ceil, floor, round, inf, sup, log, exp, log2,
-        guessdegree, x, RN, absolute
+        S2, Interval, ceil, floor, round, inf, sup, log, exp, log2, x, RN, absolute
 )
+from metalibm_core.utility.sollya_cache import guessdegree, dirtyinfnorm
 
 from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis, DefaultArgTemplate
 
@@ -219,7 +219,7 @@ class ML_Log2(ML_Function("ml_log2")):
             [self.precision]*(poly_degree+1),
             approx_interval,
             sollya.absolute,
-            error_function=lambda p, f, ai, mod, t: sollya.dirtyinfnorm(p - f, ai)
+            error_function=lambda p, f, ai, mod, t: dirtyinfnorm(p - f, ai)
         )
         Log.report(Log.Info, "poly_degree={}, approx_error={}".format(poly_degree, approx_error))
         poly_object = global_poly_object.sub_poly(start_index=1,offset=1)
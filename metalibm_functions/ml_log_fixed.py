@@ -33,7 +33,7 @@ import sollya
 
 from sollya import (
         S2, Interval, ceil, floor, round, inf, sup, log, exp,
-        log10, guessdegree
+        log10
 )
 
 from metalibm_core.core.attributes import ML_Debug
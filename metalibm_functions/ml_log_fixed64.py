@@ -32,9 +32,10 @@ import sys
 import sollya
 
 from sollya import (
-        S2, Interval, ceil, floor, round, inf, sup, log, exp, guessdegree,
+        S2, Interval, ceil, floor, round, inf, sup, log, exp,
         nearestint
 )
+from metalibm_core.utility.sollya_cache import guessdegree
 from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis
 
 from metalibm_core.core.attributes import ML_Debug
@@ -31,7 +31,8 @@ import sys
 
 import sollya
 
-from sollya import S2, Interval, ceil, floor, round, inf, sup, pi, log, exp, cos, sin, guessdegree
+from sollya import S2, Interval, ceil, floor, round, inf, sup, pi, log, exp, cos, sin
+from metalibm_core.utility.sollya_cache import guessdegree
 
 from metalibm_core.core.attributes import ML_Debug
 from metalibm_core.core.ml_operations import *
@@ -32,9 +32,9 @@ import sys
 import sollya
 
 from sollya import (
-        S2, Interval, ceil, floor, round, inf, sup, pi, log, exp, cos, sin,
-        guessdegree, dirtyinfnorm
+        S2, Interval, ceil, floor, round, inf, sup, pi, log, exp, cos, sin
 )
+from metalibm_core.utility.sollya_cache import guessdegree, dirtyinfnorm
 
 from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis, DefaultArgTemplate
 
@@ -372,6 +372,9 @@ class ML_SinCos(ML_Function("ml_cos")):
     else:
       return cos(input_value)
 
+  def get_test_vector_key_elements(self):
+    return [self.sin_output]
+
 if __name__ == "__main__":
   # auto-test
   arg_template = ML_NewArgTemplate(default_arg=ML_SinCos.get_default_args())
@@ -32,9 +32,9 @@ import sys
 import sollya
 
 from sollya import (
-        S2, Interval, ceil, floor, round, inf, sup, pi, sinh, asinh, log, log2, exp,
-        guessdegree, dirtyinfnorm
+        S2, Interval, ceil, floor, round, inf, sup, pi, sinh, asinh, log, log2, exp
 )
+from metalibm_core.utility.sollya_cache import guessdegree, dirtyinfnorm
 
 from metalibm_core.core.ml_function import ML_Function, ML_FunctionBasis, DefaultArgTemplate
 
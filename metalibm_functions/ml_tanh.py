@@ -34,6 +34,7 @@ import sollya
 from sollya import (
      S2, Interval, tanh
 )
+from metalibm_core.utility.sollya_cache import guessdegree, dirtyinfnorm
 
 from metalibm_core.core.ml_function import (
     ML_Function, ML_FunctionBasis, DefaultArgTemplate
@@ -80,7 +81,7 @@ def piecewise_approximation(
         tag="coeff_table"
     )
 
-    error_function = lambda p, f, ai, mod, t: sollya.dirtyinfnorm(p - f, ai)
+    error_function = lambda p, f, ai, mod, t: dirtyinfnorm(p - f, ai)
     max_approx_error = 0.0
     interval_size = (bound_high - bound_low) / num_intervals
 
@@ -93,7 +94,7 @@ def piecewise_approximation(
         local_function = function(sollya.x + subint_low)
         local_interval = Interval(-interval_size, interval_size)
 
-        local_degree = sollya.guessdegree(local_function, local_interval, error_threshold) 
+        local_degree = guessdegree(local_function, local_interval, error_threshold) 
         degree = min(max_degree, local_degree)
 
         if function(subint_low) == 0.0:
@@ -202,13 +203,13 @@ class ML_HyperbolicTangent(ML_Function("ml_tanh")):
 
     def generate_approx_poly_near_zero(self, function, high_bound, error_bound, variable):
         """ Generate polynomial approximation scheme """
-        error_function = lambda p, f, ai, mod, t: sollya.dirtyinfnorm(p - f, ai)
+        error_function = lambda p, f, ai, mod, t: dirtyinfnorm(p - f, ai)
         # Some issues encountered when 0 is one of the interval bound
         # so we use a symetric interval around it
         approx_interval = Interval(-high_bound, high_bound)
         local_function = function / sollya.x
 
-        degree = sollya.sup(sollya.guessdegree(local_function, approx_interval, error_bound))
+        degree = sollya.sup(guessdegree(local_function, approx_interval, error_bound))
         degree_list = range(0, int(degree)+1, 1)
 
         poly_object, approx_error = Polynomial.build_from_approximation_with_error(
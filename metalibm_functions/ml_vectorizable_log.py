@@ -33,8 +33,9 @@
 import sys
 
 import sollya
-from sollya import (floor, guessdegree, Interval, log, log2, log10, log1p, round, 
+from sollya import (floor, Interval, log, log2, log10, log1p, round, 
                     S2, sqrt, sup, _x_)
+from metalibm_core.utility.sollya_cache import guessdegree
 
 from metalibm_core.core.ml_function import (ML_Function, ML_FunctionBasis,
                                             DefaultArgTemplate)
@@ -637,6 +638,9 @@ class ML_Log(ML_Function("ml_log")):
   def numeric_emulate(self, input_value):
     return self.log_emulation_function(input_value)
 
+  def get_test_vector_key_elements(self):
+    return [self.log_radix]
+
 if __name__ == "__main__":
   # auto-test
   arg_template = ML_NewArgTemplate(
@@ -32,7 +32,7 @@ import sys
 
 import sollya
 
-from sollya import Interval, ceil, floor, round, inf, sup, log, exp, expm1, log2, guessdegree, dirtyinfnorm, RN, RD
+from sollya import Interval, ceil, floor, round, inf, sup, log, exp, expm1, log2, RN, RD
 from sollya import parse as sollya_parse
 
 from metalibm_core.core.attributes import ML_Debug
@@ -153,6 +153,9 @@ class ML_UT_EntityPass(ML_Entity("ml_lzc"), TestRunner):
     result["vr_out"] = count_leading_zero(io_map["x"], self.width)
     return result
 
+  def get_test_vector_key_elements(self):
+    return [self.width]
+
   def generate_scheme(self):
     lzc_width = int(floor(log2(self.width))) + 1
     Log.report(Log.Info, "width of lzc out is {}".format(lzc_width))
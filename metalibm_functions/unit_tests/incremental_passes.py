@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# created:          Oct 18th, 2026
+###############################################################################
+import sys
+
+from metalibm_core.core.ml_function import ML_FunctionBasis
+
+from metalibm_core.core.ml_operations import *
+from metalibm_core.core.ml_formats import ML_Binary32
+from metalibm_core.core.passes import FUNCTION_PASS_STATS
+
+from metalibm_core.code_generation.generic_processor import GenericProcessor
+
+from metalibm_core.utility.ml_template import *
+from metalibm_core.utility.log_report import Log
+
+
+class ML_UT_IncrementalPasses(ML_FunctionBasis):
+  function_name = "ml_ut_incremental_passes"
+  def __init__(self, args=DefaultArgTemplate):
+    # initializing base class
+    ML_FunctionBasis.__init__(self, args)
+
+
+  @staticmethod
+  def get_default_args(**kw):
+    """ Return a structure containing the arguments for current class,
+        builtin from a default argument mapping overloaded with @p kw """
+    default_args = {
+        "output_file": "ut_incremental_passes.c",
+        "function_name": "ut_incremental_passes",
+        "target": GenericProcessor(),
+        "precision": ML_Binary32,
+        "incremental_passes": True,
+    }
+    default_args.update(kw)
+    return DefaultArgTemplate(**default_args)
+
+
+  def generate_scheme(self):
+    # declaring function input variable
+    vx = self.implementation.add_input_variable("x", self.precision)
+
+    poly = vx * (Constant(1.5, precision=self.precision) + vx * Constant(0.25, precision=self.precision))
+    scheme = Statement(
+      Return(poly + Constant(1, precision=self.precision), precision=self.precision)
+    )
+
+    return scheme
+
+
+## Test execution function
+def run_test(args):
+  ml_ut_incremental_passes = ML_UT_IncrementalPasses(args)
+  ml_ut_incremental_passes.gen_implementation(display_after_gen = False, display_after_opt = False)
+  first_code = open(ml_ut_incremental_passes.output_file).read()
+  executed_num = FUNCTION_PASS_STATS["executed"]
+
+  # re-generating the same function: every pass execution must be
+  # skipped or reuse the result of the first generation
+  ml_ut_incremental_passes = ML_UT_IncrementalPasses(args)
+  ml_ut_incremental_passes.gen_implementation(display_after_gen = False, display_after_opt = False)
+  second_code = open(ml_ut_incremental_passes.output_file).read()
+
+  if FUNCTION_PASS_STATS["executed"] != executed_num:
+    Log.report(Log.Error, "{} pass(es) re-executed on unchanged function", FUNCTION_PASS_STATS["executed"] - executed_num)
+  if first_code != second_code:
+    Log.report(Log.Error, "incremental pass execution modified the generated code")
+  return True
+
+if __name__ == "__main__":
+  # auto-test
+  arg_template = ML_NewArgTemplate(default_arg=ML_UT_IncrementalPasses.get_default_args())
+  args = arg_template.arg_extraction()
+
+  if run_test(args):
+    exit(0)
+  else:
+    exit(1)
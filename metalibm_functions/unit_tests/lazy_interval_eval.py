@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# created:          Oct 18th, 2026
+###############################################################################
+import sys
+
+from sollya import Interval
+
+from metalibm_core.core.ml_function import ML_FunctionBasis
+
+from metalibm_core.core.ml_operations import *
+from metalibm_core.core.ml_formats import ML_Binary32
+
+from metalibm_core.code_generation.generic_processor import GenericProcessor
+
+from metalibm_core.utility.ml_template import *
+from metalibm_core.utility.log_report import Log
+
+
+class ML_UT_LazyIntervalEval(ML_FunctionBasis):
+  function_name = "ml_ut_lazy_interval_eval"
+  def __init__(self, args=DefaultArgTemplate):
+    # initializing base class
+    ML_FunctionBasis.__init__(self, args)
+
+
+  @staticmethod
+  def get_default_args(**kw):
+    """ Return a structure containing the arguments for current class,
+        builtin from a default argument mapping overloaded with @p kw """
+    default_args = {
+        "output_file": "ut_lazy_interval_eval.c",
+        "function_name": "ut_lazy_interval_eval",
+        "target": GenericProcessor(),
+        "precision": ML_Binary32,
+    }
+    default_args.update(kw)
+    return DefaultArgTemplate(**default_args)
+
+  def check_interval(self, node, expected_interval):
+    if node.get_interval() != expected_interval:
+      Log.report(
+        Log.Error, "unexpected interval for {}: got {}, expected {}",
+        node.get_tag(), node.get_interval(), expected_interval
+      )
+
+  def generate_scheme(self):
+    vx_interval = Interval(-1, 1)
+    vx = self.implementation.add_input_variable("x", self.precision, interval=vx_interval)
+
+    add = Addition(vx, Constant(1, precision=self.precision), precision=self.precision, tag="add")
+    mul = Multiplication(add, Constant(2, precision=self.precision), precision=self.precision, tag="mul")
+
+    # intervals are only evaluated when first accessed
+    if not add.is_interval_pending() or not mul.is_interval_pending():
+      Log.report(Log.Error, "interval evaluated before being accessed")
+    self.check_interval(mul, (vx_interval + 1) * 2)
+    if add.is_interval_pending():
+      Log.report(Log.Error, "input interval not evaluated with its user")
+    self.check_interval(add, vx_interval + 1)
+
+    # set_input invalidates the modified node only
+    add.set_input(1, Constant(3, precision=self.precision))
+    self.check_interval(add, vx_interval + 3)
+    self.check_interval(mul, (vx_interval + 1) * 2)
+
+    # users are re-evaluated once explicitly invalidated
+    invalidate_intervals(mul)
+    self.check_interval(mul, (vx_interval + 3) * 2)
+    self.check_interval(vx, vx_interval)
+
+    return Statement(Return(mul))
+
+
+## Test execution function
+def run_test(args):
+  ml_ut_lazy_interval_eval = ML_UT_LazyIntervalEval(args)
+  ml_ut_lazy_interval_eval.gen_implementation(display_after_gen = False, display_after_opt = False)
+  return True
+
+if __name__ == "__main__":
+  # auto-test
+  arg_template = ML_NewArgTemplate(default_arg=ML_UT_LazyIntervalEval.get_default_args())
+  args = arg_template.arg_extraction()
+
+  if run_test(args):
+    exit(0)
+  else:
+    exit(1)
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This file is part of metalibm (https://github.com/kalray/metalibm)
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2018 Kalray
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+# created:          Oct 18th, 2026
+###############################################################################
+import sys
+
+from metalibm_core.core.ml_function import ML_FunctionBasis
+
+from metalibm_core.core.ml_operations import *
+from metalibm_core.core.ml_formats import ML_Binary32, ML_Int32, ML_Bool
+
+from metalibm_core.code_generation.generic_processor import GenericProcessor
+
+from metalibm_core.utility.ml_template import *
+from metalibm_core.utility.log_report import Log
+
+
+class ML_UT_ValueNumbering(ML_FunctionBasis):
+  function_name = "ml_ut_value_numbering"
+  def __init__(self, args=DefaultArgTemplate):
+    # initializing base class
+    ML_FunctionBasis.__init__(self, args)
+
+
+  @staticmethod
+  def get_default_args(**kw):
+    """ Return a structure containing the arguments for current class,
+        builtin from a default argument mapping overloaded with @p kw """
+    default_args = {
+        "output_file": "ut_value_numbering.c",
+        "function_name": "ut_value_numbering",
+        "target": GenericProcessor(),
+        "precision": ML_Binary32,
+    }
+    default_args.update(kw)
+    return DefaultArgTemplate(**default_args)
+
+
+  def generate_scheme(self):
+    # declaring function input variable
+    vx = self.implementation.add_input_variable("x", self.precision)
+
+    # two structurally identical sub-graphs built separately
+    lhs = TypeCast(vx, precision=ML_Int32) + Constant(1, precision=ML_Int32)
+    rhs = TypeCast(vx, precision=ML_Int32) + Constant(1, precision=ML_Int32)
+    self.merged_node = Addition(lhs, rhs, precision=ML_Int32)
+
+    # local variable: reads must not be merged
+    vi = Variable("i", precision=ML_Int32, var_type=Variable.Local)
+    self.local_node = Addition(
+        Negation(vi, precision=ML_Int32),
+        Negation(vi, precision=ML_Int32),
+        precision=ML_Int32
+    )
+
+    # integer divisions guarded by distinct conditions: they must not
+    # be merged (and hoisted ahead of their guards)
+    vn = TypeCast(vx, precision=ML_Int32)
+    c0 = Constant(0, precision=ML_Int32)
+    self.then_result = TypeCast(
+      Division(Constant(7, precision=ML_Int32), vn, precision=ML_Int32),
+      precision=self.precision
+    )
+    self.else_result = TypeCast(
+      Division(Constant(7, precision=ML_Int32), vn, precision=ML_Int32),
+      precision=self.precision
+    )
+    # floating-point divisions guarded by the sign of x: they may raise
+    # floating-point flags and must not be merged either
+    self.then_fp_result = Addition(
+      self.then_result,
+      Division(Constant(1.0, precision=self.precision), vx, precision=self.precision),
+      precision=self.precision
+    )
+    self.else_fp_result = Addition(
+      self.else_result,
+      Division(Constant(1.0, precision=self.precision), vx, precision=self.precision),
+      precision=self.precision
+    )
+
+    scheme = Statement(
+      ReferenceAssign(vi, self.merged_node),
+      ConditionBlock(
+        Comparison(vn, c0, specifier=Comparison.Greater, precision=ML_Bool),
+        Return(self.then_fp_result),
+        ConditionBlock(
+          Comparison(vn, c0, specifier=Comparison.Less, precision=ML_Bool),
+          Return(self.else_fp_result)
+        )
+      ),
+      Return(TypeCast(self.local_node, precision=self.precision))
+    )
+
+    return scheme
+
+
+## Test execution function
+def run_test(args):
+  ml_ut_value_numbering = ML_UT_ValueNumbering(args)
+  ml_ut_value_numbering.gen_implementation(display_after_gen = False, display_after_opt = False)
+  merged_node = ml_ut_value_numbering.merged_node
+  local_node = ml_ut_value_numbering.local_node
+  if not merged_node.get_input(0) is merged_node.get_input(1):
+    Log.report(Log.Error, "value numbering failed to merge equivalent nodes")
+  if local_node.get_input(0) is local_node.get_input(1):
+    Log.report(Log.Error, "value numbering merged reads of a local variable")
+  if ml_ut_value_numbering.then_result.get_input(0) is ml_ut_value_numbering.else_result.get_input(0):
+    Log.report(Log.Error, "value numbering merged integer divisions of distinct branches")
+  if ml_ut_value_numbering.then_fp_result.get_input(1) is ml_ut_value_numbering.else_fp_result.get_input(1):
+    Log.report(Log.Error, "value numbering merged floating-point divisions of distinct branches")
+  return True
+
+if __name__ == "__main__":
+  # auto-test
+  arg_template = ML_NewArgTemplate(default_arg=ML_UT_ValueNumbering.get_default_args())
+  args = arg_template.arg_extraction()
+
+  if run_test(args):
+    exit(0)
+  else:
+    exit(1)
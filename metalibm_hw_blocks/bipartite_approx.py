@@ -455,6 +455,9 @@ class BipartiteApprox(ML_Entity("bipartite_approx")):
         print("numeric_emulate, ", io_map, result)
         return result
 
+    def get_test_vector_key_elements(self):
+        return [self.function]
+
 
     #standard_test_cases = [({"x": 1.0, "y": (S2**-11 + S2**-17)}, None)]
     standard_test_cases = [
@@ -233,6 +233,9 @@ class ML_LeadingZeroAnticipator(ML_Entity("ml_lza")):
         result["final_lzc"] = count_leading_zero(pre_op, self.width+1)
         return result
 
+    def get_test_vector_key_elements(self):
+        return [self.width]
+
     def implement_test_case(self, io_map, input_values, output_signals, output_values, time_step):
         """ Implement the test case check and assertion whose I/Os values
             are described in input_values and output_values dict """
@@ -101,6 +101,9 @@ class ML_LeadingZeroCounter(ML_Entity("ml_lzc")):
     result["vr_out"] = count_leading_zero(io_map["x"], self.width)
     return result
 
+  def get_test_vector_key_elements(self):
+    return [self.width]
+
   @staticmethod
   def get_lzc_output_width(width):
     """ Compute the size of a standard leading zero count result for
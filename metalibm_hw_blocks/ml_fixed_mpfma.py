@@ -479,6 +479,9 @@ class FP_FIXED_MPFMA(ML_Entity("fp_fixed_mpfma")):
       result["vr_acc"] = result_value
     return result
 
+  def get_test_vector_key_elements(self):
+    return [self.sign_magnitude, self.get_acc_lsb_index()]
+
   standard_test_cases = [
     #({
       #"y": ML_Binary16.get_value_from_integer_coding("bab9", base = 16),
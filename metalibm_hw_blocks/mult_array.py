@@ -876,6 +876,9 @@ class MultArray(ML_Entity("mult_array")):
         # assert acc >= 0
         return {"result_o": acc}
 
+    def get_test_vector_key_elements(self):
+        return [str(operation) for operation in self.op_expr]
+
 
 if __name__ == "__main__":
         # auto-test
@@ -156,6 +156,9 @@ class AdaptativeEntity(ML_Entity("ml_adaptative_entity"), TestRunner):
         print(io_map, result)
         return result
 
+    def get_test_vector_key_elements(self):
+        return [self.width]
+
 
     @staticmethod
     def __call__(args):
@@ -322,6 +322,12 @@ arg_parser.add_argument("--execute", dest = "test_list", type = parse_test_list,
 
 arg_parser.add_argument("--match", dest = "match_regex", type = str, default = ".*", help = "list of comma separated match regexp to be used for test selection")
 
+arg_parser.add_argument(
+    "--jobs", dest="jobs", action="store", nargs='?', const=0, type=int,
+    default=1,
+    help="number of test cases executed concurrently, each in its own "
+         "process and working directory (no value: one per core)")
+
 
 
 
@@ -332,12 +338,18 @@ success = True
 # of new scheme tests
 result_details = []
 
-for test_scheme in args.test_list:
-  if re.search(args.match_regex, test_scheme.get_tag_title()) != None:
-    test_result = test_scheme.perform_all_test(debug = args.debug)
-    result_details.append(test_result)
-    if not test_result.get_result():
-      success = False
+selected_test_list = [
+  test_scheme for test_scheme in args.test_list
+  if re.search(args.match_regex, test_scheme.get_tag_title()) != None
+]
+scheme_results = execute_test_schemes(
+  selected_test_list, jobs=get_job_number(args.jobs), debug=args.debug
+)
+for test_scheme, result_list in zip(selected_test_list, scheme_results):
+  test_result = test_scheme.reduce_test_result(result_list)
+  result_details.append(test_result)
+  if not test_result.get_result():
+    success = False
 
 # Printing test summary for new scheme
 for result in result_details:
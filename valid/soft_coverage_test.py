@@ -220,8 +220,24 @@ arg_parser.add_argument(
     const=True, default=False,
     help="enable Verbose log level")
 
+arg_parser.add_argument(
+    "--auto-test-jobs", dest="auto_test_jobs", action="store", nargs='?',
+    const=0, type=int, default=1,
+    help="number of processes used to compute auto-test expected values "
+         "(no value: one per core)")
+
+arg_parser.add_argument(
+    "--jobs", dest="jobs", action="store", nargs='?', const=0, type=int,
+    default=1,
+    help="number of test cases executed concurrently, each in its own "
+         "process and working directory (no value: one per core)")
+
 args = arg_parser.parse_args(sys.argv[1:])
 
+for test_scheme in global_test_list:
+    for arg_tc in test_scheme.argument_tc:
+        arg_tc["auto_test_jobs"] = args.auto_test_jobs
+
 success = True
 success_count = 0
 # list of TestResult objects generated by execution
@@ -236,8 +252,10 @@ RESULT_MAP = {}
 # forcing exception cause to be raised
 Log.exit_on_error = False
 
-for test_scheme in global_test_list:
-    test_results = test_scheme.perform_all_test_no_reduce(debug=args.debug)
+scheme_results = execute_test_schemes(
+    global_test_list, jobs=get_job_number(args.jobs), debug=args.debug
+)
+for test_scheme, test_results in zip(global_test_list, scheme_results):
     RESULT_MAP[test_scheme] = test_results
 
 for test_scheme in RESULT_MAP:
@@ -52,6 +52,9 @@ from metalibm_core.core.precisions import (
 from valid.unit_test import (
     UnitTestScheme
 )
+from valid.test_utils import (
+    execute_test_schemes, get_job_number
+)
 
 import metalibm_functions.unit_tests.new_arg_template as ut_new_arg_template
 import metalibm_functions.unit_tests.block_lzcnt as ut_block_lzcnt
@@ -73,10 +76,14 @@ import metalibm_functions.unit_tests.new_table as ut_new_table
 import metalibm_functions.unit_tests.multi_ary_function as ut_multi_ary_function
 import metalibm_functions.unit_tests.entity_pass as ut_entity_pass
 import metalibm_functions.unit_tests.implicit_interval_eval as ut_implicit_interval_eval
+import metalibm_functions.unit_tests.lazy_interval_eval as ut_lazy_interval_eval
 import metalibm_functions.unit_tests.legalize_sqrt as ut_legalize_sqrt
 import metalibm_functions.unit_tests.accuracies as ut_accuracies
 import metalibm_functions.unit_tests.legalize_reciprocal_seed as ut_legalize_reciprocal_seed
 import metalibm_functions.unit_tests.fuse_fma as ut_fuse_fma
+import metalibm_functions.unit_tests.value_numbering as ut_value_numbering
+import metalibm_functions.unit_tests.incremental_passes as ut_incremental_passes
+import metalibm_functions.unit_tests.raise_return_value as ut_raise_return_value
 
 unit_test_list = [
   UnitTestScheme(
@@ -89,11 +96,31 @@ unit_test_list = [
     ut_fuse_fma,
     [{"passes": ["beforecodegen:fuse_fma"]}]
   ),
+  UnitTestScheme(
+    "value numbering pass test",
+    ut_value_numbering,
+    [{}]
+  ),
+  UnitTestScheme(
+    "RaiseReturn return value typing and fusion test",
+    ut_raise_return_value,
+    [{"passes": ["beforecodegen:fuse_fma"]}]
+  ),
+  UnitTestScheme(
+    "incremental pass execution test",
+    ut_incremental_passes,
+    [{}]
+  ),
   UnitTestScheme(
     "implicit interval eval test",
     ut_implicit_interval_eval,
     [{}]
   ),
+  UnitTestScheme(
+    "lazy interval evaluation and invalidation test",
+    ut_lazy_interval_eval,
+    [{}]
+  ),
   UnitTestScheme(
     "legalization of InvSquareRoot operation",
     ut_legalize_sqrt,
@@ -243,6 +270,11 @@ arg_parser.add_argument("--debug", dest = "debug", action = "store_const",
 arg_parser.add_argument("--list", action = ListUnitTestAction, help = "list available unit tests", nargs = 0) 
 # select list of tests to be executed
 arg_parser.add_argument("--execute", dest = "test_list", type = parse_unit_test_list, default = unit_test_list, help = "list of comma separated test to be executed") 
+arg_parser.add_argument(
+    "--jobs", dest="jobs", action="store", nargs='?', const=0, type=int,
+    default=1,
+    help="number of test cases executed concurrently, each in its own "
+         "process and working directory (no value: one per core)")
 
 
 args = arg_parser.parse_args(sys.argv[1:])
@@ -254,8 +286,11 @@ debug_flag = args.debug
 # of new scheme tests
 result_details = []
 
-for test_scheme in args.test_list:
-  test_result = test_scheme.perform_all_test(debug = debug_flag)
+scheme_results = execute_test_schemes(
+  args.test_list, jobs=get_job_number(args.jobs), debug=debug_flag
+)
+for test_scheme, result_list in zip(args.test_list, scheme_results):
+  test_result = test_scheme.reduce_test_result(result_list)
   result_details.append(test_result)
   if not test_result.get_result(): 
     success = False
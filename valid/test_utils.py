@@ -34,6 +34,17 @@
 # Last Modified:     March 6th, 2018
 ###############################################################################
 
+import os
+import sys
+import shutil
+import tempfile
+import traceback
+import multiprocessing
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
 from metalibm_core.core.ml_function import (
     DefaultArgTemplate, BuildError, ValidError
 )
@@ -144,3 +155,113 @@ class NewSchemeTest(CommonTestScheme):
             
         return TestResult(True, "{} succeed".format(test_desc), title=self.title)
 
+
+
+def get_process_context():
+    """ return the multiprocessing context used to spawn test workers:
+        workers are forked so that test schemes (which may reference
+        non-picklable objects) are inherited from the parent process """
+    if hasattr(multiprocessing, "get_context"):
+        return multiprocessing.get_context("fork")
+    return multiprocessing
+
+def execute_sandboxed_test(test_scheme, arg_tc, debug, result_queue, index):
+    """ execute a single test case in a private working directory
+        (worker process body) and push (index, TestResult) to result_queue.
+        The working directory is removed unless the test failed """
+    work_dir = tempfile.mkdtemp(prefix="ml_{}_".format(test_scheme.get_tag_title()))
+    os.chdir(work_dir)
+    try:
+        result = test_scheme.single_test(arg_tc, debug=debug)
+    except:
+        traceback.print_exc()
+        result = TestResult(
+            False, "{}/{} failed".format(test_scheme.get_title(), str(arg_tc)),
+            error=GenerationError(), title=test_scheme.title)
+    details = result.get_details()
+    if result.get_result():
+        shutil.rmtree(work_dir, ignore_errors=True)
+    else:
+        details += " (working directory: {})".format(work_dir)
+    # test_object and test_case may not be picklable,
+    # they are restored by the parent process
+    result_queue.put((index, TestResult(
+        result.get_result(), details, error=result.error, title=result.title)))
+
+def execute_test_cases(test_case_list, jobs=1, debug=False):
+    """ execute a list of (test_scheme, arg_tc) pairs and return the list
+        of TestResult (in the same order).
+
+        With jobs > 1, at most <jobs> test cases are executed concurrently,
+        each in its own worker process and private working directory, so
+        that generated files (sources, binaries, gappa scripts) never
+        collide """
+    if jobs <= 1:
+        return [test_scheme.single_test(arg_tc, debug=debug) for test_scheme, arg_tc in test_case_list]
+    # workers change their working directory: relative module paths
+    # must remain valid
+    sys.path[:] = [os.path.abspath(path) for path in sys.path]
+    context = get_process_context()
+    result_queue = context.Queue()
+    result_list = [None] * len(test_case_list)
+    pending = list(enumerate(test_case_list))[::-1]
+    running = {}
+    def record_result(index, result):
+        result.test_object, result.test_case = test_case_list[index]
+        result_list[index] = result
+        running.pop(index).join()
+    while pending or running:
+        while pending and len(running) < jobs:
+            index, (test_scheme, arg_tc) = pending.pop()
+            process = context.Process(
+                target=execute_sandboxed_test,
+                args=(test_scheme, arg_tc, debug, result_queue, index))
+            process.start()
+            running[index] = process
+        try:
+            index, result = result_queue.get(timeout=1)
+        except queue.Empty:
+            # detecting workers which died without reporting (e.g. crash)
+            dead_list = [index for index, process in running.items() if not process.is_alive()]
+            if not dead_list:
+                continue
+            # a dead worker may have reported just before exiting:
+            # its result is drained from the queue before declaring failure
+            while True:
+                try:
+                    index, result = result_queue.get(timeout=0.1)
+                except queue.Empty:
+                    break
+                record_result(index, result)
+            for index in dead_list:
+                if not index in running:
+                    continue
+                process = running[index]
+                test_scheme, arg_tc = test_case_list[index]
+                record_result(index, TestResult(
+                    False, "{}/{} worker exited with code {} without result".format(
+                        test_scheme.get_title(), str(arg_tc), process.exitcode),
+                    error=GenerationError(), title=test_scheme.title))
+            continue
+        record_result(index, result)
+    return result_list
+
+def execute_test_schemes(test_scheme_list, jobs=1, debug=False):
+    """ execute every test case of <test_scheme_list> (with at most <jobs>
+        concurrent workers) and return the list of raw TestResult lists
+        (one list per test scheme) """
+    test_case_list = [
+        (test_scheme, arg_tc) for test_scheme in test_scheme_list
+        for arg_tc in test_scheme.argument_tc
+    ]
+    result_list = execute_test_cases(test_case_list, jobs=jobs, debug=debug)
+    scheme_results = []
+    for test_scheme in test_scheme_list:
+        scheme_results.append(result_list[:test_scheme.num_test])
+        result_list = result_list[test_scheme.num_test:]
+    return scheme_results
+
+def get_job_number(jobs):
+    """ convert a --jobs option value into a number of workers
+        (0: one per core) """
+    return jobs if jobs > 0 else multiprocessing.cpu_count()